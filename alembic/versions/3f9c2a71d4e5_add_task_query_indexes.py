@@ -0,0 +1,53 @@
+"""Add task query indexes
+
+Revision ID: 3f9c2a71d4e5
+Revises: 58dff6ceef11
+Create Date: 2026-10-18 10:45:12.318204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f9c2a71d4e5'
+down_revision: Union[str, Sequence[str], None] = '58dff6ceef11'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Backends that understand ``CREATE INDEX ... WHERE``
+PARTIAL_INDEX_DIALECTS = ("postgresql", "sqlite")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # TaskRepository.get_by_project / count_by_project
+    op.create_index(
+        'ix_tasks_project_id_created_at',
+        'tasks',
+        ['project_id', sa.text('created_at DESC')],
+        unique=False,
+    )
+    # TaskRepository.get_overdue_tasks / close_overdue_tasks
+    op.create_index('ix_tasks_status_deadline', 'tasks', ['status', 'deadline'], unique=False)
+
+    if op.get_bind().dialect.name in PARTIAL_INDEX_DIALECTS:
+        # Only open tasks can become overdue, and they are a small slice of the table
+        op.create_index(
+            'ix_tasks_open_deadline',
+            'tasks',
+            ['deadline'],
+            unique=False,
+            postgresql_where=sa.text("status != 'done'"),
+            sqlite_where=sa.text("status != 'done'"),
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name in PARTIAL_INDEX_DIALECTS:
+        op.drop_index('ix_tasks_open_deadline', table_name='tasks')
+    op.drop_index('ix_tasks_status_deadline', table_name='tasks')
+    op.drop_index('ix_tasks_project_id_created_at', table_name='tasks')
@@ -0,0 +1,31 @@
+"""Add project change version
+
+Revision ID: 7a4e0c9b2f61
+Revises: 3f9c2a71d4e5
+Create Date: 2026-10-18 11:20:41.502377
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7a4e0c9b2f61'
+down_revision: Union[str, Sequence[str], None] = '3f9c2a71d4e5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Bumped by the repositories on every write to a project or its tasks; drives ETags
+    with op.batch_alter_table('projects') as batch_op:
+        batch_op.add_column(sa.Column('version', sa.Integer(), nullable=False, server_default='1'))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('projects') as batch_op:
+        batch_op.drop_column('version')
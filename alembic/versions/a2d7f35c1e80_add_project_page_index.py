@@ -0,0 +1,29 @@
+"""Add project page index
+
+Revision ID: a2d7f35c1e80
+Revises: e8b42f6a1c93
+Create Date: 2026-10-18 16:05:27.914360
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a2d7f35c1e80'
+down_revision: Union[str, Sequence[str], None] = 'e8b42f6a1c93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # ProjectRepository.get_page_with_task_counts / get_page_versions: keyset
+    # pages ordered by (created_at DESC, id DESC), scanned backwards
+    op.create_index('ix_projects_created_at_id', 'projects', ['created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_projects_created_at_id', table_name='projects')
@@ -0,0 +1,34 @@
+"""Add sweep state
+
+Revision ID: c5d81e3a9b07
+Revises: 7a4e0c9b2f61
+Create Date: 2026-10-18 12:05:17.884210
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c5d81e3a9b07'
+down_revision: Union[str, Sequence[str], None] = '7a4e0c9b2f61'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # High-water marks of the incremental overdue sweeps
+    op.create_table(
+        'sweep_state',
+        sa.Column('name', sa.String(length=50), nullable=False),
+        sa.Column('watermark', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('name'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('sweep_state')
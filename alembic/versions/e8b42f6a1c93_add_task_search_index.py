@@ -0,0 +1,90 @@
+"""Add task search index
+
+Revision ID: e8b42f6a1c93
+Revises: c5d81e3a9b07
+Create Date: 2026-10-18 14:20:41.502913
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e8b42f6a1c93'
+down_revision: Union[str, Sequence[str], None] = 'c5d81e3a9b07'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Written out rather than imported from app/db/fulltext.py, so this revision
+# keeps creating the same schema if the app's DDL changes later
+
+SQLITE_UPGRADE = (
+    """
+    CREATE VIRTUAL TABLE tasks_fts USING fts5(
+        title, description,
+        content='tasks', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+    )
+    """,
+    """
+    CREATE TRIGGER tasks_fts_insert AFTER INSERT ON tasks BEGIN
+        INSERT INTO tasks_fts (rowid, title, description) VALUES (new.id, new.title, new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER tasks_fts_delete AFTER DELETE ON tasks BEGIN
+        INSERT INTO tasks_fts (tasks_fts, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+    END
+    """,
+    """
+    CREATE TRIGGER tasks_fts_update AFTER UPDATE OF title, description ON tasks BEGIN
+        INSERT INTO tasks_fts (tasks_fts, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+        INSERT INTO tasks_fts (rowid, title, description) VALUES (new.id, new.title, new.description);
+    END
+    """,
+    # Index the tasks that already exist
+    "INSERT INTO tasks_fts (tasks_fts) VALUES ('rebuild')",
+)
+
+SQLITE_DOWNGRADE = (
+    "DROP TRIGGER IF EXISTS tasks_fts_update",
+    "DROP TRIGGER IF EXISTS tasks_fts_delete",
+    "DROP TRIGGER IF EXISTS tasks_fts_insert",
+    "DROP TABLE IF EXISTS tasks_fts",
+)
+
+# The generated column is computed for existing rows as it is added
+POSTGRES_UPGRADE = (
+    """
+    ALTER TABLE tasks ADD COLUMN search_vector tsvector GENERATED ALWAYS AS (
+        setweight(to_tsvector('simple', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('simple', coalesce(description, '')), 'B')
+    ) STORED
+    """,
+    "CREATE INDEX ix_tasks_search_vector ON tasks USING gin (search_vector)",
+)
+
+POSTGRES_DOWNGRADE = (
+    "DROP INDEX IF EXISTS ix_tasks_search_vector",
+    "ALTER TABLE tasks DROP COLUMN IF EXISTS search_vector",
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    dialect = op.get_bind().dialect.name
+    statements = {"sqlite": SQLITE_UPGRADE, "postgresql": POSTGRES_UPGRADE}.get(dialect, ())
+    for statement in statements:
+        op.execute(sa.text(statement))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    dialect = op.get_bind().dialect.name
+    statements = {"sqlite": SQLITE_DOWNGRADE, "postgresql": POSTGRES_DOWNGRADE}.get(dialect, ())
+    for statement in statements:
+        op.execute(sa.text(statement))
@@ -1,4 +1,4 @@
-from app.db.session import SessionLocal
+from app.db.session import SessionLocal, AsyncSessionLocal
 
 # Dependency to get database session
 def get_db():
@@ -6,4 +6,9 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+# Dependency to get an async database session (used by the API routes)
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -0,0 +1,29 @@
+"""
+ETag / If-None-Match helpers for conditional GETs
+
+ETags are derived from the per-project change versions kept by the
+repositories (see app/repositories/versions.py), so checking one costs a
+primary-key lookup instead of loading and serializing the rows.
+"""
+import hashlib
+from typing import Optional
+
+from fastapi import Response
+
+
+def make_etag(*parts) -> str:
+    """Strong ETag over the request parameters and version rows that define a response"""
+    digest = hashlib.blake2b(repr(parts).encode(), digest_size=12).hexdigest()
+    return f'"{digest}"'
+
+
+def etag_matches(etag: str, if_none_match: Optional[str]) -> bool:
+    """Whether an ``If-None-Match`` header value matches ``etag`` (weak comparison)"""
+    if not if_none_match:
+        return False
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return "*" in candidates or etag in candidates
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers={"ETag": etag})
@@ -1,19 +1,54 @@
+import asyncio
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
-from app.api.routes import projects, tasks 
+from fastapi.responses import PlainTextResponse
+from app.api.middleware import MetricsMiddleware
+from app.api.routes import projects, tasks, export, search
+from app.db.leader import leader_lock
+from app.db.session import AsyncSessionLocal, async_engine
+from app.metrics import REGISTRY
+from app.services.deadline_scheduler import SCHEDULER_IN_PROCESS, run_leader_scheduler
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Run the autoclose scheduler in the background when SCHEDULER_IN_PROCESS is set"""
+    if not SCHEDULER_IN_PROCESS:
+        yield
+        return
+
+    stop = asyncio.Event()
+    scheduler = asyncio.create_task(run_leader_scheduler(leader_lock(async_engine), AsyncSessionLocal, stop))
+    try:
+        yield
+    finally:
+        stop.set()
+        await scheduler
 
 app = FastAPI(
     title="TodoList API",
     description="A simple TodoList API with FastAPI", 
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
+app.add_middleware(MetricsMiddleware, router_app=app)
+
 app.include_router(projects.router, prefix="/api/v1", tags=["projects"])
 app.include_router(tasks.router, prefix="/api/v1", tags=["tasks"])  
+app.include_router(export.router, prefix="/api/v1", tags=["export"])
+app.include_router(search.router, prefix="/api/v1", tags=["search"])
 
 @app.get("/")
-def hello():
+async def hello():
     return {"message": "Hello! My API is working!"}
 
 @app.get("/test") 
-def test():
-    return {"status": "ok", "version": "1.0.0"}
\ No newline at end of file
+async def test():
+    return {"status": "ok", "version": "1.0.0"}
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus metrics of this worker process"""
+    return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4")
@@ -0,0 +1,69 @@
+"""
+Request metrics middleware
+
+A plain ASGI middleware (not BaseHTTPMiddleware), so streamed responses are
+timed until their last chunk and nothing is buffered.
+"""
+import time
+
+from starlette.routing import Match
+
+from app.db.instrumentation import track_queries
+from app.db.query_detector import new_query_stats
+from app.metrics import (
+    DB_QUERIES_PER_REQUEST,
+    DB_TIME_PER_REQUEST,
+    HTTP_REQUEST_DURATION,
+    HTTP_REQUESTS,
+    HTTP_REQUESTS_IN_PROGRESS,
+)
+
+# Label for paths that match no route, so 404 scans cannot blow up label cardinality
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+def route_template(app, scope) -> str:
+    """The path template of the route serving ``scope`` (e.g. ``/api/v1/tasks/{task_id}``)"""
+    for route in app.routes:
+        match, _ = route.matches(scope)
+        if match == Match.FULL:
+            return getattr(route, "path", UNMATCHED_ROUTE)
+    return UNMATCHED_ROUTE
+
+
+class MetricsMiddleware:
+    """Record latency, status codes, in-flight requests and DB usage per route"""
+
+    def __init__(self, app, router_app):
+        self.app = app
+        # The FastAPI app whose routes give the ``route`` label
+        self.router_app = router_app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        route = route_template(self.router_app, scope)
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        stats = new_query_stats(f"{method} {route}")
+        HTTP_REQUESTS_IN_PROGRESS.inc(method=method, route=route)
+        started = time.perf_counter()
+        try:
+            with track_queries(stats):
+                await self.app(scope, receive, send_wrapper)
+        finally:
+            HTTP_REQUESTS_IN_PROGRESS.dec(method=method, route=route)
+            HTTP_REQUEST_DURATION.observe(time.perf_counter() - started, method=method, route=route)
+            HTTP_REQUESTS.inc(method=method, route=route, status=status)
+            DB_QUERIES_PER_REQUEST.observe(stats.count, method=method, route=route)
+            DB_TIME_PER_REQUEST.observe(stats.duration, method=method, route=route)
+            stats.report()
@@ -0,0 +1,33 @@
+"""
+Opt-in fast serialization for the list endpoints
+
+With ``API_FAST_JSON=true`` (and orjson installed: ``poetry install -E fast``)
+list endpoints build their pages from plain column tuples and encode them
+with orjson, skipping the per-object ``response_model`` validation. The JSON
+is the same as the validated path; the data comes straight from typed
+database columns, so there is nothing left to validate.
+"""
+import os
+from typing import List, Optional
+
+from fastapi.responses import ORJSONResponse
+
+try:
+    import orjson
+except ImportError:  # optional extra
+    orjson = None
+
+FAST_JSON = orjson is not None and os.getenv("API_FAST_JSON", "false").lower() in ("1", "true", "yes")
+
+
+def use_fast_json() -> bool:
+    return FAST_JSON
+
+
+def rows_page_response(rows: List, next_cursor: Optional[str], etag: Optional[str] = None) -> ORJSONResponse:
+    """Encode a page of column-tuple rows (``sqlalchemy.engine.Row``) as ``{items, next_cursor}``"""
+    headers = {"ETag": etag} if etag else None
+    return ORJSONResponse(
+        {"items": [row._asdict() for row in rows], "next_cursor": next_cursor},
+        headers=headers,
+    )
@@ -0,0 +1,97 @@
+import csv
+import io
+import json
+from datetime import datetime
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import StreamingResponse
+
+from app.db.session import AsyncSessionLocal
+from app.repositories.async_task_repository import AsyncTaskRepository
+from app.services.task_service import VALID_STATUSES
+
+router = APIRouter()
+
+EXPORT_FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+EXPORT_FIELDS = ["id", "project_id", "title", "description", "status", "deadline", "created_at", "closed_at"]
+# Rows encoded per chunk sent to the client
+EXPORT_CHUNK_ROWS = 1000
+
+
+def _isoformat(value):
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+def _ndjson_line(row) -> str:
+    record = {field: _isoformat(value) for field, value in zip(EXPORT_FIELDS, row)}
+    return json.dumps(record, ensure_ascii=False) + "\n"
+
+
+async def _stream_tasks(export_format: str, filters: dict):
+    # The generator owns its session: request-scoped dependencies are torn
+    # down before a streaming body has finished sending
+    async with AsyncSessionLocal() as db:
+        task_repo = AsyncTaskRepository(db)
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        if export_format == "csv":
+            writer.writerow(EXPORT_FIELDS)
+
+        rows_in_buffer = 0
+        async for row in task_repo.stream_for_export(**filters):
+            if export_format == "csv":
+                writer.writerow([_isoformat(value) for value in row])
+            else:
+                buffer.write(_ndjson_line(row))
+            rows_in_buffer += 1
+
+            if rows_in_buffer >= EXPORT_CHUNK_ROWS:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+                rows_in_buffer = 0
+
+        if buffer.tell():
+            yield buffer.getvalue()
+
+
+@router.get("/export/tasks")
+async def export_tasks(
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    project_id: Optional[int] = None,
+    status: Optional[str] = None,
+    created_after: Optional[datetime] = None,
+    created_before: Optional[datetime] = None,
+):
+    """
+    Stream tasks as NDJSON or CSV
+    
+    - **format**: `ndjson` (default) or `csv`
+    - **project_id**: Only tasks of this project
+    - **status**: Only tasks with this status (todo/doing/done)
+    - **created_after** / **created_before**: Creation time window
+    
+    Rows are read through a server-side cursor and sent in chunks, so memory
+    stays flat however many tasks are exported
+    """
+    if status is not None and status not in VALID_STATUSES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"❌ Invalid status '{status}'! Please choose from: 'todo', 'doing', or 'done'"
+        )
+
+    filters = {
+        "project_id": project_id,
+        "status": status,
+        "created_after": created_after,
+        "created_before": created_before,
+    }
+    return StreamingResponse(
+        _stream_tasks(format, filters),
+        media_type=EXPORT_FORMATS[format],
+        headers={"Content-Disposition": f'attachment; filename="tasks.{format}"'},
+    )
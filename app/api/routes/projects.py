@@ -1,32 +1,62 @@
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
-from typing import List
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
 
-from app.api.dependencies import get_db
-from app.schemas.project import ProjectCreate, ProjectResponse, ProjectUpdate
-from app.services.project_service import ProjectService
-from app.repositories.project_repository import ProjectRepository
-from app.repositories.task_repository import TaskRepository
+from app.api.dependencies import get_async_db
+from app.api.etag import etag_matches, make_etag, not_modified
+from app.api.responses import rows_page_response, use_fast_json
+from app.schemas.project import ProjectCreate, ProjectResponse, ProjectUpdate, ProjectPage
+from app.services.async_project_service import AsyncProjectService
+from app.repositories.unit_of_work import AsyncUnitOfWork
+from app.repositories.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from app.exceptions.repository_exceptions import InvalidCursorException
+from app.db.pool import pool_stats
+from app.repositories.cache import repository_cache
+from app.db.session import async_engine, engine
 
 
 router = APIRouter()
 
-@router.get("/projects", response_model=List[ProjectResponse])
-def get_projects(db: Session = Depends(get_db)):
+@router.get("/projects", response_model=ProjectPage)
+async def get_projects(
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_async_db)
+):
     """
-    Get all projects
+    Get projects, newest first, one page at a time
     
-    Returns a list of all projects in the system
-    Includes task count for each project
+    - **limit**: Maximum number of projects in the page
+    - **cursor**: `next_cursor` from the previous page (omit for the first page)
+    
+    Returns the page of projects and the cursor of the next page
+    Includes the total, open and done task counts of each project
+    
+    Sends an `ETag`; repeat the request with `If-None-Match` to get a `304`
+    while none of the projects in the page (or their tasks) have changed
     """
-    project_repo = ProjectRepository(db)
-    task_repo = TaskRepository(db)
-    project_service = ProjectService(project_repo, task_repo)
+    uow = AsyncUnitOfWork(db)
+    project_service = AsyncProjectService(uow)
     
-    return project_service.get_all_projects()
+    try:
+        # Versions are read before the page, so a write racing this request
+        # can only make the ETag older than the body, never newer
+        versions = await uow.projects.get_page_versions(limit, cursor)
+        etag = make_etag("projects", limit, cursor, [tuple(row) for row in versions])
+        if etag_matches(etag, if_none_match):
+            return not_modified(etag)
+        projects, next_cursor = await project_service.get_projects_page(limit, cursor)
+    except InvalidCursorException as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if use_fast_json():
+        return rows_page_response(projects, next_cursor, etag)
+    response.headers["ETag"] = etag
+    return {"items": projects, "next_cursor": next_cursor}
 
 @router.post("/projects", response_model=ProjectResponse)
-def create_project(project_data: ProjectCreate, db: Session = Depends(get_db)):
+async def create_project(project_data: ProjectCreate, db: AsyncSession = Depends(get_async_db)):
     """
     Create a new project
     
@@ -35,53 +65,68 @@ def create_project(project_data: ProjectCreate, db: Session = Depends(get_db)):
     
     Returns the created project object
     """
-    project_repo = ProjectRepository(db)
-    task_repo = TaskRepository(db)
-    project_service = ProjectService(project_repo, task_repo)
+    project_service = AsyncProjectService(AsyncUnitOfWork(db))
     
-    return project_service.create_project(project_data.name, project_data.description)
+    return await project_service.create_project(project_data.name, project_data.description)
 
 @router.get("/projects/{project_id}", response_model=ProjectResponse)
-def get_project(project_id: int, db: Session = Depends(get_db)):
+async def get_project(project_id: int, db: AsyncSession = Depends(get_async_db)):
     """
     Get a specific project by ID
     """
-    project_repo = ProjectRepository(db)
-    project = project_repo.get_by_id(project_id)
+    uow = AsyncUnitOfWork(db)
+    project = await uow.projects.get_cached(project_id)
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
     return project
 
 @router.put("/projects/{project_id}", response_model=ProjectResponse)
-def update_project(project_id: int, project_data: ProjectUpdate, db: Session = Depends(get_db)):
+async def update_project(project_id: int, project_data: ProjectUpdate, db: AsyncSession = Depends(get_async_db)):
     """
     Update a project
     """
-    project_repo = ProjectRepository(db)
-    project = project_repo.get_by_id(project_id)
+    uow = AsyncUnitOfWork(db)
+    project = await uow.projects.get_by_id(project_id)
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
     
     project.name = project_data.name
     project.description = project_data.description
     
-    return project_repo.update(project)
+    await uow.projects.update(project)
+    await uow.commit()
+    return project
 
 @router.delete("/projects/{project_id}")
-def delete_project(project_id: int, db: Session = Depends(get_db)):
+async def delete_project(project_id: int, db: AsyncSession = Depends(get_async_db)):
     """
     Delete a project
     """
-    project_repo = ProjectRepository(db)
-    project = project_repo.get_by_id(project_id)
+    uow = AsyncUnitOfWork(db)
+    project = await uow.projects.get_by_id(project_id)
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
     
-    project_repo.delete(project_id)
+    await uow.projects.delete(project_id)
+    await uow.commit()
     return {"message": "Project deleted successfully"}
 
 @router.get("/health")
-def health_check():
-    return {"status": "healthy", "service": "projects"}
+async def health_check():
+    """
+    Health check with connection pool statistics
+    
+    Reports checked-out connections, overflow and checkout wait times so
+    pool exhaustion under load can be spotted
+    """
+    return {
+        "status": "healthy",
+        "service": "projects",
+        "database": {
+            "async_pool": pool_stats(async_engine),
+            "sync_pool": pool_stats(engine),
+        },
+        "repository_cache": repository_cache.stats(),
+    }
 
 
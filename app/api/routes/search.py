@@ -0,0 +1,39 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
+
+from app.api.dependencies import get_async_db
+from app.schemas.task import TaskPage
+from app.repositories.unit_of_work import AsyncUnitOfWork
+from app.repositories.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from app.exceptions.repository_exceptions import InvalidCursorException
+
+router = APIRouter()
+
+@router.get("/search", response_model=TaskPage)
+async def search_tasks(
+    q: str = Query(..., min_length=1, max_length=200),
+    project_id: Optional[int] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Search task titles and descriptions, best match first
+
+    - **q**: Words to look for; a task must contain all of them, and the last
+      word also matches as a prefix (`dep` finds "deploy")
+    - **project_id**: Only search this project's tasks
+    - **limit**: Maximum number of tasks in the page
+    - **cursor**: `next_cursor` from the previous page (omit for the first page)
+
+    Title matches rank above description matches
+    """
+    uow = AsyncUnitOfWork(db)
+    try:
+        tasks, next_cursor = await uow.tasks.search(q, limit, cursor, project_id)
+    except InvalidCursorException as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except NotImplementedError as e:
+        raise HTTPException(status_code=501, detail=str(e))
+    return {"items": tasks, "next_cursor": next_cursor}
@@ -1,45 +1,122 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from typing import List
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
 
-from app.api.dependencies import get_db
-from app.schemas.task import TaskCreate, TaskResponse, TaskUpdate
-from app.services.task_service import TaskService
-from app.repositories.task_repository import TaskRepository
+from app.api.dependencies import get_async_db
+from app.api.etag import etag_matches, make_etag, not_modified
+from app.api.responses import rows_page_response, use_fast_json
+from app.schemas.task import TaskCreate, TaskResponse, TaskUpdate, TaskPage, TaskBatchCreate, TaskBatchResponse
+from app.services.async_task_service import AsyncTaskService
+from app.repositories.unit_of_work import AsyncUnitOfWork
+from app.repositories.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from app.exceptions.repository_exceptions import InvalidCursorException, ProjectNotFoundException
+from app.services.async_project_service import AsyncProjectService
+from app.exceptions.service_exceptions import TaskLimitExceededException
+from app.services.project_service import MAX_TASK_BATCH_SIZE
 from app.models.task import Task
 
 router = APIRouter()
 
-@router.get("/projects/{project_id}/tasks", response_model=List[TaskResponse])
-def get_project_tasks(project_id: int, db: Session = Depends(get_db)):
+@router.get("/projects/{project_id}/tasks", response_model=TaskPage)
+async def get_project_tasks(
+    project_id: int,
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_async_db)
+):
     """
-    Get all tasks for a specific project
+    Get the tasks of a specific project, newest first, one page at a time
     
     - **project_id**: ID of the project
+    - **limit**: Maximum number of tasks in the page
+    - **cursor**: `next_cursor` from the previous page (omit for the first page)
     
-    Returns list of tasks belonging to the project
+    Returns the page of tasks and the cursor of the next page
+    
+    Sends an `ETag`; repeat the request with `If-None-Match` to get a `304`
+    while the project's tasks are unchanged
     """
-    task_repo = TaskRepository(db)
-    return task_repo.get_by_project(project_id)
+    uow = AsyncUnitOfWork(db)
+    etag = None
+    version = await uow.projects.get_version(project_id)
+    if version is not None:
+        etag = make_etag("project_tasks", limit, cursor, tuple(version))
+        if etag_matches(etag, if_none_match):
+            return not_modified(etag)
+        response.headers["ETag"] = etag
+    
+    try:
+        if use_fast_json():
+            rows, next_cursor = await uow.tasks.get_page_rows_by_project(project_id, limit, cursor)
+            return rows_page_response(rows, next_cursor, etag)
+        tasks, next_cursor = await uow.tasks.get_page_by_project(project_id, limit, cursor)
+    except InvalidCursorException as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"items": tasks, "next_cursor": next_cursor}
 
 @router.post("/projects/{project_id}/tasks", response_model=TaskResponse)
-def create_task(project_id: int, task_data: TaskCreate, db: Session = Depends(get_db)):
-    task_repo = TaskRepository(db)
-    task_service = TaskService(task_repo)
+async def create_task(project_id: int, task_data: TaskCreate, db: AsyncSession = Depends(get_async_db)):
+    project_service = AsyncProjectService(AsyncUnitOfWork(db))
 
-    task = task_service.create_task(
-        title=task_data.title,
-        description=task_data.description,
-        project_id=project_id,
-        deadline=task_data.deadline
-    )
+    try:
+        return await project_service.add_task_to_project(
+            project_id,
+            title=task_data.title,
+            description=task_data.description,
+            deadline=task_data.deadline
+        )
+    except ProjectNotFoundException as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except (TaskLimitExceededException, ValueError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
-    return task
+@router.post("/projects/{project_id}/tasks:batch", response_model=TaskBatchResponse)
+async def create_tasks_batch(project_id: int, batch: TaskBatchCreate, db: AsyncSession = Depends(get_async_db)):
+    """
+    Create many tasks in one request
+    
+    - **project_id**: ID of the project
+    - **tasks**: List of tasks to create (at most 1000)
+    
+    Valid tasks are inserted together in a single transaction; invalid ones
+    (or those over the project's task limit) are reported per item
+    """
+    if len(batch.tasks) > MAX_TASK_BATCH_SIZE:
+        raise HTTPException(
+            status_code=400,
+            detail=f"❌ Too many tasks in one batch! Maximum {MAX_TASK_BATCH_SIZE} allowed."
+        )
+
+    project_service = AsyncProjectService(AsyncUnitOfWork(db))
+    items = [
+        {"title": task.title, "description": task.description, "deadline": task.deadline}
+        for task in batch.tasks
+    ]
+    try:
+        return await project_service.add_tasks_to_project(project_id, items)
+    except ProjectNotFoundException as e:
+        raise HTTPException(status_code=404, detail=str(e))
 
 @router.get("/tasks/{task_id}", response_model=TaskResponse)
-def get_task(task_id: int, db: Session = Depends(get_db)):
-    task_repo = TaskRepository(db)
-    task = task_repo.get_by_id(task_id)
+async def get_task(
+    task_id: int,
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_async_db)
+):
+    uow = AsyncUnitOfWork(db)
+    version = await uow.tasks.get_version(task_id)
+    if version is None:
+        raise HTTPException(status_code=404, detail="Task not found")
+    
+    etag = make_etag("task", tuple(version))
+    if etag_matches(etag, if_none_match):
+        return not_modified(etag)
+    response.headers["ETag"] = etag
+    
+    task = await uow.tasks.get_by_id(task_id)
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
     
@@ -47,9 +124,9 @@ def get_task(task_id: int, db: Session = Depends(get_db)):
 
 
 @router.put("/tasks/{task_id}", response_model=TaskResponse)
-def update_task(task_id: int, task_data: TaskUpdate, db: Session = Depends(get_db)):
-    task_repo = TaskRepository(db)
-    task = task_repo.get_by_id(task_id)
+async def update_task(task_id: int, task_data: TaskUpdate, db: AsyncSession = Depends(get_async_db)):
+    uow = AsyncUnitOfWork(db)
+    task = await uow.tasks.get_by_id(task_id)
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
    
@@ -59,30 +136,31 @@ def update_task(task_id: int, task_data: TaskUpdate, db: Session = Depends(get_d
     if task_data.status:
         task.status = task_data.status
     
-    return task_repo.update(task)
+    await uow.tasks.update(task)
+    await uow.commit()
+    return task
 
 @router.delete("/tasks/{task_id}")
-def delete_task(task_id: int, db: Session = Depends(get_db)):
-    task_repo = TaskRepository(db)
-    task = task_repo.get_by_id(task_id)
+async def delete_task(task_id: int, db: AsyncSession = Depends(get_async_db)):
+    uow = AsyncUnitOfWork(db)
+    task = await uow.tasks.get_by_id(task_id)
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
     
-    task_repo.delete(task_id)
+    await uow.tasks.delete(task_id)
+    await uow.commit()
     return {"message": "Task deleted successfully"}
 
 @router.patch("/tasks/{task_id}/status")
-def update_task_status(task_id: int, status: str, db: Session = Depends(get_db)):
-    task_repo = TaskRepository(db)
-    task_service = TaskService(task_repo)
+async def update_task_status(task_id: int, status: str, db: AsyncSession = Depends(get_async_db)):
+    task_service = AsyncTaskService(AsyncUnitOfWork(db))
     
-    task = task_service.change_task_status(task_id, status)
+    task = await task_service.change_task_status(task_id, status)
     return task
 
 @router.post("/tasks/autoclose-overdue")
-def autoclose_overdue_tasks(db: Session = Depends(get_db)):
-    task_repo = TaskRepository(db)
-    task_service = TaskService(task_repo)
+async def autoclose_overdue_tasks(db: AsyncSession = Depends(get_async_db)):
+    task_service = AsyncTaskService(AsyncUnitOfWork(db))
     
-    closed_count = task_service.close_overdue_tasks()
+    closed_count = await task_service.close_overdue_tasks()
     return {"message": f"Closed {closed_count} overdue tasks"}
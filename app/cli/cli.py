@@ -1,6 +1,7 @@
 from app.db.session import SessionLocal
 from app.repositories.project_repository import ProjectRepository
 from app.repositories.task_repository import TaskRepository
+from app.repositories.unit_of_work import UnitOfWork
 from app.models.project import Project
 from app.models.task import Task
 from datetime import datetime
@@ -10,10 +11,11 @@ def create_project_cli():
     description = input("Project description: ")
 
     db = SessionLocal()
-    repo = ProjectRepository(db)
+    uow = UnitOfWork(db)
 
     project = Project(name=name, description=description)
-    repo.create(project)
+    uow.projects.create(project)
+    uow.commit()
 
     print("✅ Project created with ID:", project.id)
     db.close()
@@ -45,7 +47,7 @@ def create_task_cli():
             return
 
     db = SessionLocal()
-    repo = TaskRepository(db)
+    uow = UnitOfWork(db)
 
     task = Task(
         title=title,
@@ -54,7 +56,8 @@ def create_task_cli():
         deadline=deadline
     )
 
-    repo.create(task)
+    uow.tasks.create(task)
+    uow.commit()
 
     print("✅ Task created with ID:", task.id)
     db.close()
@@ -77,9 +80,10 @@ def delete_task_cli():
     task_id = int(input("Task ID to delete: "))
 
     db = SessionLocal()
-    repo = TaskRepository(db)
+    uow = UnitOfWork(db)
 
-    ok = repo.delete(task_id)
+    ok = uow.tasks.delete(task_id)
+    uow.commit()
     if ok:
         print("🗑 Task deleted.")
     else:
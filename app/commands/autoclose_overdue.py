@@ -9,17 +9,18 @@ if __name__ == "__main__":
     if project_root not in sys.path:
         sys.path.insert(0, project_root)
 
+from app.db.query_detector import query_scope
 from app.db.session import SessionLocal
-from app.repositories.task_repository import TaskRepository
+from app.repositories.unit_of_work import UnitOfWork
 from app.services.task_service import TaskService
 
 def autoclose_overdue_tasks():
     db = SessionLocal()
     try:
-        task_repo = TaskRepository(db)
-        task_service = TaskService(task_repo)
+        task_service = TaskService(UnitOfWork(db))
         
-        closed_count = task_service.close_overdue_tasks()
+        with query_scope("autoclose_overdue"):
+            closed_count = task_service.close_overdue_tasks()
         
         # Log with timestamp
         timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
@@ -0,0 +1,218 @@
+"""
+Bulk import of projects and tasks from a JSONL or CSV file
+
+Every record has a ``type`` of ``project`` or ``task``:
+
+    {"type": "project", "project": "Website", "description": "Company site"}
+    {"type": "task", "project": "Website", "title": "Draft copy", "description": "",
+     "status": "todo", "deadline": "2025-03-01"}
+
+CSV files use the same keys as columns (type, project, title, description,
+status, deadline). Tasks refer to their project by name, so a file can create
+projects and fill them in one pass. Projects go through ProjectService; tasks
+are checked with the same rules and written in batches (COPY on Postgres,
+executemany elsewhere), one commit per batch.
+
+Usage:
+    python -m app.commands.import_data tasks.jsonl --batch-size 5000
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from datetime import datetime
+
+# Only modify path if not running as module
+if __name__ == "__main__":
+    current_dir = os.path.dirname(__file__)
+    project_root = os.path.abspath(os.path.join(current_dir, '../../../'))
+    if project_root not in sys.path:
+        sys.path.insert(0, project_root)
+
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.db.query_detector import query_scope
+from app.db.session import SessionLocal
+from app.exceptions.repository_exceptions import RepositoryException
+from app.exceptions.service_exceptions import ServiceException, TaskLimitExceededException, InvalidTaskStatusException
+from app.repositories.unit_of_work import UnitOfWork
+from app.services.project_service import ProjectService, validate_task_fields
+from app.services.task_service import VALID_STATUSES
+
+DEFAULT_BATCH_SIZE = 5000
+
+
+def read_records(path: str, file_format: str):
+    """
+    Yield ``(line_number, raw)`` pairs without loading the whole file
+
+    ``raw`` is a dict for CSV rows and the unparsed line for JSONL, so a
+    malformed line is rejected by ``parse_record`` instead of ending the read.
+    """
+    with open(path, newline="", encoding="utf-8") as f:
+        if file_format == "csv":
+            # Line 1 is the header
+            for line_number, record in enumerate(csv.DictReader(f), start=2):
+                yield line_number, record
+        else:
+            for line_number, line in enumerate(f, start=1):
+                if line.strip():
+                    yield line_number, line
+
+
+def parse_record(raw) -> dict:
+    if isinstance(raw, dict):
+        return raw
+    try:
+        record = json.loads(raw)
+    except json.JSONDecodeError as e:
+        raise ValueError(f"❌ Invalid JSON: {e}")
+    if not isinstance(record, dict):
+        raise ValueError("❌ Invalid record! Each line must be a JSON object.")
+    return record
+
+
+def parse_datetime(value):
+    if value in (None, ""):
+        return None
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        raise ValueError(f"❌ Invalid date '{value}'! Please use ISO format (e.g., 2024-12-31)")
+
+
+class BulkImporter:
+    """Validates records with the ProjectService rules and writes tasks in batches"""
+
+    def __init__(self, uow: UnitOfWork, batch_size: int = DEFAULT_BATCH_SIZE):
+        self.uow = uow
+        self.project_service = ProjectService(uow)
+        self.batch_size = batch_size
+        self.batch = []
+        self.projects_created = 0
+        self.tasks_imported = 0
+        self.rejected = 0
+        self.started = time.perf_counter()
+        # COPY runs on the raw DBAPI cursor, so its errors are not wrapped in SQLAlchemyError
+        self.database_errors = (SQLAlchemyError, uow.db.get_bind().dialect.dbapi.Error)
+
+        # Existing projects and their task counts, read once up front
+        self.project_ids = {}
+        self.task_counts = {}
+        cursor = None
+        while True:
+            rows, cursor = self.uow.projects.get_page_with_task_counts(1000, cursor)
+            for row in rows:
+                self.project_ids[row.name] = row.id
+                self.task_counts[row.id] = row.task_count
+            if cursor is None:
+                break
+
+    @property
+    def rows_per_second(self) -> float:
+        elapsed = time.perf_counter() - self.started
+        return (self.tasks_imported + self.projects_created) / elapsed if elapsed else 0.0
+
+    def add(self, record: dict) -> None:
+        record_type = (record.get("type") or "").strip().lower()
+        if record_type == "project":
+            self.add_project(record)
+        elif record_type == "task":
+            self.add_task(record)
+        else:
+            raise ValueError(f"❌ Unknown record type '{record.get('type')}'! Use 'project' or 'task'.")
+
+    def add_project(self, record: dict) -> None:
+        project = self.project_service.create_project(record["project"], record.get("description") or "")
+        self.project_ids[project.name] = project.id
+        self.task_counts[project.id] = 0
+        self.projects_created += 1
+
+    def add_task(self, record: dict) -> None:
+        title = record.get("title") or ""
+        description = record.get("description") or ""
+        validate_task_fields(title, description)
+
+        status = record.get("status") or "todo"
+        if status not in VALID_STATUSES:
+            raise InvalidTaskStatusException(status)
+
+        project_id = self.project_ids.get(record.get("project"))
+        if project_id is None:
+            raise ValueError(f"❌ Project '{record.get('project')}' not found!")
+        if self.task_counts[project_id] >= self.project_service.max_tasks:
+            raise TaskLimitExceededException(self.project_service.max_tasks)
+
+        now = datetime.now()
+        self.batch.append({
+            "title": title,
+            "description": description,
+            "status": status,
+            "project_id": project_id,
+            "deadline": parse_datetime(record.get("deadline")),
+            "created_at": parse_datetime(record.get("created_at")) or now,
+            "closed_at": parse_datetime(record.get("closed_at")) or (now if status == "done" else None),
+        })
+        self.task_counts[project_id] += 1
+
+        if len(self.batch) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self.batch:
+            return
+        batch, self.batch = self.batch, []
+        try:
+            self.tasks_imported += self.uow.tasks.bulk_insert(batch)
+            self.uow.commit()
+        except self.database_errors as e:
+            # Drop this batch only; later batches still get their chance
+            self.uow.rollback()
+            self.rejected += len(batch)
+            for row in batch:
+                self.task_counts[row["project_id"]] -= 1
+            print(f"   ⚠️ Batch of {len(batch):,} tasks rejected: {e}", file=sys.stderr)
+            return
+        print(f"   … {self.tasks_imported:,} tasks imported ({self.rows_per_second:,.0f} rows/s)")
+
+
+def import_file(path: str, file_format: str = None, batch_size: int = DEFAULT_BATCH_SIZE) -> BulkImporter:
+    if file_format is None:
+        file_format = "csv" if path.lower().endswith(".csv") else "jsonl"
+
+    db = SessionLocal()
+    try:
+        importer = BulkImporter(UnitOfWork(db), batch_size)
+        for line_number, raw in read_records(path, file_format):
+            try:
+                importer.add(parse_record(raw))
+            except (ValueError, KeyError, ServiceException, RepositoryException) as e:
+                importer.rejected += 1
+                print(f"   ⚠️ Line {line_number}: {e}", file=sys.stderr)
+        importer.flush()
+        return importer
+    finally:
+        db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk import projects and tasks from a JSONL or CSV file")
+    parser.add_argument("path", help="JSONL or CSV file to import")
+    parser.add_argument("--format", choices=["jsonl", "csv"], help="File format (default: from the extension)")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="Tasks per insert/commit")
+    args = parser.parse_args()
+
+    print(f"📥 Importing {args.path} ...")
+    with query_scope("import_data"):
+        importer = import_file(args.path, args.format, args.batch_size)
+    elapsed = time.perf_counter() - importer.started
+    print(
+        f"✅ Imported {importer.projects_created:,} projects and {importer.tasks_imported:,} tasks "
+        f"in {elapsed:.1f}s ({importer.rows_per_second:,.0f} rows/s), rejected {importer.rejected:,}"
+    )
+
+
+if __name__ == "__main__":
+    main()
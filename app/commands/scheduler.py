@@ -1,22 +1,50 @@
-import schedule
 import time
+from datetime import datetime
+
+from app.db.session import SessionLocal
+from app.repositories.unit_of_work import UnitOfWork
+from app.services.deadline_scheduler import DeadlineScheduler
 from .autoclose_overdue import autoclose_overdue_tasks
 
+
+def _log(message: str) -> None:
+    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    print(f"[{timestamp}] {message}")
+
+
 def start_scheduler():
-    """Start the scheduled task runner"""
+    """Start the deadline-driven task runner"""
     print("🕐 Starting TodoList scheduler...")
-    print("⏰ Autoclose task will run every 15 minutes")
-    
-    # Schedule the task to run every 15 minutes
-    schedule.every(15).minutes.do(autoclose_overdue_tasks)
-    
-    # Run immediately once
+
+    # Catch up on everything that expired while the scheduler was down
     autoclose_overdue_tasks()
-    
-    # Keep the scheduler running
-    while True:
-        schedule.run_pending()
-        time.sleep(1)
+
+    db = SessionLocal()
+    try:
+        scheduler = DeadlineScheduler(UnitOfWork(db))
+        print(
+            f"⏰ Closing tasks as their deadlines pass "
+            f"(lookahead {scheduler.lookahead}, refresh every {scheduler.refresh_interval})"
+        )
+        while True:
+            try:
+                now = datetime.now()
+                if scheduler.needs_refresh(now):
+                    scheduler.refresh(now)
+                closed_count = scheduler.close_due(now)
+                if closed_count > 0:
+                    _log(f"✅ Closed {closed_count} overdue tasks")
+                delay = scheduler.seconds_until_wakeup(datetime.now())
+            except Exception as e:
+                db.rollback()
+                # Popped deadlines may not have been closed: start from a clean window
+                scheduler.reset()
+                _log(f"❌ Error: {e}")
+                delay = scheduler.refresh_interval.total_seconds()
+            time.sleep(delay)
+    finally:
+        db.close()
+
 
 if __name__ == "__main__":
-    start_scheduler()
\ No newline at end of file
+    start_scheduler()
@@ -1,4 +1,4 @@
 from .base import Base
-from .session import engine, get_db, SessionLocal
+from .session import engine, get_db, SessionLocal, async_engine, get_async_db, AsyncSessionLocal
 
-__all__ = ["Base", "engine", "get_db", "SessionLocal"]
\ No newline at end of file
+__all__ = ["Base", "engine", "get_db", "SessionLocal", "async_engine", "get_async_db", "AsyncSessionLocal"]
@@ -0,0 +1,82 @@
+"""
+Full-text index over task titles and descriptions
+
+The database keeps the index in step with ``tasks`` by itself, inside the
+statement that writes the row. That covers every TaskRepository write path,
+including ORM flushes, multi-row inserts, COPY and cascade deletes:
+
+* SQLite: an external-content FTS5 table, ``tasks_fts``, fed by triggers
+* Postgres: a generated ``tsvector`` column, ``tasks.search_vector``, with a
+  GIN index
+
+The same DDL is issued by the Alembic migration for existing databases and by
+``create_all`` for fresh ones.
+"""
+from sqlalchemy import DDL, event
+
+# Stemming-free configuration: titles are short and not always English
+POSTGRES_CONFIG = "simple"
+
+SQLITE_CREATE = (
+    # prefix='2 3' indexes 2- and 3-character prefixes for search-as-you-type
+    """
+    CREATE VIRTUAL TABLE tasks_fts USING fts5(
+        title, description,
+        content='tasks', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+    )
+    """,
+    """
+    CREATE TRIGGER tasks_fts_insert AFTER INSERT ON tasks BEGIN
+        INSERT INTO tasks_fts (rowid, title, description) VALUES (new.id, new.title, new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER tasks_fts_delete AFTER DELETE ON tasks BEGIN
+        INSERT INTO tasks_fts (tasks_fts, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+    END
+    """,
+    # Status-only updates (sweeps, closing tasks) do not touch the index
+    """
+    CREATE TRIGGER tasks_fts_update AFTER UPDATE OF title, description ON tasks BEGIN
+        INSERT INTO tasks_fts (tasks_fts, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+        INSERT INTO tasks_fts (rowid, title, description) VALUES (new.id, new.title, new.description);
+    END
+    """,
+)
+
+SQLITE_DROP = (
+    "DROP TRIGGER IF EXISTS tasks_fts_update",
+    "DROP TRIGGER IF EXISTS tasks_fts_delete",
+    "DROP TRIGGER IF EXISTS tasks_fts_insert",
+    "DROP TABLE IF EXISTS tasks_fts",
+)
+
+POSTGRES_CREATE = (
+    # Title matches (weight A) rank above description matches (weight B)
+    f"""
+    ALTER TABLE tasks ADD COLUMN search_vector tsvector GENERATED ALWAYS AS (
+        setweight(to_tsvector('{POSTGRES_CONFIG}', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('{POSTGRES_CONFIG}', coalesce(description, '')), 'B')
+    ) STORED
+    """,
+    "CREATE INDEX ix_tasks_search_vector ON tasks USING gin (search_vector)",
+)
+
+POSTGRES_DROP = (
+    "DROP INDEX IF EXISTS ix_tasks_search_vector",
+    "ALTER TABLE tasks DROP COLUMN IF EXISTS search_vector",
+)
+
+
+def install_search_index(table) -> None:
+    """Create the index along with ``table`` on ``create_all`` (and drop it on ``drop_all``)"""
+    for statement in SQLITE_CREATE:
+        event.listen(table, "after_create", DDL(statement).execute_if(dialect="sqlite"))
+    for statement in POSTGRES_CREATE:
+        event.listen(table, "after_create", DDL(statement).execute_if(dialect="postgresql"))
+    # The FTS5 table is not part of the metadata, so drop_all would leave it behind
+    for statement in SQLITE_DROP:
+        event.listen(table, "before_drop", DDL(statement).execute_if(dialect="sqlite"))
@@ -0,0 +1,74 @@
+"""
+Query accounting through SQLAlchemy engine events
+
+``instrument_engine`` times every statement on an engine. The totals feed the
+process-wide ``db_*`` metrics and, inside ``track_queries()``, a per-scope
+``QueryStats`` (one HTTP request or one CLI command).
+"""
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+
+from sqlalchemy import event
+
+from app.metrics import DB_QUERIES, DB_QUERY_DURATION
+
+_START_TIMES = "query_start_times"
+
+
+class QueryStats:
+    """Statements executed and time spent in the database within one scope"""
+
+    def __init__(self, name: str = ""):
+        self.name = name
+        self.count = 0
+        self.duration = 0.0
+
+    def record(self, statement: str, parameters, duration: float) -> None:
+        self.count += 1
+        self.duration += duration
+
+    def report(self) -> None:
+        """Called when the scope ends; subclasses summarise what they saw"""
+
+
+_current_stats: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+
+def current_query_stats() -> Optional[QueryStats]:
+    return _current_stats.get()
+
+
+@contextmanager
+def track_queries(stats: Optional[QueryStats] = None):
+    """Count the statements executed in this context (thread / task) into ``stats``"""
+    stats = stats if stats is not None else QueryStats()
+    token = _current_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _current_stats.reset(token)
+
+
+def instrument_engine(engine, label: str) -> None:
+    """Time every statement on a sync engine (pass ``async_engine.sync_engine`` for async ones)"""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def start_timer(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault(_START_TIMES, []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def record_query(conn, cursor, statement, parameters, context, executemany):
+        duration = time.perf_counter() - conn.info[_START_TIMES].pop()
+        DB_QUERIES.inc(engine=label)
+        DB_QUERY_DURATION.observe(duration, engine=label)
+        stats = _current_stats.get()
+        if stats is not None:
+            stats.record(statement, parameters, duration)
+
+    @event.listens_for(engine, "handle_error")
+    def drop_timer(exception_context):
+        conn = exception_context.connection
+        if conn is not None and conn.info.get(_START_TIMES):
+            conn.info[_START_TIMES].pop()
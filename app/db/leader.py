@@ -0,0 +1,131 @@
+"""
+Leader election for jobs that must run in exactly one worker
+
+Every worker tries to take the same lock; the one that gets it is the
+leader. The lock belongs to a database session (Postgres) or an open file
+(SQLite). Both die with the process, so when the leader exits or crashes,
+another worker wins the lock on its next attempt.
+"""
+import os
+import tempfile
+
+from sqlalchemy import text
+from sqlalchemy.engine import make_url
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+# pg_try_advisory_lock key of the autoclose scheduler (any constant bigint works)
+SCHEDULER_LOCK_KEY = 727_105_018
+
+
+class PostgresAdvisoryLock:
+    """Session-level ``pg_try_advisory_lock`` held on a dedicated connection"""
+
+    def __init__(self, engine, key: int = SCHEDULER_LOCK_KEY):
+        self.engine = engine
+        self.key = key
+        self._conn = None
+
+    async def acquire(self) -> bool:
+        if self._conn is not None:
+            return True
+        conn = await self.engine.connect()
+        try:
+            acquired = await conn.scalar(text("SELECT pg_try_advisory_lock(:key)"), {"key": self.key})
+            # Session-level locks outlive the transaction; do not sit idle in one
+            await conn.commit()
+        except Exception:
+            await conn.close()
+            raise
+        if not acquired:
+            await conn.close()
+            return False
+        self._conn = conn
+        return True
+
+    async def is_held(self) -> bool:
+        """Whether the lock's connection is still alive (if it died, so did the lock)"""
+        if self._conn is None:
+            return False
+        try:
+            await self._conn.execute(text("SELECT 1"))
+            await self._conn.commit()
+            return True
+        except Exception:
+            await self.release()
+            return False
+
+    async def release(self) -> None:
+        if self._conn is None:
+            return
+        conn, self._conn = self._conn, None
+        try:
+            await conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": self.key})
+            await conn.commit()
+        except Exception:
+            # A broken connection has already dropped the lock
+            await conn.invalidate()
+        finally:
+            await conn.close()
+
+
+class FileLock:
+    """Exclusive, non-blocking lock on a file, released by the OS when the process exits"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = None
+
+    async def acquire(self) -> bool:
+        if self._file is not None:
+            return True
+        f = open(self.path, "a+")
+        f.seek(0)
+        try:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            else:
+                msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+        except OSError:
+            f.close()
+            return False
+        self._file = f
+        return True
+
+    async def is_held(self) -> bool:
+        return self._file is not None
+
+    async def release(self) -> None:
+        if self._file is None:
+            return
+        f, self._file = self._file, None
+        f.seek(0)
+        try:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+            else:
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+        finally:
+            f.close()
+
+
+def scheduler_lock_file(url: str) -> str:
+    """Lock file next to a SQLite database (temp dir for in-memory ones), unless SCHEDULER_LOCK_FILE is set"""
+    path = os.getenv("SCHEDULER_LOCK_FILE")
+    if path:
+        return path
+    database = make_url(url).database
+    if not database or database == ":memory:":
+        return os.path.join(tempfile.gettempdir(), "todolist-scheduler.lock")
+    return os.path.abspath(database) + ".scheduler.lock"
+
+
+def leader_lock(engine):
+    """The leader lock for an async engine's backend"""
+    if engine.dialect.name == "postgresql":
+        return PostgresAdvisoryLock(engine)
+    return FileLock(scheduler_lock_file(str(engine.url)))
@@ -0,0 +1,167 @@
+import os
+import threading
+import time
+
+from sqlalchemy import event, exc
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+# Production presets per backend; every value can be overridden from the environment
+POOL_PRESETS = {
+    "postgresql": {
+        "pool_size": 10,
+        "max_overflow": 20,
+        "pool_timeout": 30,
+        "pool_recycle": 1800,
+        "pool_pre_ping": True,
+    },
+    "sqlite": {
+        "pool_size": 5,
+        "max_overflow": 10,
+        "pool_timeout": 30,
+        "pool_recycle": -1,
+        "pool_pre_ping": False,
+    },
+}
+
+SQLITE_PRAGMA_PRESETS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "busy_timeout": "5000",
+    "mmap_size": str(256 * 1024 * 1024),
+    # Off by default in SQLite; without it deleted projects can still gain tasks
+    "foreign_keys": "ON",
+}
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+def _backend(url: str) -> str:
+    backend = make_url(url).get_backend_name()
+    return "postgresql" if backend == "postgres" else backend
+
+
+def _is_memory_sqlite(url: str) -> bool:
+    database = make_url(url).database
+    return not database or database == ":memory:"
+
+
+class PoolStatsMixin:
+    """Record how long callers wait to check a connection out of the pool"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._stats_lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            with self._stats_lock:
+                self.timeouts += 1
+            raise
+        finally:
+            waited = time.perf_counter() - start
+            with self._stats_lock:
+                self.checkouts += 1
+                self.total_wait += waited
+                self.max_wait = max(self.max_wait, waited)
+
+    def stats(self) -> dict:
+        with self._stats_lock:
+            avg_wait = self.total_wait / self.checkouts if self.checkouts else 0.0
+            return {
+                "size": self.size(),
+                "checked_out": self.checkedout(),
+                "checked_in": self.checkedin(),
+                "overflow": max(self.overflow(), 0),
+                "max_overflow": self._max_overflow,
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "avg_wait_ms": round(avg_wait * 1000, 3),
+                "max_wait_ms": round(self.max_wait * 1000, 3),
+            }
+
+
+class StatsQueuePool(PoolStatsMixin, QueuePool):
+    pass
+
+
+class StatsAsyncQueuePool(PoolStatsMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def engine_options(url: str, is_async: bool = False) -> dict:
+    """
+    Keyword arguments for create_engine/create_async_engine
+
+    Starts from the backend preset and applies DB_POOL_SIZE, DB_MAX_OVERFLOW,
+    DB_POOL_TIMEOUT, DB_POOL_RECYCLE and DB_POOL_PRE_PING from the environment.
+    """
+    backend = _backend(url)
+    options = {}
+    if backend == "sqlite" and not is_async:
+        options["connect_args"] = {"check_same_thread": False}
+
+    # In-memory SQLite lives in a single connection, so there is no pool to tune
+    if backend == "sqlite" and _is_memory_sqlite(url):
+        return options
+
+    preset = POOL_PRESETS.get(backend, POOL_PRESETS["postgresql"])
+    options.update({
+        "poolclass": StatsAsyncQueuePool if is_async else StatsQueuePool,
+        "pool_size": int(os.getenv("DB_POOL_SIZE", preset["pool_size"])),
+        "max_overflow": int(os.getenv("DB_MAX_OVERFLOW", preset["max_overflow"])),
+        "pool_timeout": float(os.getenv("DB_POOL_TIMEOUT", preset["pool_timeout"])),
+        "pool_recycle": int(os.getenv("DB_POOL_RECYCLE", preset["pool_recycle"])),
+        "pool_pre_ping": _env_bool("DB_POOL_PRE_PING", preset["pool_pre_ping"]),
+    })
+    return options
+
+
+def sqlite_pragmas() -> dict:
+    """SQLite PRAGMAs from SQLITE_JOURNAL_MODE, SQLITE_SYNCHRONOUS, SQLITE_BUSY_TIMEOUT, SQLITE_MMAP_SIZE and SQLITE_FOREIGN_KEYS"""
+    return {
+        name: os.getenv(f"SQLITE_{name.upper()}", default)
+        for name, default in SQLITE_PRAGMA_PRESETS.items()
+    }
+
+
+def configure_engine(engine) -> None:
+    """Apply per-connection settings (SQLite PRAGMAs) to a sync engine"""
+    if engine.dialect.name != "sqlite":
+        return
+
+    pragmas = sqlite_pragmas()
+    if _is_memory_sqlite(str(engine.url)):
+        # WAL and mmap do not apply to in-memory databases
+        pragmas.pop("journal_mode")
+        pragmas.pop("mmap_size")
+
+    @event.listens_for(engine, "connect")
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                if value:
+                    cursor.execute(f"PRAGMA {name}={value}")
+        finally:
+            cursor.close()
+
+
+def pool_stats(engine) -> dict:
+    """Pool statistics of an engine, for the health endpoint"""
+    pool = engine.pool
+    if isinstance(pool, PoolStatsMixin):
+        return pool.stats()
+    return {"pool": type(pool).__name__, "status": pool.status()}
@@ -0,0 +1,118 @@
+"""
+Opt-in slow-query and N+1 detector
+
+Enabled with ``QUERY_DETECTOR=true``. Within each scope (one HTTP request, or
+one CLI command wrapped in ``query_scope``) it:
+
+- logs every statement slower than ``QUERY_DETECTOR_SLOW_MS`` with its parameters
+- flags a statement shape repeated ``QUERY_DETECTOR_REPEAT_THRESHOLD`` times,
+  the usual sign of a per-row query (N+1)
+- with ``QUERY_DETECTOR_STRICT=true``, raises QueryBudgetExceededException as
+  soon as the scope runs more than ``QUERY_DETECTOR_BUDGET`` statements
+  (meant for tests; 0 means no budget)
+"""
+import logging
+import os
+import re
+from collections import Counter
+from contextlib import contextmanager
+
+from app.db.instrumentation import QueryStats, track_queries
+from app.exceptions.repository_exceptions import QueryBudgetExceededException
+
+logger = logging.getLogger(__name__)
+
+MAX_PARAMETERS_LENGTH = 500
+
+# A parenthesised list of bind placeholders in any paramstyle: "(?, ?, ?)",
+# "(%(id_1)s, %(id_2)s)", "($1, $2)". Expanded IN lists differ only in length
+_PLACEHOLDER = r"(?:\?|%\(\w+\)s|%s|\$\d+|:\w+)"
+_PLACEHOLDER_LIST = re.compile(rf"\(\s*{_PLACEHOLDER}(?:\s*,\s*{_PLACEHOLDER})*\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def _env_bool(name: str, default: bool = False) -> bool:
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+class DetectorSettings:
+    """Detector configuration, read from the environment (tests may change it in place)"""
+
+    def __init__(self):
+        self.enabled = _env_bool("QUERY_DETECTOR")
+        self.slow_ms = float(os.getenv("QUERY_DETECTOR_SLOW_MS", 100))
+        self.repeat_threshold = int(os.getenv("QUERY_DETECTOR_REPEAT_THRESHOLD", 10))
+        self.budget = int(os.getenv("QUERY_DETECTOR_BUDGET", 0))
+        self.strict = _env_bool("QUERY_DETECTOR_STRICT")
+
+
+settings = DetectorSettings()
+
+
+def statement_shape(statement: str) -> str:
+    """Normalise a statement so executions that differ only in IN-list length compare equal"""
+    return _PLACEHOLDER_LIST.sub("(...)", _WHITESPACE.sub(" ", statement).strip())
+
+
+def _format_parameters(parameters) -> str:
+    text = repr(parameters)
+    if len(text) > MAX_PARAMETERS_LENGTH:
+        text = text[:MAX_PARAMETERS_LENGTH] + "..."
+    return text
+
+
+class QueryDetector(QueryStats):
+    """QueryStats that also watches for slow statements, repeats and the query budget"""
+
+    def __init__(self, name: str = ""):
+        super().__init__(name)
+        self.shapes = Counter()
+        self.flagged = set()
+
+    def record(self, statement: str, parameters, duration: float) -> None:
+        super().record(statement, parameters, duration)
+
+        if duration * 1000 >= settings.slow_ms:
+            logger.warning(
+                "Slow query (%.1f ms) in %s: %s | parameters: %s",
+                duration * 1000, self.name, statement, _format_parameters(parameters),
+            )
+
+        shape = statement_shape(statement)
+        self.shapes[shape] += 1
+        if self.shapes[shape] >= settings.repeat_threshold and shape not in self.flagged:
+            self.flagged.add(shape)
+            logger.warning(
+                "Possible N+1 in %s: the same statement ran %d times: %s",
+                self.name, self.shapes[shape], shape,
+            )
+
+        if settings.strict and settings.budget and self.count > settings.budget:
+            raise QueryBudgetExceededException(self.name, settings.budget)
+
+    def report(self) -> None:
+        if self.flagged:
+            repeated = "; ".join(f"{self.shapes[shape]}x {shape}" for shape in self.flagged)
+            logger.warning(
+                "%s ran %d queries in %.1f ms, repeated: %s",
+                self.name, self.count, self.duration * 1000, repeated,
+            )
+
+
+def new_query_stats(name: str) -> QueryStats:
+    """Stats for one scope: a QueryDetector when the detector is enabled, plain counters otherwise"""
+    return QueryDetector(name) if settings.enabled else QueryStats(name)
+
+
+@contextmanager
+def query_scope(name: str):
+    """Track (and, when enabled, inspect) the queries of one CLI command or job"""
+    stats = new_query_stats(name)
+    try:
+        with track_queries(stats):
+            yield stats
+    finally:
+        stats.report()
@@ -1,20 +1,51 @@
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from sqlalchemy.orm import sessionmaker
 import os
 from dotenv import load_dotenv
+from app.db.instrumentation import instrument_engine
+from app.db.pool import configure_engine, engine_options
 
 load_dotenv()
 
 # Use SQLite instead of PostgreSQL
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./todo.db")
 
-# For SQLite we need to add check_same_thread=False
-engine = create_engine(
-    DATABASE_URL, 
-    connect_args={"check_same_thread": False} if DATABASE_URL.startswith("sqlite") else {}
-)
+# Async drivers used by the API for each backend
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+    "postgres": "postgresql+asyncpg",
+}
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+def to_async_url(url: str) -> str:
+    """Swap the driver of a sync database URL for its async counterpart"""
+    parsed = make_url(url)
+    backend = parsed.drivername.split("+")[0]
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver configured for '{parsed.drivername}'")
+    return parsed.set(drivername=ASYNC_DRIVERS[backend]).render_as_string(hide_password=False)
+
+
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL", to_async_url(DATABASE_URL))
+
+# Pool sizing and SQLite PRAGMAs come from the backend presets in app/db/pool.py
+# and can be tuned with DB_POOL_* / SQLITE_* environment variables
+engine = create_engine(DATABASE_URL, **engine_options(DATABASE_URL))
+configure_engine(engine)
+instrument_engine(engine, "sync")
+
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
+
+# Async engine for the API. Objects are not expired on commit because an
+# expired attribute cannot be lazily reloaded outside an await
+async_engine = create_async_engine(ASYNC_DATABASE_URL, **engine_options(ASYNC_DATABASE_URL, is_async=True))
+configure_engine(async_engine.sync_engine)
+instrument_engine(async_engine.sync_engine, "async")
+
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
 
 def get_db():
     """Dependency to get database session"""
@@ -22,4 +53,9 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+async def get_async_db():
+    """Dependency to get an async database session"""
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -2,7 +2,9 @@ from .repository_exceptions import (
     RepositoryException,
     ProjectNotFoundException,
     TaskNotFoundException,
-    DuplicateProjectNameException
+    DuplicateProjectNameException,
+    InvalidCursorException,
+    QueryBudgetExceededException
 )
 
 from .service_exceptions import (
@@ -19,6 +21,8 @@ __all__ = [
     "ProjectNotFoundException", 
     "TaskNotFoundException",
     "DuplicateProjectNameException",
+    "InvalidCursorException",
+    "QueryBudgetExceededException",
     
     # Service Exceptions
     "ServiceException",
@@ -15,4 +15,15 @@ class TaskNotFoundException(RepositoryException):
 class DuplicateProjectNameException(RepositoryException):
     def __init__(self, project_name: str):
         self.project_name = project_name
-        super().__init__(f"❌ Project name '{project_name}' already exists!")
\ No newline at end of file
+        super().__init__(f"❌ Project name '{project_name}' already exists!")
+
+class InvalidCursorException(RepositoryException):
+    def __init__(self, cursor: str):
+        self.cursor = cursor
+        super().__init__(f"❌ Invalid pagination cursor '{cursor}'!")
+
+class QueryBudgetExceededException(RepositoryException):
+    def __init__(self, scope: str, budget: int):
+        self.scope = scope
+        self.budget = budget
+        super().__init__(f"❌ '{scope}' exceeded its budget of {budget} database queries!")
@@ -1,4 +1,5 @@
 from .project import Project
 from .task import Task
+from .sweep_state import SweepState
 
-__all__ = ["Project", "Task"]
\ No newline at end of file
+__all__ = ["Project", "Task", "SweepState"]
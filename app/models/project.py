@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, Text
+from sqlalchemy import Column, Integer, String, DateTime, Text, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.db.base import Base
@@ -11,8 +11,15 @@ class Project(Base):
     name = Column(String(30), nullable=False, unique=True)
     description = Column(String(150), nullable=False)
     created_at = Column(DateTime, default=datetime.now)
+    # Bumped on every write to the project or its tasks (see app/repositories/versions.py)
+    version = Column(Integer, nullable=False, default=1, server_default="1")
     
     tasks = relationship("Task", back_populates="project", cascade="all, delete-orphan")
+
+    __table_args__ = (
+        # Keyset pages of projects (newest first), read backwards
+        Index("ix_projects_created_at_id", created_at, id),
+    )
     
     def __repr__(self):
         return f"<Project(id={self.id}, name='{self.name}')>"
\ No newline at end of file
@@ -0,0 +1,14 @@
+from sqlalchemy import Column, String, DateTime
+from app.db.base import Base
+
+class SweepState(Base):
+    
+    __tablename__ = "sweep_state"
+    
+    # One row per incremental sweep (e.g. "autoclose_overdue")
+    name = Column(String(50), primary_key=True)
+    # Every deadline at or before this has been swept
+    watermark = Column(DateTime, nullable=False)
+    
+    def __repr__(self):
+        return f"<SweepState(name='{self.name}', watermark={self.watermark})>"
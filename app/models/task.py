@@ -1,7 +1,8 @@
-from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.db.base import Base
+from app.db.fulltext import install_search_index
 
 class Task(Base):
     
@@ -17,6 +18,21 @@ class Task(Base):
     closed_at = Column(DateTime, nullable=True) 
     
     project = relationship("Project", back_populates="tasks")
+
+    __table_args__ = (
+        Index("ix_tasks_project_id_created_at", project_id, created_at.desc()),
+        Index("ix_tasks_status_deadline", status, deadline),
+        Index(
+            "ix_tasks_open_deadline",
+            deadline,
+            postgresql_where=(status != "done"),
+            sqlite_where=(status != "done"),
+        ),
+    )
     
     def __repr__(self):
-        return f"<Task(id={self.id}, title='{self.title}', status='{self.status}')>"
\ No newline at end of file
+        return f"<Task(id={self.id}, title='{self.title}', status='{self.status}')>"
+
+
+# tasks_fts (SQLite) / tasks.search_vector (Postgres), see app/db/fulltext.py
+install_search_index(Task.__table__)
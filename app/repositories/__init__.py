@@ -1,4 +1,14 @@
 from .project_repository import ProjectRepository
 from .task_repository import TaskRepository
+from .async_project_repository import AsyncProjectRepository
+from .async_task_repository import AsyncTaskRepository
+from .unit_of_work import UnitOfWork, AsyncUnitOfWork
 
-__all__ = ["ProjectRepository", "TaskRepository"]
\ No newline at end of file
+__all__ = [
+    "ProjectRepository",
+    "TaskRepository",
+    "AsyncProjectRepository",
+    "AsyncTaskRepository",
+    "UnitOfWork",
+    "AsyncUnitOfWork",
+]
@@ -0,0 +1,95 @@
+from sqlalchemy import func, select
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Dict, List, Optional, Tuple
+from app.models.project import Project
+from app.repositories.cache import (
+    cache_generation,
+    detached_project,
+    invalidate,
+    project_key,
+    project_snapshot,
+    repository_cache,
+)
+from app.repositories.pagination import split_page
+from app.repositories.project_repository import page_with_task_counts_statement
+from app.repositories.versions import bump_versions_statement, page_versions_statement, project_version_statement
+
+class AsyncProjectRepository:
+    
+    def __init__(self, db: AsyncSession):
+        self.db = db
+    
+    async def create(self, project: Project) -> Project:
+        self.db.add(project)
+        await self.db.flush()
+        return project
+    
+    async def get_by_id(self, project_id: int) -> Optional[Project]:
+        return await self.db.get(Project, project_id)
+    
+    async def get_cached(self, project_id: int) -> Optional[Project]:
+        """
+        ``get_by_id`` for read-only use: may be served from the cache, possibly
+        stale by up to its TTL, as a detached instance
+        """
+        values = repository_cache.get(project_key(project_id))
+        if values is not None:
+            return detached_project(values)
+
+        generation = cache_generation(self.db)
+        project = await self.get_by_id(project_id)
+        if project is not None and generation is not None:
+            repository_cache.set(project_key(project_id), project_snapshot(project), generation)
+        return project
+    
+    async def lock(self, project_id: int) -> bool:
+        """Bump the project's version to hold it for writing; see ``ProjectRepository.lock``"""
+        result = await self.db.execute(bump_versions_statement([project_id]))
+        return result.rowcount == 1
+    
+    async def get_all(self) -> List[Project]:
+        result = await self.db.scalars(select(Project).order_by(Project.created_at.desc()))
+        return list(result)
+    
+    async def get_page_with_task_counts(
+        self, limit: int, cursor: Optional[str] = None
+    ) -> Tuple[List[Row], Optional[str]]:
+        result = await self.db.execute(page_with_task_counts_statement(limit, cursor))
+        return split_page(result.all(), limit)
+    
+    async def get_version(self, project_id: int) -> Optional[Row]:
+        """``(id, created_at, version)`` of a project, without loading it"""
+        result = await self.db.execute(project_version_statement(project_id))
+        return result.first()
+    
+    async def get_versions(self) -> Dict[int, int]:
+        """``{project id: version}`` of every project"""
+        result = await self.db.execute(select(Project.id, Project.version))
+        return dict(result.all())
+    
+    async def get_page_versions(self, limit: int, cursor: Optional[str] = None) -> List[Row]:
+        """``(id, created_at, version)`` of the projects in a page, plus the first row of the next page"""
+        result = await self.db.execute(page_versions_statement(limit, cursor))
+        return result.all()
+    
+    async def get_by_name(self, name: str) -> Optional[Project]:
+        return await self.db.scalar(select(Project).where(Project.name == name).limit(1))
+    
+    async def update(self, project: Project) -> Project:
+        await self.db.flush()
+        await self.db.execute(bump_versions_statement([project.id]))
+        invalidate(self.db, project_key(project.id))
+        return project
+    
+    async def delete(self, project_id: int) -> bool:
+        project = await self.get_by_id(project_id)
+        if project:
+            await self.db.delete(project)
+            await self.db.flush()
+            invalidate(self.db, project_key(project_id))
+            return True
+        return False
+    
+    async def count(self) -> int:
+        return await self.db.scalar(select(func.count()).select_from(Project))
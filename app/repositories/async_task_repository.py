@@ -0,0 +1,193 @@
+from sqlalchemy import func, select
+from sqlalchemy.engine import Row
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional, Tuple
+from datetime import datetime
+from app.models.task import Task
+from app.repositories.pagination import keyset_statement, split_page
+from app.repositories.search import search_terms, search_tasks_statement, split_search_page
+from app.repositories.task_repository import (
+    NO_SESSION_SYNC,
+    RESPONSE_COLUMNS,
+    close_expired_statement,
+    close_overdue_returning_statement,
+    close_tasks_statement,
+    expired_ids_statement,
+    export_tasks_statement,
+    insert_tasks_statement,
+    open_deadlines_statement,
+    overdue_ids_statement,
+    project_task_rows_statement,
+)
+from app.repositories.versions import bump_versions_statement, project_ids_of_tasks, task_version_statement
+from app.repositories.watermarks import (
+    advance_watermark_statement,
+    create_watermark_statement,
+    earliest_late_deadline,
+    rewind_watermarks_statement,
+    watermark_statement,
+)
+
+class AsyncTaskRepository:
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def create(self, task: Task, locked: bool = False) -> Task:
+        """See ``TaskRepository.create``"""
+        self.db.add(task)
+        await self.db.flush()
+        if not locked:
+            await self.db.execute(bump_versions_statement([task.project_id]))
+        await self._rewind_watermarks([task])
+        return task
+
+    async def create_many(self, rows: List[dict], locked: bool = False) -> List[int]:
+        """See ``TaskRepository.create_many``"""
+        result = await self.db.execute(insert_tasks_statement(), rows)
+        task_ids = sorted(result.scalars())
+        if not locked:
+            await self.db.execute(bump_versions_statement({row["project_id"] for row in rows}))
+        await self._rewind_watermarks(rows)
+        return task_ids
+
+    async def get_by_id(self, task_id: int) -> Optional[Task]:
+        return await self.db.get(Task, task_id)
+
+    async def get_by_project(self, project_id: int) -> List[Task]:
+        result = await self.db.scalars(
+            select(Task)
+            .where(Task.project_id == project_id)
+            .order_by(Task.created_at.desc())
+        )
+        return list(result)
+
+    async def get_page_by_project(
+        self, project_id: int, limit: int, cursor: Optional[str] = None
+    ) -> Tuple[List[Task], Optional[str]]:
+        stmt = select(Task).where(Task.project_id == project_id)
+        result = await self.db.scalars(keyset_statement(stmt, Task, limit, cursor))
+        return split_page(list(result), limit)
+
+    async def get_page_rows_by_project(
+        self, project_id: int, limit: int, cursor: Optional[str] = None
+    ) -> Tuple[List[Row], Optional[str]]:
+        """Like ``get_page_by_project`` but returns column tuples instead of Task objects"""
+        result = await self.db.execute(project_task_rows_statement(project_id, limit, cursor))
+        return split_page(result.all(), limit)
+
+    async def stream_for_export(
+        self,
+        project_id: Optional[int] = None,
+        status: Optional[str] = None,
+        created_after: Optional[datetime] = None,
+        created_before: Optional[datetime] = None,
+        batch_size: int = 1000,
+    ):
+        """Yield export rows through a server-side cursor, ``batch_size`` rows at a time"""
+        stmt = export_tasks_statement(project_id, status, created_after, created_before)
+        result = await self.db.stream(stmt.execution_options(yield_per=batch_size))
+        async for row in result:
+            yield row
+
+    async def get_version(self, task_id: int) -> Optional[Row]:
+        """``(id, project_id, project created_at, project version)`` of a task, without loading it"""
+        result = await self.db.execute(task_version_statement(task_id))
+        return result.first()
+
+    async def search(
+        self, query: str, limit: int, cursor: Optional[str] = None, project_id: Optional[int] = None
+    ) -> Tuple[List[Row], Optional[str]]:
+        """Async counterpart of ``TaskRepository.search``"""
+        terms = search_terms(query)
+        if not terms:
+            return [], None
+        dialect = self.db.get_bind().dialect.name
+        stmt = search_tasks_statement(dialect, terms, RESPONSE_COLUMNS, limit, cursor, project_id)
+        result = await self.db.execute(stmt)
+        return split_search_page(result.all(), limit)
+
+    async def update(self, task: Task) -> Task:
+        await self.db.flush()
+        await self.db.execute(bump_versions_statement([task.project_id]))
+        await self._rewind_watermarks([task])
+        return task
+
+    async def delete(self, task_id: int) -> bool:
+        task = await self.get_by_id(task_id)
+        if task:
+            await self.db.delete(task)
+            await self.db.flush()
+            await self.db.execute(bump_versions_statement([task.project_id]))
+            return True
+        return False
+
+    async def count_by_project(self, project_id: int) -> int:
+        return await self.db.scalar(
+            select(func.count()).select_from(Task).where(Task.project_id == project_id)
+        )
+
+    async def get_overdue_tasks(self) -> List[Task]:
+        result = await self.db.scalars(
+            select(Task).where(Task.deadline < datetime.now(), Task.status != "done")
+        )
+        return list(result)
+
+    async def close_overdue_batch(
+        self, now: datetime, batch_size: int = 1000, after: Optional[datetime] = None
+    ) -> List[int]:
+        """Async counterpart of ``TaskRepository.close_overdue_batch``"""
+        if self.db.get_bind().dialect.update_returning:
+            stmt = close_overdue_returning_statement(now, batch_size, after)
+            result = await self.db.execute(stmt, execution_options=NO_SESSION_SYNC)
+            ids = list(result.scalars())
+        else:
+            ids = list(await self.db.scalars(overdue_ids_statement(now, batch_size, after)))
+            if ids:
+                await self.db.execute(close_tasks_statement(ids, now), execution_options=NO_SESSION_SYNC)
+
+        if ids:
+            await self.db.execute(bump_versions_statement(project_ids_of_tasks(ids)))
+        return ids
+
+    async def get_sweep_watermark(self) -> Optional[datetime]:
+        return await self.db.scalar(watermark_statement())
+
+    async def advance_sweep_watermark(self, previous: Optional[datetime], watermark: datetime) -> bool:
+        """Async counterpart of ``TaskRepository.advance_sweep_watermark``"""
+        if previous is not None:
+            result = await self.db.execute(advance_watermark_statement(previous, watermark))
+            return result.rowcount == 1
+        try:
+            async with self.db.begin_nested():
+                await self.db.execute(create_watermark_statement(watermark))
+            return True
+        except IntegrityError:
+            return False
+
+    async def _rewind_watermarks(self, tasks) -> None:
+        deadline = earliest_late_deadline(tasks, datetime.now())
+        if deadline is not None:
+            await self.db.execute(rewind_watermarks_statement(deadline))
+
+    async def get_open_deadlines(
+        self, until: datetime, after: Optional[datetime] = None, project_ids: Optional[List[int]] = None
+    ) -> List[Row]:
+        result = await self.db.execute(open_deadlines_statement(until, after, project_ids))
+        return result.all()
+
+    async def close_expired(self, ids: List[int], now: datetime) -> List[int]:
+        """Async counterpart of ``TaskRepository.close_expired``"""
+        if self.db.get_bind().dialect.update_returning:
+            stmt = close_expired_statement(ids, now).returning(Task.id)
+            result = await self.db.execute(stmt, execution_options=NO_SESSION_SYNC)
+            closed = list(result.scalars())
+        else:
+            closed = list(await self.db.scalars(expired_ids_statement(ids, now)))
+            if closed:
+                await self.db.execute(close_tasks_statement(closed, now), execution_options=NO_SESSION_SYNC)
+
+        if closed:
+            await self.db.execute(bump_versions_statement(project_ids_of_tasks(closed)))
+        return closed
@@ -0,0 +1,165 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session, make_transient_to_detached
+
+from app.models.project import Project
+
+_MISSING = object()
+
+
+class TTLCache:
+    """
+    Bounded LRU cache whose entries also expire after ``ttl`` seconds
+
+    Thread-safe, and counts hits and misses so its usefulness can be checked
+    from the health endpoint. A ``ttl`` of 0 disables caching entirely.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 30.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        # Bumped by every invalidation, see ``generation``
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0 and self.maxsize > 0
+
+    def get(self, key, default=None):
+        if not self.enabled:
+            return default
+        with self._lock:
+            entry = self._entries.get(key, _MISSING)
+            if entry is _MISSING or entry[1] < time.monotonic():
+                if entry is not _MISSING:
+                    del self._entries[key]
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def generation(self) -> int:
+        """
+        Token to pass to ``set`` for a value about to be read from the database
+
+        If an invalidation lands between taking the token and the ``set``, the
+        value may predate it and is not stored.
+        """
+        with self._lock:
+            return self._generation
+
+    def set(self, key, value, generation: int = None) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return
+            self._entries[key] = (value, time.monotonic() + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, *keys) -> None:
+        with self._lock:
+            self._generation += 1
+            for key in keys:
+                self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "ttl_seconds": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 3) if lookups else 0.0,
+            }
+
+
+# Shared by every repository in the process. Invalidation is local to the
+# process, so with several workers an entry can be stale for at most the TTL.
+# That is why only read paths use it: writes check existence and limits
+# against the database, inside their own transaction
+repository_cache = TTLCache(
+    maxsize=int(os.getenv("REPOSITORY_CACHE_SIZE", 1024)),
+    ttl=float(os.getenv("REPOSITORY_CACHE_TTL", 30)),
+)
+
+
+def project_key(project_id: int):
+    return ("project", project_id)
+
+
+def project_snapshot(project: Project) -> dict:
+    return {
+        "id": project.id,
+        "name": project.name,
+        "description": project.description,
+        "created_at": project.created_at,
+        "version": project.version,
+    }
+
+
+def detached_project(values: dict) -> Project:
+    """
+    Rebuild a cached project as a detached instance
+
+    It belongs to no session, so it cannot be flushed back by accident, and
+    lazy loads (``project.tasks``) raise instead of quietly returning nothing.
+    """
+    project = Project(**values)
+    make_transient_to_detached(project)
+    return project
+
+
+def cache_generation(db):
+    """
+    ``repository_cache.generation()`` if a read made now through ``db`` may be cached, else None
+
+    A session already inside a transaction may read from an older snapshot
+    or see its own uncommitted writes, so what it reads is not cached.
+    """
+    sync_session = getattr(db, "sync_session", db)
+    if sync_session.in_transaction():
+        return None
+    return repository_cache.generation()
+
+
+def invalidate(db, *keys) -> None:
+    """
+    Drop cache keys now and again once the transaction commits
+
+    The second pass covers a concurrent request that re-cached the old value
+    between this flush and the commit.
+    """
+    repository_cache.invalidate(*keys)
+    sync_session = getattr(db, "sync_session", db)
+    sync_session.info.setdefault("cache_invalidations", set()).update(keys)
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_after_commit(session):
+    keys = session.info.pop("cache_invalidations", None)
+    if keys:
+        repository_cache.invalidate(*keys)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_pending(session):
+    session.info.pop("cache_invalidations", None)
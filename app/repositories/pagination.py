@@ -0,0 +1,77 @@
+import base64
+import binascii
+from datetime import datetime
+from typing import Optional, Tuple
+
+from sqlalchemy import and_, or_
+
+from app.exceptions.repository_exceptions import InvalidCursorException
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+
+def encode_cursor(created_at: datetime, row_id: int) -> str:
+    """Build an opaque cursor pointing just after the given row"""
+    raw = f"{created_at.isoformat()}|{row_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Turn a cursor produced by ``encode_cursor`` back into ``(created_at, id)``"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, row_id = base64.urlsafe_b64decode(padded).decode().split("|")
+        return datetime.fromisoformat(created_at), int(row_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise InvalidCursorException(cursor)
+
+
+def after_cursor(model, cursor: str):
+    """Filter clause selecting the rows that come after ``cursor`` (newest first)"""
+    created_at, row_id = decode_cursor(cursor)
+    return or_(
+        model.created_at < created_at,
+        and_(model.created_at == created_at, model.id < row_id),
+    )
+
+
+def split_page(rows: list, limit: int):
+    """
+    Trim ``limit + 1`` fetched rows to one page and work out the next cursor
+
+    Returns:
+        tuple[list, str | None]: the rows of the page and the cursor of the next
+        page (None on the last page)
+    """
+    if len(rows) <= limit:
+        return rows, None
+
+    rows = rows[:limit]
+    last = rows[-1]
+    return rows, encode_cursor(last.created_at, last.id)
+
+
+def keyset_statement(stmt, model, limit: int, cursor: Optional[str] = None):
+    """Apply the cursor filter, newest-first ordering and ``limit + 1`` to a select()"""
+    if cursor:
+        stmt = stmt.where(after_cursor(model, cursor))
+    return stmt.order_by(model.created_at.desc(), model.id.desc()).limit(limit + 1)
+
+
+def keyset_page(query, model, limit: int, cursor: Optional[str] = None):
+    """
+    Return one page of ``query`` ordered newest first by ``(created_at, id)``
+
+    Seeks past the cursor instead of using OFFSET, so every page costs the same
+    no matter how deep the client pages.
+
+    Returns:
+        tuple[list, str | None]: the rows of the page and the cursor of the next
+        page (None on the last page)
+    """
+    if cursor:
+        query = query.filter(after_cursor(model, cursor))
+
+    rows = query.order_by(model.created_at.desc(), model.id.desc()).limit(limit + 1).all()
+    return split_page(rows, limit)
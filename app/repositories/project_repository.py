@@ -1,7 +1,56 @@
+from sqlalchemy import case, func, select
+from sqlalchemy.engine import Row
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 from app.models.project import Project
+from app.models.task import Task
 from app.db.session import get_db
+from app.repositories.cache import (
+    cache_generation,
+    detached_project,
+    invalidate,
+    project_key,
+    project_snapshot,
+    repository_cache,
+)
+from app.repositories.pagination import keyset_statement, split_page
+from app.repositories.versions import bump_versions_statement, page_versions_statement, project_version_statement
+
+
+def page_with_task_counts_statement(limit: int, cursor: Optional[str] = None):
+    # The page of projects is picked first and only its tasks are aggregated,
+    # all in one statement, so the cost is bounded by the page, not the table
+    page = keyset_statement(
+        select(Project.id, Project.name, Project.description, Project.created_at),
+        Project,
+        limit,
+        cursor,
+    ).subquery()
+
+    is_done = case((Task.status == "done", 1), else_=0)
+    counts = (
+        select(
+            Task.project_id,
+            func.count(Task.id).label("task_count"),
+            func.sum(is_done).label("done_task_count"),
+        )
+        .where(Task.project_id.in_(select(page.c.id)))
+        .group_by(Task.project_id)
+        .subquery()
+    )
+
+    task_count = func.coalesce(counts.c.task_count, 0)
+    done_task_count = func.coalesce(counts.c.done_task_count, 0)
+    return (
+        select(
+            page,
+            task_count.label("task_count"),
+            (task_count - done_task_count).label("open_task_count"),
+            done_task_count.label("done_task_count"),
+        )
+        .outerjoin(counts, counts.c.project_id == page.c.id)
+        .order_by(page.c.created_at.desc(), page.c.id.desc())
+    )
 
 class ProjectRepository:
     
@@ -10,31 +59,76 @@ class ProjectRepository:
     
     def create(self, project: Project) -> Project:
         self.db.add(project)
-        self.db.commit()
-        self.db.refresh(project)
+        self.db.flush()
         return project
     
     def get_by_id(self, project_id: int) -> Optional[Project]:
-        return self.db.query(Project).filter(Project.id == project_id).first()
+        return self.db.get(Project, project_id)
+    
+    def get_cached(self, project_id: int) -> Optional[Project]:
+        """
+        ``get_by_id`` for read-only use: may be served from the cache, possibly
+        stale by up to its TTL, as a detached instance
+        """
+        values = repository_cache.get(project_key(project_id))
+        if values is not None:
+            return detached_project(values)
+
+        generation = cache_generation(self.db)
+        project = self.get_by_id(project_id)
+        if project is not None and generation is not None:
+            repository_cache.set(project_key(project_id), project_snapshot(project), generation)
+        return project
+    
+    def lock(self, project_id: int) -> bool:
+        """
+        Bump the project's version, which holds its row (on SQLite the whole
+        database) for writing until the transaction ends
+
+        Concurrent writers to the same project then queue up, so counts read
+        afterwards in the transaction stay true until it commits. Returns
+        False if the project does not exist.
+        """
+        return self.db.execute(bump_versions_statement([project_id])).rowcount == 1
     
     def get_all(self) -> List[Project]:
         return self.db.query(Project).order_by(Project.created_at.desc()).all()
     
+    def get_page_with_task_counts(
+        self, limit: int, cursor: Optional[str] = None
+    ) -> Tuple[List[Row], Optional[str]]:
+        stmt = page_with_task_counts_statement(limit, cursor)
+        return split_page(self.db.execute(stmt).all(), limit)
+    
+    def get_version(self, project_id: int) -> Optional[Row]:
+        """``(id, created_at, version)`` of a project, without loading it"""
+        return self.db.execute(project_version_statement(project_id)).first()
+    
+    def get_versions(self) -> Dict[int, int]:
+        """``{project id: version}`` of every project"""
+        return dict(self.db.execute(select(Project.id, Project.version)).all())
+    
+    def get_page_versions(self, limit: int, cursor: Optional[str] = None) -> List[Row]:
+        """``(id, created_at, version)`` of the projects in a page, plus the first row of the next page"""
+        return self.db.execute(page_versions_statement(limit, cursor)).all()
+    
     def get_by_name(self, name: str) -> Optional[Project]:
         return self.db.query(Project).filter(Project.name == name).first()
     
     def update(self, project: Project) -> Project:
-        self.db.commit()
-        self.db.refresh(project)
+        self.db.flush()
+        self.db.execute(bump_versions_statement([project.id]))
+        invalidate(self.db, project_key(project.id))
         return project
     
     def delete(self, project_id: int) -> bool:
         project = self.get_by_id(project_id)
         if project:
             self.db.delete(project)
-            self.db.commit()
+            self.db.flush()
+            invalidate(self.db, project_key(project_id))
             return True
         return False
     
     def count(self) -> int:
-        return self.db.query(Project).count()
\ No newline at end of file
+        return self.db.query(Project).count()
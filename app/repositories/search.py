@@ -0,0 +1,111 @@
+"""
+Ranked full-text search over tasks
+
+Queries run against the index described in app/db/fulltext.py. The words
+of the query are ANDed together, and the last one also matches as a prefix,
+so partial input already finds results. Results are ordered best match first
+by a ``score`` (lower is better) and paged with a ``(score, id)`` keyset
+cursor.
+"""
+import base64
+import binascii
+import re
+from typing import List, Optional, Tuple
+
+from sqlalchemy import and_, column, func, literal_column, or_, select, table
+
+from app.db.fulltext import POSTGRES_CONFIG
+from app.exceptions.repository_exceptions import InvalidCursorException
+from app.models.task import Task
+
+# Words beyond this are ignored: they rarely narrow the result further
+MAX_SEARCH_TERMS = 16
+# bm25() column weights (title, description) on SQLite
+SQLITE_WEIGHTS = (10.0, 1.0)
+
+WORD = re.compile(r"\w+")
+
+# The FTS5 table, and the hidden column named after it that MATCH and bm25() take
+TASKS_FTS = table("tasks_fts", column("rowid"))
+TASKS_FTS_TABLE = literal_column("tasks_fts")
+
+
+def search_terms(query: str) -> List[str]:
+    """The words of a search query, lower-cased, without operators or punctuation"""
+    return WORD.findall(query.lower())[:MAX_SEARCH_TERMS]
+
+
+def encode_search_cursor(score: float, row_id: int) -> str:
+    raw = f"{score!r}|{row_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_search_cursor(cursor: str) -> Tuple[float, int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        score, row_id = base64.urlsafe_b64decode(padded).decode().split("|")
+        return float(score), int(row_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise InvalidCursorException(cursor)
+
+
+def _sqlite_search(terms: List[str], columns):
+    # Quoted strings are plain tokens to FTS5, whatever characters they contain
+    match = " ".join(f'"{term}"' for term in terms) + "*"
+    matches = (
+        select(TASKS_FTS.c.rowid.label("id"), func.bm25(TASKS_FTS_TABLE, *SQLITE_WEIGHTS).label("score"))
+        .where(TASKS_FTS_TABLE.op("MATCH")(match))
+        .subquery("matches")
+    )
+    return select(*columns, matches.c.score).join(matches, matches.c.id == Task.id), matches.c.score
+
+
+def _postgres_search(terms: List[str], columns):
+    query = func.to_tsquery(literal_column(f"'{POSTGRES_CONFIG}'::regconfig"), " & ".join(terms) + ":*")
+    vector = literal_column("tasks.search_vector")
+    # ts_rank_cd is higher for better matches; negate it so lower is better on both backends
+    score = (-func.ts_rank_cd(vector, query)).label("score")
+    return select(*columns, score).where(vector.op("@@")(query)), score
+
+
+def search_tasks_statement(
+    dialect: str, terms: List[str], columns, limit: int,
+    cursor: Optional[str] = None, project_id: Optional[int] = None,
+):
+    """
+    ``columns`` plus ``score`` of the tasks matching every term, best first
+
+    Fetches ``limit + 1`` rows; see ``split_search_page``.
+    """
+    if dialect == "sqlite":
+        stmt, score = _sqlite_search(terms, columns)
+    elif dialect == "postgresql":
+        stmt, score = _postgres_search(terms, columns)
+    else:
+        raise NotImplementedError(f"Full-text search is not available on {dialect}")
+
+    if project_id is not None:
+        stmt = stmt.where(Task.project_id == project_id)
+    if cursor:
+        after_score, after_id = decode_search_cursor(cursor)
+        stmt = stmt.where(or_(
+            score > after_score,
+            and_(score == after_score, Task.id > after_id),
+        ))
+    return stmt.order_by(score, Task.id).limit(limit + 1)
+
+
+def split_search_page(rows: list, limit: int):
+    """
+    Trim ``limit + 1`` fetched rows to one page and work out the next cursor
+
+    Returns:
+        tuple[list, str | None]: the rows of the page and the cursor of the next
+        page (None on the last page)
+    """
+    if len(rows) <= limit:
+        return rows, None
+
+    rows = rows[:limit]
+    last = rows[-1]
+    return rows, encode_search_cursor(last.score, last.id)
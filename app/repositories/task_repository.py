@@ -1,18 +1,197 @@
+from sqlalchemy import insert, select, update
+from sqlalchemy.engine import Row
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import List, Optional, Tuple
+from datetime import datetime
+import io
 from app.models.task import Task
+from app.repositories.pagination import keyset_page, keyset_statement, split_page
+from app.repositories.search import search_terms, search_tasks_statement, split_search_page
+from app.repositories.versions import bump_versions_statement, project_ids_of_tasks, task_version_statement
+from app.repositories.watermarks import (
+    advance_watermark_statement,
+    create_watermark_statement,
+    earliest_late_deadline,
+    rewind_watermarks_statement,
+    watermark_statement,
+)
+
+# Bulk UPDATEs below do not sync the objects already loaded in the session
+NO_SESSION_SYNC = {"synchronize_session": False}
+
+
+def overdue_ids_statement(now: datetime, batch_size: int, after: Optional[datetime] = None):
+    stmt = select(Task.id).where(Task.deadline < now, Task.status != "done")
+    if after is not None:
+        stmt = stmt.where(Task.deadline >= after)
+    return stmt.limit(batch_size)
+
+
+def close_tasks_statement(ids, now: datetime):
+    return update(Task).where(Task.id.in_(ids)).values(status="done", closed_at=now)
+
+
+def close_overdue_returning_statement(now: datetime, batch_size: int, after: Optional[datetime] = None):
+    overdue = overdue_ids_statement(now, batch_size, after).scalar_subquery()
+    return close_tasks_statement(overdue, now).returning(Task.id)
+
+
+def open_deadlines_statement(until: datetime, after: Optional[datetime] = None, project_ids=None):
+    """``(id, deadline)`` of open tasks due by ``until`` (and after ``after``), soonest first"""
+    stmt = select(Task.id, Task.deadline).where(Task.status != "done", Task.deadline <= until)
+    if after is not None:
+        stmt = stmt.where(Task.deadline > after)
+    if project_ids is not None:
+        stmt = stmt.where(Task.project_id.in_(project_ids))
+    return stmt.order_by(Task.deadline)
+
+
+def expired_ids_statement(ids, now: datetime):
+    return select(Task.id).where(Task.id.in_(ids), Task.status != "done", Task.deadline <= now)
+
+
+def close_expired_statement(ids, now: datetime):
+    # Re-checks status and deadline, so ids queued from a stale snapshot are safe
+    return close_tasks_statement(ids, now).where(Task.status != "done", Task.deadline <= now)
+
+
+def insert_tasks_statement():
+    # Sent as multi-row INSERT ... RETURNING batches. Asking SQLAlchemy to keep
+    # parameter order would make SQLite fall back to one INSERT per row, so
+    # callers sort the ids instead: a single INSERT hands out ascending ids
+    # in VALUES order
+    return insert(Task).returning(Task.id)
+
+
+# Columns written by bulk_insert, in COPY order
+BULK_INSERT_COLUMNS = ("title", "description", "status", "project_id", "deadline", "created_at", "closed_at")
+
+
+# NULL marker for COPY; only matches unquoted, so a "\N" title stays text
+COPY_NULL = r"\N"
+
+
+def _copy_field(value) -> str:
+    if value is None:
+        return COPY_NULL
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return str(value)
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    return '"' + str(value).replace('"', '""') + '"'
+
+
+def _copy_csv(rows: List[dict]) -> io.StringIO:
+    """
+    ``rows`` as CSV for ``COPY ... WITH (FORMAT csv, NULL '\\N')``
+
+    Postgres reads a quoted empty field as an empty string, so None cannot be
+    left to the csv module: it goes out as an unquoted ``\\N`` and every
+    other text value is quoted.
+    """
+    buffer = io.StringIO()
+    for row in rows:
+        buffer.write(",".join(_copy_field(row.get(column)) for column in BULK_INSERT_COLUMNS))
+        buffer.write("\n")
+    buffer.seek(0)
+    return buffer
+
+
+# The fields of TaskResponse, in order, for pages built from column tuples
+RESPONSE_COLUMNS = (
+    Task.id,
+    Task.title,
+    Task.description,
+    Task.deadline,
+    Task.status,
+    Task.project_id,
+    Task.created_at,
+    Task.closed_at,
+)
+
+
+def project_task_rows_statement(project_id: int, limit: int, cursor: Optional[str] = None):
+    return keyset_statement(select(*RESPONSE_COLUMNS).where(Task.project_id == project_id), Task, limit, cursor)
+
+
+EXPORT_COLUMNS = (
+    Task.id,
+    Task.project_id,
+    Task.title,
+    Task.description,
+    Task.status,
+    Task.deadline,
+    Task.created_at,
+    Task.closed_at,
+)
+
+
+def export_tasks_statement(
+    project_id: Optional[int] = None,
+    status: Optional[str] = None,
+    created_after: Optional[datetime] = None,
+    created_before: Optional[datetime] = None,
+):
+    # Plain column tuples in primary key order: cheap to fetch and stable to stream
+    stmt = select(*EXPORT_COLUMNS).order_by(Task.id)
+    if project_id is not None:
+        stmt = stmt.where(Task.project_id == project_id)
+    if status is not None:
+        stmt = stmt.where(Task.status == status)
+    if created_after is not None:
+        stmt = stmt.where(Task.created_at >= created_after)
+    if created_before is not None:
+        stmt = stmt.where(Task.created_at < created_before)
+    return stmt
+
 
 class TaskRepository:
 
     def __init__(self, db: Session):
         self.db = db
 
-    def create(self, task: Task) -> Task:
+    def create(self, task: Task, locked: bool = False) -> Task:
+        """
+        Stage a new task
+
+        ``locked`` means the caller already took the project with
+        ``ProjectRepository.lock``, which bumped its version in this
+        transaction, so it is not bumped again.
+        """
         self.db.add(task)
-        self.db.commit()
-        self.db.refresh(task)
+        self.db.flush()
+        if not locked:
+            self.db.execute(bump_versions_statement([task.project_id]))
+        self._rewind_watermarks([task])
         return task
 
+    def create_many(self, rows: List[dict], locked: bool = False) -> List[int]:
+        """Insert ``rows`` and return their ids in ascending order; ``locked`` as for ``create``"""
+        task_ids = sorted(self.db.execute(insert_tasks_statement(), rows).scalars())
+        if not locked:
+            self.db.execute(bump_versions_statement({row["project_id"] for row in rows}))
+        self._rewind_watermarks(rows)
+        return task_ids
+
+    def bulk_insert(self, rows: List[dict]) -> int:
+        """Insert rows without fetching ids back: COPY on Postgres, executemany elsewhere"""
+        dialect = self.db.get_bind().dialect
+        if dialect.name == "postgresql" and dialect.driver == "psycopg2":
+            columns = ", ".join(BULK_INSERT_COLUMNS)
+            cursor = self.db.connection().connection.dbapi_connection.cursor()
+            try:
+                copy = f"COPY tasks ({columns}) FROM STDIN WITH (FORMAT csv, NULL '{COPY_NULL}')"
+                cursor.copy_expert(copy, _copy_csv(rows))
+            finally:
+                cursor.close()
+        else:
+            self.db.execute(insert(Task), rows)
+
+        self.db.execute(bump_versions_statement({row["project_id"] for row in rows}))
+        self._rewind_watermarks(rows)
+        return len(rows)
+
     def get_by_id(self, task_id: int) -> Optional[Task]:
         return self.db.query(Task).filter(Task.id == task_id).first()
 
@@ -24,16 +203,46 @@ class TaskRepository:
             .all()
         )
 
+    def get_page_by_project(
+        self, project_id: int, limit: int, cursor: Optional[str] = None
+    ) -> Tuple[List[Task], Optional[str]]:
+        query = self.db.query(Task).filter(Task.project_id == project_id)
+        return keyset_page(query, Task, limit, cursor)
+
+    def get_page_rows_by_project(
+        self, project_id: int, limit: int, cursor: Optional[str] = None
+    ) -> Tuple[List[Row], Optional[str]]:
+        """Like ``get_page_by_project`` but returns column tuples instead of Task objects"""
+        rows = self.db.execute(project_task_rows_statement(project_id, limit, cursor)).all()
+        return split_page(rows, limit)
+
+    def get_version(self, task_id: int) -> Optional[Row]:
+        """``(id, project_id, project created_at, project version)`` of a task, without loading it"""
+        return self.db.execute(task_version_statement(task_id)).first()
+
+    def search(
+        self, query: str, limit: int, cursor: Optional[str] = None, project_id: Optional[int] = None
+    ) -> Tuple[List[Row], Optional[str]]:
+        """Tasks matching ``query`` as TaskResponse column tuples (plus ``score``), best match first"""
+        terms = search_terms(query)
+        if not terms:
+            return [], None
+        dialect = self.db.get_bind().dialect.name
+        stmt = search_tasks_statement(dialect, terms, RESPONSE_COLUMNS, limit, cursor, project_id)
+        return split_search_page(self.db.execute(stmt).all(), limit)
+
     def update(self, task: Task) -> Task:
-        self.db.commit()
-        self.db.refresh(task)
+        self.db.flush()
+        self.db.execute(bump_versions_statement([task.project_id]))
+        self._rewind_watermarks([task])
         return task
 
     def delete(self, task_id: int) -> bool:
         task = self.get_by_id(task_id)
         if task:
             self.db.delete(task)
-            self.db.commit()
+            self.db.flush()
+            self.db.execute(bump_versions_statement([task.project_id]))
             return True
         return False
 
@@ -41,9 +250,70 @@ class TaskRepository:
         return self.db.query(Task).filter(Task.project_id == project_id).count()
 
     def get_overdue_tasks(self) -> List[Task]:
-        from datetime import datetime
         return (
             self.db.query(Task)
             .filter(Task.deadline < datetime.now(), Task.status != "done")
             .all()
         )
+
+    def close_overdue_batch(
+        self, now: datetime, batch_size: int = 1000, after: Optional[datetime] = None
+    ) -> List[int]:
+        """Mark up to ``batch_size`` open tasks past their deadline as done.
+
+        A set-based UPDATE, so no Task objects are loaded. With ``after`` only
+        deadlines in ``[after, now)`` are considered. Returns the closed task
+        ids; the caller commits between batches.
+        """
+        if self.db.get_bind().dialect.update_returning:
+            stmt = close_overdue_returning_statement(now, batch_size, after)
+            ids = list(self.db.execute(stmt, execution_options=NO_SESSION_SYNC).scalars())
+        else:
+            ids = list(self.db.execute(overdue_ids_statement(now, batch_size, after)).scalars())
+            if ids:
+                self.db.execute(close_tasks_statement(ids, now), execution_options=NO_SESSION_SYNC)
+
+        if ids:
+            self.db.execute(bump_versions_statement(project_ids_of_tasks(ids)))
+        return ids
+
+    def get_sweep_watermark(self) -> Optional[datetime]:
+        """Every deadline before this has been swept; None before the first sweep"""
+        return self.db.execute(watermark_statement()).scalar()
+
+    def advance_sweep_watermark(self, previous: Optional[datetime], watermark: datetime) -> bool:
+        """Move the watermark from ``previous`` to ``watermark`` unless it was rewound meanwhile"""
+        if previous is not None:
+            return self.db.execute(advance_watermark_statement(previous, watermark)).rowcount == 1
+        try:
+            with self.db.begin_nested():
+                self.db.execute(create_watermark_statement(watermark))
+            return True
+        except IntegrityError:
+            # Another sweep created it first
+            return False
+
+    def _rewind_watermarks(self, tasks) -> None:
+        deadline = earliest_late_deadline(tasks, datetime.now())
+        if deadline is not None:
+            self.db.execute(rewind_watermarks_statement(deadline))
+
+    def get_open_deadlines(
+        self, until: datetime, after: Optional[datetime] = None, project_ids: Optional[List[int]] = None
+    ) -> List[Row]:
+        """``(id, deadline)`` of open tasks due in ``(after, until]``, optionally for some projects only"""
+        return self.db.execute(open_deadlines_statement(until, after, project_ids)).all()
+
+    def close_expired(self, ids: List[int], now: datetime) -> List[int]:
+        """Close those of ``ids`` that are still open and past their deadline; returns the closed ids"""
+        if self.db.get_bind().dialect.update_returning:
+            stmt = close_expired_statement(ids, now).returning(Task.id)
+            closed = list(self.db.execute(stmt, execution_options=NO_SESSION_SYNC).scalars())
+        else:
+            closed = list(self.db.execute(expired_ids_statement(ids, now)).scalars())
+            if closed:
+                self.db.execute(close_tasks_statement(closed, now), execution_options=NO_SESSION_SYNC)
+
+        if closed:
+            self.db.execute(bump_versions_statement(project_ids_of_tasks(closed)))
+        return closed
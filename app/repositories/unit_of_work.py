@@ -0,0 +1,56 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.repositories.async_project_repository import AsyncProjectRepository
+from app.repositories.async_task_repository import AsyncTaskRepository
+from app.repositories.project_repository import ProjectRepository
+from app.repositories.task_repository import TaskRepository
+
+
+class UnitOfWork:
+    """
+    Groups the repository changes of one operation into a single transaction
+
+    Repositories only stage (flush) their changes; nothing is persisted until
+    ``commit()``. Leaving a ``with`` block on an exception rolls back.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+        self.projects = ProjectRepository(db)
+        self.tasks = TaskRepository(db)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            self.rollback()
+
+    def commit(self) -> None:
+        self.db.commit()
+
+    def rollback(self) -> None:
+        self.db.rollback()
+
+
+class AsyncUnitOfWork:
+    """Async counterpart of ``UnitOfWork`` for the API"""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.projects = AsyncProjectRepository(db)
+        self.tasks = AsyncTaskRepository(db)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            await self.rollback()
+
+    async def commit(self) -> None:
+        await self.db.commit()
+
+    async def rollback(self) -> None:
+        await self.db.rollback()
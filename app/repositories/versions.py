@@ -0,0 +1,54 @@
+"""
+Per-project change versions
+
+Every write that touches a project or one of its tasks bumps
+``projects.version`` in the same transaction, so "has anything under this
+project changed?" is a single primary-key lookup. The API turns these
+versions into ETags for conditional GETs.
+"""
+from typing import Iterable, Optional
+
+from sqlalchemy import select, update
+
+from app.models.project import Project
+from app.models.task import Task
+from app.repositories.pagination import keyset_statement
+
+
+def bump_versions_statement(project_ids):
+    """
+    UPDATE that increments the version of the given projects
+
+    ``project_ids`` is a collection of ids or a subquery selecting them.
+    Objects already loaded in the session are left alone.
+    """
+    return (
+        update(Project)
+        .where(Project.id.in_(project_ids))
+        .values(version=Project.version + 1)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def project_ids_of_tasks(task_ids: Iterable[int]):
+    """Subquery of the projects owning ``task_ids``"""
+    return select(Task.project_id).where(Task.id.in_(task_ids)).distinct()
+
+
+def project_version_statement(project_id: int):
+    return select(Project.id, Project.created_at, Project.version).where(Project.id == project_id)
+
+
+def page_versions_statement(limit: int, cursor: Optional[str] = None):
+    # Same rows as ``page_with_task_counts_statement``, read from projects only
+    return keyset_statement(
+        select(Project.id, Project.created_at, Project.version), Project, limit, cursor
+    )
+
+
+def task_version_statement(task_id: int):
+    return (
+        select(Task.id, Task.project_id, Project.created_at, Project.version)
+        .join(Project, Project.id == Task.project_id)
+        .where(Task.id == task_id)
+    )
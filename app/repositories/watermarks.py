@@ -0,0 +1,60 @@
+"""
+High-water marks for incremental overdue sweeps
+
+Every deadline before the watermark has been swept, so a sweep only looks at
+deadlines in ``[watermark, now)`` and then moves the watermark to ``now``
+minus a grace period (see ``SWEEP_GRACE`` in app/services/task_service.py).
+A write that leaves an open task with a deadline below the watermark (a
+deadline edited into the past, a task reopened after its deadline) rewinds
+the watermark to that deadline in the same transaction. The next sweep then
+covers it. A task whose deadline passes while its transaction is still open
+rewinds nothing; the grace period covers it instead.
+"""
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import insert, select, update
+
+from app.models.sweep_state import SweepState
+
+AUTOCLOSE_SWEEP = "autoclose_overdue"
+
+
+def watermark_statement(name: str = AUTOCLOSE_SWEEP):
+    return select(SweepState.watermark).where(SweepState.name == name)
+
+
+def advance_watermark_statement(previous: datetime, watermark: datetime, name: str = AUTOCLOSE_SWEEP):
+    # Compare-and-set: a rewind committed during the sweep wins
+    return (
+        update(SweepState)
+        .where(SweepState.name == name, SweepState.watermark == previous)
+        .values(watermark=watermark)
+    )
+
+
+def create_watermark_statement(watermark: datetime, name: str = AUTOCLOSE_SWEEP):
+    return insert(SweepState).values(name=name, watermark=watermark)
+
+
+def rewind_watermarks_statement(deadline: datetime):
+    """Move every watermark past ``deadline`` back to it"""
+    return (
+        update(SweepState)
+        .where(SweepState.watermark > deadline)
+        .values(watermark=deadline)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def earliest_late_deadline(tasks, now: datetime) -> Optional[datetime]:
+    """Earliest deadline already passed among open ``tasks`` (objects or row dicts), if any"""
+    late = [
+        deadline
+        for deadline, status in (
+            (task.get("deadline"), task.get("status")) if isinstance(task, dict) else (task.deadline, task.status)
+            for task in tasks
+        )
+        if deadline is not None and deadline < now and status != "done"
+    ]
+    return min(late) if late else None
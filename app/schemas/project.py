@@ -1,5 +1,6 @@
 from pydantic import BaseModel
 from datetime import datetime
+from typing import List, Optional
 
 class ProjectCreate(BaseModel):
     name: str
@@ -10,6 +11,15 @@ class ProjectResponse(BaseModel):
     name: str
     description: str
     created_at: datetime
+
+class ProjectWithTaskCountResponse(ProjectResponse):
+    task_count: int
+    open_task_count: int
+    done_task_count: int
+
+class ProjectPage(BaseModel):
+    items: List[ProjectWithTaskCountResponse]
+    next_cursor: Optional[str] = None
     
 class ProjectUpdate(BaseModel):
     name: str
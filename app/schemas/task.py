@@ -1,6 +1,6 @@
 from pydantic import BaseModel
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 
 class TaskBase(BaseModel):
     title: str
@@ -25,3 +25,21 @@ class TaskResponse(BaseModel):
 
     class Config:
         orm_mode = True
+
+class TaskPage(BaseModel):
+    items: List[TaskResponse]
+    next_cursor: Optional[str] = None
+
+class TaskBatchCreate(BaseModel):
+    tasks: List[TaskCreate]
+
+class TaskBatchItemResult(BaseModel):
+    index: int
+    success: bool
+    task_id: Optional[int] = None
+    error: Optional[str] = None
+
+class TaskBatchResponse(BaseModel):
+    created: int
+    failed: int
+    results: List[TaskBatchItemResult]
@@ -0,0 +1,112 @@
+from app.exceptions.service_exceptions import (
+    ProjectLimitExceededException,
+    TaskLimitExceededException,
+    ProjectNotFoundException,
+    DuplicateProjectNameException
+)
+from app.models.project import Project
+from app.models.task import Task
+from app.services.project_service import (
+    fill_batch_ids,
+    plan_task_batch,
+    validate_project_fields,
+    validate_task_fields
+)
+import os
+
+class AsyncProjectService:
+    def __init__(self, uow):
+        self.uow = uow
+        self.project_repo = uow.projects
+        self.task_repo = uow.tasks
+        self.max_projects = int(os.getenv("MAX_NUMBER_OF_PROJECTS", 10))
+        self.max_tasks = int(os.getenv("MAX_NUMBER_OF_TASKS_PER_PROJECT", 50))
+
+    async def create_project(self, name: str, description: str) -> Project:
+        validate_project_fields(name, description)
+
+        project_count = await self.project_repo.count()
+        if project_count >= self.max_projects:
+            raise ProjectLimitExceededException(self.max_projects)
+
+        existing_project = await self.project_repo.get_by_name(name)
+        if existing_project:
+            raise DuplicateProjectNameException(name)
+
+        project = await self.project_repo.create(Project(name=name, description=description))
+        await self.uow.commit()
+        return project
+
+    async def add_task_to_project(self, project_id: int, title: str, description: str, deadline=None):
+        validate_task_fields(title, description)
+
+        # Checked against the database with the project held, not the cache:
+        # another worker may have deleted it or filled it up
+        if not await self.project_repo.lock(project_id):
+            raise ProjectNotFoundException(project_id)
+
+        task_count = await self.task_repo.count_by_project(project_id)
+        if task_count >= self.max_tasks:
+            raise TaskLimitExceededException(self.max_tasks)
+
+        task = Task(
+            title=title,
+            description=description,
+            project_id=project_id,
+            deadline=deadline
+        )
+
+        await self.task_repo.create(task, locked=True)
+        await self.uow.commit()
+        return task
+
+    async def add_tasks_to_project(self, project_id: int, items: list) -> dict:
+        if not await self.project_repo.lock(project_id):
+            raise ProjectNotFoundException(project_id)
+
+        free_slots = self.max_tasks - await self.task_repo.count_by_project(project_id)
+        rows, results = plan_task_batch(project_id, items, free_slots, self.max_tasks)
+        task_ids = await self.task_repo.create_many(rows, locked=True) if rows else []
+        await self.uow.commit()
+        return fill_batch_ids(results, task_ids)
+
+    async def get_all_projects(self):
+        return await self.project_repo.get_all()
+
+    async def get_projects_page(self, limit: int, cursor: str = None):
+        return await self.project_repo.get_page_with_task_counts(limit, cursor)
+
+    async def get_project_by_id(self, project_id: int) -> Project:
+        project = await self.project_repo.get_cached(project_id)
+        if not project:
+            raise ProjectNotFoundException(project_id)
+        return project
+
+    async def update_project(self, project_id: int, new_name: str, new_description: str) -> Project:
+        validate_project_fields(new_name, new_description)
+
+        project = await self.project_repo.get_by_id(project_id)
+        if not project:
+            raise ProjectNotFoundException(project_id)
+
+        existing_project = await self.project_repo.get_by_name(new_name)
+        if existing_project and existing_project.id != project_id:
+            raise DuplicateProjectNameException(new_name)
+
+        project.name = new_name
+        project.description = new_description
+        await self.project_repo.update(project)
+        await self.uow.commit()
+        return project
+
+    async def delete_project(self, project_id: int):
+        project = await self.project_repo.get_by_id(project_id)
+        if not project:
+            raise ProjectNotFoundException(project_id)
+        
+        deleted = await self.project_repo.delete(project_id)
+        await self.uow.commit()
+        return deleted
+
+    async def get_task_count(self, project_id: int) -> int:
+        return await self.task_repo.count_by_project(project_id)
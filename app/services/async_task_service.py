@@ -0,0 +1,77 @@
+from datetime import datetime
+from app.models.task import Task
+from app.exceptions.service_exceptions import (
+    TaskNotFoundException,
+    InvalidTaskStatusException
+)
+from app.services.task_service import CLOSE_OVERDUE_BATCH_SIZE, SWEEP_GRACE, VALID_STATUSES, parse_deadline
+
+class AsyncTaskService:
+
+    def __init__(self, uow):
+        self.uow = uow
+        self.task_repo = uow.tasks
+
+    async def create_task(self, title: str, description: str, project_id: int, deadline):
+        if isinstance(deadline, str):
+            deadline = self.validate_deadline(deadline)
+
+        task = Task(
+            title=title,
+            description=description,
+            project_id=project_id,
+            deadline=deadline,
+            status="todo",
+            created_at=datetime.now()
+        )
+
+        await self.task_repo.create(task)
+        await self.uow.commit()
+        return task
+
+    async def change_task_status(self, task_id: int, new_status: str):
+        if new_status not in VALID_STATUSES:
+            raise InvalidTaskStatusException(new_status)
+
+        task = await self.task_repo.get_by_id(task_id)
+        if not task:
+            raise TaskNotFoundException(task_id)
+
+        task.status = new_status
+
+        if new_status == "done":
+            task.closed_at = datetime.now()
+
+        await self.task_repo.update(task)
+        await self.uow.commit()
+        return task
+
+    def validate_deadline(self, deadline_str: str):
+        return parse_deadline(deadline_str)
+
+    async def delete_task(self, task_id: int):
+        task = await self.task_repo.get_by_id(task_id)
+        if not task:
+            raise TaskNotFoundException(task_id)
+
+        deleted = await self.task_repo.delete(task_id)
+        await self.uow.commit()
+        return deleted
+
+    async def close_overdue_tasks(self) -> int:
+        # Only deadlines since the last sweep's watermark are considered, so the
+        # cost follows the newly expired tasks rather than the table size.
+        # One commit per batch keeps each UPDATE's locks short on large sweeps
+        now = datetime.now()
+        watermark = await self.task_repo.get_sweep_watermark()
+        closed_count = 0
+        while True:
+            closed_ids = await self.task_repo.close_overdue_batch(now, CLOSE_OVERDUE_BATCH_SIZE, after=watermark)
+            await self.uow.commit()
+            closed_count += len(closed_ids)
+            if len(closed_ids) < CLOSE_OVERDUE_BATCH_SIZE:
+                break
+
+        await self.task_repo.advance_sweep_watermark(watermark, now - SWEEP_GRACE)
+        await self.uow.commit()
+        return closed_count
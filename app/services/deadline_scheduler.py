@@ -0,0 +1,231 @@
+"""
+Deadline-driven autoclose
+
+Rather than sweeping every open task on a timer, the scheduler keeps the
+deadlines due within a lookahead window in a min-heap and wakes up when the
+next one passes, closing expired tasks in small batches.
+
+The window is refreshed incrementally. Each refresh reads only the deadlines
+that entered the window since the last one. It re-reads the window for the
+projects whose change version moved (new tasks, edited deadlines, reopened
+tasks). Heap entries can go stale, but that is harmless: the close
+re-checks status and deadline in SQL.
+"""
+import asyncio
+import heapq
+import logging
+import os
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+from app.repositories.unit_of_work import AsyncUnitOfWork
+from app.services.async_task_service import AsyncTaskService
+
+logger = logging.getLogger(__name__)
+
+SCHEDULER_LOOKAHEAD = timedelta(seconds=int(os.getenv("SCHEDULER_LOOKAHEAD_SECONDS", 900)))
+SCHEDULER_REFRESH_INTERVAL = timedelta(seconds=int(os.getenv("SCHEDULER_REFRESH_SECONDS", 30)))
+SCHEDULER_BATCH_SIZE = int(os.getenv("SCHEDULER_BATCH_SIZE", 100))
+# Above this many changed projects a refresh re-reads the whole window instead
+MAX_CHANGED_PROJECTS = 500
+# Run the scheduler inside the API workers (one leader at a time) instead of as a separate process
+SCHEDULER_IN_PROCESS = os.getenv("SCHEDULER_IN_PROCESS", "false").strip().lower() in ("1", "true", "yes", "on")
+# How often followers try to become leader, and the leader re-checks its lock
+SCHEDULER_LEADER_CHECK = timedelta(seconds=int(os.getenv("SCHEDULER_LEADER_CHECK_SECONDS", 10)))
+
+
+class DeadlineHeap:
+    """Min-heap of ``(deadline, task_id)`` entries, without duplicates"""
+
+    def __init__(self):
+        self._heap = []
+        self._entries = set()
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def push(self, deadline: datetime, task_id: int) -> None:
+        entry = (deadline, task_id)
+        if entry not in self._entries:
+            self._entries.add(entry)
+            heapq.heappush(self._heap, entry)
+
+    def next_deadline(self) -> Optional[datetime]:
+        return self._heap[0][0] if self._heap else None
+
+    def pop_due(self, now: datetime, limit: int) -> List[int]:
+        """Remove and return up to ``limit`` task ids whose deadline is at or before ``now``"""
+        task_ids = []
+        while self._heap and self._heap[0][0] <= now and len(task_ids) < limit:
+            entry = heapq.heappop(self._heap)
+            self._entries.discard(entry)
+            task_ids.append(entry[1])
+        return task_ids
+
+
+class DeadlineScheduler:
+    """Closes open tasks as their deadlines pass; the caller drives it and does the sleeping"""
+
+    def __init__(
+        self,
+        uow,
+        lookahead: timedelta = SCHEDULER_LOOKAHEAD,
+        refresh_interval: timedelta = SCHEDULER_REFRESH_INTERVAL,
+        batch_size: int = SCHEDULER_BATCH_SIZE,
+    ):
+        self.uow = uow
+        self.lookahead = lookahead
+        self.refresh_interval = refresh_interval
+        self.batch_size = batch_size
+        self.heap = DeadlineHeap()
+        # Every open deadline up to ``horizon`` is in the heap (as of the last refresh)
+        self.horizon = None
+        self.project_versions = {}
+        self.next_refresh = None
+
+    def reset(self) -> None:
+        """Forget everything queued; the next refresh re-reads the whole window"""
+        self.heap = DeadlineHeap()
+        self.horizon = None
+        self.project_versions = {}
+        self.next_refresh = None
+
+    def needs_refresh(self, now: datetime) -> bool:
+        return self.next_refresh is None or now >= self.next_refresh
+
+    def changed_projects(self, versions: dict) -> List[int]:
+        return [
+            project_id for project_id, version in versions.items()
+            if self.project_versions.get(project_id) != version
+        ]
+
+    def deadline_queries(self, versions: dict, until: datetime) -> List[dict]:
+        """Arguments of the ``get_open_deadlines`` calls that bring the heap up to ``until``"""
+        if self.horizon is None:
+            return [{"until": until}]
+
+        queries = [{"until": until, "after": self.horizon}]
+        changed = self.changed_projects(versions)
+        if len(changed) > MAX_CHANGED_PROJECTS:
+            queries.append({"until": self.horizon})
+        elif changed:
+            queries.append({"until": self.horizon, "project_ids": changed})
+        return queries
+
+    def queue(self, rows, versions: dict, until: datetime, now: datetime) -> None:
+        for row in rows:
+            self.heap.push(row.deadline, row.id)
+        self.horizon = until
+        self.project_versions = versions
+        self.next_refresh = now + self.refresh_interval
+
+    def refresh(self, now: datetime) -> int:
+        """Queue the deadlines that are new to the window; returns how many rows were read"""
+        # Versions first: a write that lands after this read shows up as a
+        # changed project next time, whether or not the queries below see it
+        versions = self.uow.projects.get_versions()
+        until = now + self.lookahead
+        rows = []
+        for query in self.deadline_queries(versions, until):
+            rows += self.uow.tasks.get_open_deadlines(**query)
+        self.uow.commit()
+
+        self.queue(rows, versions, until, now)
+        return len(rows)
+
+    def close_due(self, now: datetime) -> int:
+        """Close every queued task due by ``now``, ``batch_size`` per transaction"""
+        closed = 0
+        while True:
+            task_ids = self.heap.pop_due(now, self.batch_size)
+            if not task_ids:
+                return closed
+            closed += len(self.uow.tasks.close_expired(task_ids, now))
+            self.uow.commit()
+
+    def seconds_until_wakeup(self, now: datetime) -> float:
+        """Time until the next deadline or refresh, whichever comes first"""
+        wakeup = self.next_refresh or now
+        next_deadline = self.heap.next_deadline()
+        if next_deadline is not None and next_deadline < wakeup:
+            wakeup = next_deadline
+        return max(0.0, (wakeup - now).total_seconds())
+
+
+class AsyncDeadlineScheduler(DeadlineScheduler):
+    """``DeadlineScheduler`` driven through an ``AsyncUnitOfWork``, for the API process"""
+
+    async def refresh(self, now: datetime) -> int:
+        versions = await self.uow.projects.get_versions()
+        until = now + self.lookahead
+        rows = []
+        for query in self.deadline_queries(versions, until):
+            rows += await self.uow.tasks.get_open_deadlines(**query)
+        await self.uow.commit()
+
+        self.queue(rows, versions, until, now)
+        return len(rows)
+
+    async def close_due(self, now: datetime) -> int:
+        closed = 0
+        while True:
+            task_ids = self.heap.pop_due(now, self.batch_size)
+            if not task_ids:
+                return closed
+            closed += len(await self.uow.tasks.close_expired(task_ids, now))
+            await self.uow.commit()
+
+
+async def _wait(stop: asyncio.Event, seconds: float) -> None:
+    """Sleep for ``seconds`` or until ``stop`` is set"""
+    try:
+        await asyncio.wait_for(stop.wait(), timeout=seconds)
+    except asyncio.TimeoutError:
+        pass
+
+
+async def run_leader_scheduler(lock, session_factory, stop: asyncio.Event) -> None:
+    """
+    Run the scheduler while this worker holds ``lock``, and keep trying to take it otherwise
+
+    Meant to run as a background task in every API worker: only the lock
+    holder sweeps, and when it goes away another worker takes over within
+    ``SCHEDULER_LEADER_CHECK``.
+    """
+    check_seconds = SCHEDULER_LEADER_CHECK.total_seconds()
+    while not stop.is_set():
+        try:
+            acquired = await lock.acquire()
+        except Exception:
+            # A database hiccup must not end the task: this worker could never lead again
+            logger.exception("Could not try the scheduler lock; retrying")
+            acquired = False
+        if not acquired:
+            await _wait(stop, check_seconds)
+            continue
+
+        logger.info("This worker is now the scheduler leader")
+        try:
+            async with session_factory() as db:
+                uow = AsyncUnitOfWork(db)
+                # Catch up on whatever expired while nobody was leading
+                closed_count = await AsyncTaskService(uow).close_overdue_tasks()
+                if closed_count > 0:
+                    logger.info("Closed %d overdue tasks", closed_count)
+
+                scheduler = AsyncDeadlineScheduler(uow)
+                while not stop.is_set() and await lock.is_held():
+                    now = datetime.now()
+                    if scheduler.needs_refresh(now):
+                        await scheduler.refresh(now)
+                    closed_count = await scheduler.close_due(now)
+                    if closed_count > 0:
+                        logger.info("Closed %d overdue tasks", closed_count)
+                    # Wake up at least every check interval to confirm we still lead
+                    delay = min(scheduler.seconds_until_wakeup(datetime.now()), check_seconds)
+                    await _wait(stop, delay)
+        except Exception:
+            logger.exception("Scheduler failed; stepping down")
+            await _wait(stop, check_seconds)
+        finally:
+            await lock.release()
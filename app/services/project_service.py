@@ -3,25 +3,105 @@ from app.exceptions.service_exceptions import (
     ProjectLimitExceededException,
     TaskLimitExceededException,
     ProjectNotFoundException,
-    DuplicateProjectNameException
+    DuplicateProjectNameException,
+    PastDeadlineException
 )
 from app.models.project import Project
 from app.models.task import Task
 import os
 
+
+def validate_project_fields(name: str, description: str) -> None:
+    if len(name) > 30:
+        raise ValueError("❌ Project name is too long! Maximum 30 characters allowed.")
+
+    if len(description) > 150:
+        raise ValueError("❌ Project description is too long! Maximum 150 characters allowed.")
+
+
+def validate_task_fields(title: str, description: str) -> None:
+    if len(title) > 30:
+        raise ValueError("❌ Task title is too long! Maximum 30 characters allowed.")
+
+    if len(description) > 150:
+        raise ValueError("❌ Task description is too long! Maximum 150 characters allowed.")
+
+
+MAX_TASK_BATCH_SIZE = 1000
+
+
+def plan_task_batch(project_id: int, items: list, free_slots: int, max_tasks: int, now: datetime = None):
+    """
+    Validate a batch of new tasks against the field rules, the deadline rule
+    and the project's remaining task capacity, all checked once per batch.
+
+    Args:
+        project_id (int): ID of the project receiving the tasks
+        items (list): dicts with title, description and optional deadline
+        free_slots (int): how many more tasks the project can hold
+        max_tasks (int): the per-project task limit, for error messages
+        now (datetime, optional): reference time for the deadline check
+
+    Returns:
+        tuple[list, list]: rows to insert, and one result dict per item (rows
+        still need their task_id filled in once inserted)
+    """
+    now = now or datetime.now()
+    created_at = datetime.now()
+    task_limit_error = str(TaskLimitExceededException(max_tasks))
+
+    rows, results = [], []
+    for index, item in enumerate(items):
+        result = {"index": index, "success": False, "task_id": None, "error": None}
+        results.append(result)
+
+        deadline = item.get("deadline")
+        if deadline is not None and deadline.tzinfo is not None:
+            deadline = deadline.astimezone().replace(tzinfo=None)
+        try:
+            validate_task_fields(item["title"], item["description"])
+            if deadline is not None and deadline < now:
+                raise PastDeadlineException()
+        except (ValueError, PastDeadlineException) as e:
+            result["error"] = str(e)
+            continue
+
+        if len(rows) >= free_slots:
+            result["error"] = task_limit_error
+            continue
+
+        result["success"] = True
+        rows.append({
+            "title": item["title"],
+            "description": item["description"],
+            "project_id": project_id,
+            "deadline": deadline,
+            "status": "todo",
+            "created_at": created_at,
+        })
+    return rows, results
+
+
+def fill_batch_ids(results: list, task_ids: list) -> dict:
+    """Attach inserted ids to the successful results and summarize the batch"""
+    ids = iter(task_ids)
+    for result in results:
+        if result["success"]:
+            result["task_id"] = next(ids)
+    created = len(task_ids)
+    return {"created": created, "failed": len(results) - created, "results": results}
+
+
 class ProjectService:
-    def __init__(self, project_repository, task_repository):
-        self.project_repo = project_repository
-        self.task_repo = task_repository
+    def __init__(self, uow):
+        self.uow = uow
+        self.project_repo = uow.projects
+        self.task_repo = uow.tasks
         self.max_projects = int(os.getenv("MAX_NUMBER_OF_PROJECTS", 10))
         self.max_tasks = int(os.getenv("MAX_NUMBER_OF_TASKS_PER_PROJECT", 50))
 
     def create_project(self, name: str, description: str) -> Project:
-        if len(name) > 30:
-            raise ValueError("❌ Project name is too long! Maximum 30 characters allowed.")
-
-        if len(description) > 150:
-            raise ValueError("❌ Project description is too long! Maximum 150 characters allowed.")
+        validate_project_fields(name, description)
 
         project_count = self.project_repo.count()
         if project_count >= self.max_projects:
@@ -31,18 +111,16 @@ class ProjectService:
         if existing_project:
             raise DuplicateProjectNameException(name)
 
-        project = Project(name=name, description=description)
-        return self.project_repo.create(project)
+        project = self.project_repo.create(Project(name=name, description=description))
+        self.uow.commit()
+        return project
 
     def add_task_to_project(self, project_id: int, title: str, description: str, deadline=None):
-        if len(title) > 30:
-            raise ValueError("❌ Task title is too long! Maximum 30 characters allowed.")
-
-        if len(description) > 150:
-            raise ValueError("❌ Task description is too long! Maximum 150 characters allowed.")
+        validate_task_fields(title, description)
 
-        project = self.project_repo.get_by_id(project_id)
-        if not project:
+        # Checked against the database with the project held, not the cache:
+        # another worker may have deleted it or filled it up
+        if not self.project_repo.lock(project_id):
             raise ProjectNotFoundException(project_id)
 
         task_count = self.task_repo.count_by_project(project_id)
@@ -56,23 +134,34 @@ class ProjectService:
             deadline=deadline
         )
 
-        return self.task_repo.create(task)
+        self.task_repo.create(task, locked=True)
+        self.uow.commit()
+        return task
+
+    def add_tasks_to_project(self, project_id: int, items: list) -> dict:
+        if not self.project_repo.lock(project_id):
+            raise ProjectNotFoundException(project_id)
+
+        free_slots = self.max_tasks - self.task_repo.count_by_project(project_id)
+        rows, results = plan_task_batch(project_id, items, free_slots, self.max_tasks)
+        task_ids = self.task_repo.create_many(rows, locked=True) if rows else []
+        self.uow.commit()
+        return fill_batch_ids(results, task_ids)
 
     def get_all_projects(self):
         return self.project_repo.get_all()
 
+    def get_projects_page(self, limit: int, cursor: str = None):
+        return self.project_repo.get_page_with_task_counts(limit, cursor)
+
     def get_project_by_id(self, project_id: int) -> Project:
-        project = self.project_repo.get_by_id(project_id)
+        project = self.project_repo.get_cached(project_id)
         if not project:
             raise ProjectNotFoundException(project_id)
         return project
 
     def update_project(self, project_id: int, new_name: str, new_description: str) -> Project:
-        if len(new_name) > 30:
-            raise ValueError("❌ Project name is too long! Maximum 30 characters allowed.")
-
-        if len(new_description) > 150:
-            raise ValueError("❌ Project description is too long! Maximum 150 characters allowed.")
+        validate_project_fields(new_name, new_description)
 
         project = self.project_repo.get_by_id(project_id)
         if not project:
@@ -84,14 +173,18 @@ class ProjectService:
 
         project.name = new_name
         project.description = new_description
-        return self.project_repo.update(project)
+        self.project_repo.update(project)
+        self.uow.commit()
+        return project
 
     def delete_project(self, project_id: int):
         project = self.project_repo.get_by_id(project_id)
         if not project:
             raise ProjectNotFoundException(project_id)
         
-        return self.project_repo.delete(project_id)
+        deleted = self.project_repo.delete(project_id)
+        self.uow.commit()
+        return deleted
 
     def get_task_count(self, project_id: int) -> int:
         return self.task_repo.count_by_project(project_id)
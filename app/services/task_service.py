@@ -1,4 +1,5 @@
-from datetime import datetime
+import os
+from datetime import datetime, timedelta
 from app.models.task import Task
 from app.exceptions.service_exceptions import (
     TaskNotFoundException,
@@ -6,10 +7,32 @@ from app.exceptions.service_exceptions import (
     PastDeadlineException
 )
 
+VALID_STATUSES = ["todo", "doing", "done"]
+CLOSE_OVERDUE_BATCH_SIZE = 1000
+# Each sweep leaves the watermark this far behind its start time, so the next
+# sweep looks at those deadlines again. It must outlast the longest write
+# transaction: a task written while its deadline was still ahead (so it did
+# not rewind the watermark) may only commit after the sweep that missed it
+SWEEP_GRACE = timedelta(seconds=int(os.getenv("AUTOCLOSE_SWEEP_GRACE_SECONDS", 300)))
+
+
+def parse_deadline(deadline_str: str):
+    if deadline_str:
+        try:
+            deadline = datetime.strptime(deadline_str, "%Y-%m-%d")
+            if deadline < datetime.now():
+                raise PastDeadlineException()
+            return deadline
+        except ValueError:
+            raise ValueError("❌ Invalid date format! Please use YYYY-MM-DD")
+    return None
+
+
 class TaskService:
 
-    def __init__(self, task_repository):
-        self.task_repo = task_repository
+    def __init__(self, uow):
+        self.uow = uow
+        self.task_repo = uow.tasks
 
     def create_task(self, title: str, description: str, project_id: int, deadline):
         if isinstance(deadline, str):
@@ -24,11 +47,12 @@ class TaskService:
             created_at=datetime.now()
         )
 
-        return self.task_repo.create(task)
+        self.task_repo.create(task)
+        self.uow.commit()
+        return task
 
     def change_task_status(self, task_id: int, new_status: str):
-        valid_statuses = ["todo", "doing", "done"]
-        if new_status not in valid_statuses:
+        if new_status not in VALID_STATUSES:
             raise InvalidTaskStatusException(new_status)
 
         task = self.task_repo.get_by_id(task_id)
@@ -40,22 +64,36 @@ class TaskService:
         if new_status == "done":
             task.closed_at = datetime.now()
 
-        return self.task_repo.update(task)
+        self.task_repo.update(task)
+        self.uow.commit()
+        return task
 
     def validate_deadline(self, deadline_str: str):
-        if deadline_str:
-            try:
-                deadline = datetime.strptime(deadline_str, "%Y-%m-%d")
-                if deadline < datetime.now():
-                    raise PastDeadlineException()
-                return deadline
-            except ValueError:
-                raise ValueError("❌ Invalid date format! Please use YYYY-MM-DD")
-        return None
+        return parse_deadline(deadline_str)
 
     def delete_task(self, task_id: int):
         task = self.task_repo.get_by_id(task_id)
         if not task:
             raise TaskNotFoundException(task_id)
 
-        return self.task_repo.delete(task_id)
+        deleted = self.task_repo.delete(task_id)
+        self.uow.commit()
+        return deleted
+
+    def close_overdue_tasks(self) -> int:
+        # Only deadlines since the last sweep's watermark are considered, so the
+        # cost follows the newly expired tasks rather than the table size.
+        # One commit per batch keeps each UPDATE's locks short on large sweeps
+        now = datetime.now()
+        watermark = self.task_repo.get_sweep_watermark()
+        closed_count = 0
+        while True:
+            closed_ids = self.task_repo.close_overdue_batch(now, CLOSE_OVERDUE_BATCH_SIZE, after=watermark)
+            self.uow.commit()
+            closed_count += len(closed_ids)
+            if len(closed_ids) < CLOSE_OVERDUE_BATCH_SIZE:
+                break
+
+        self.task_repo.advance_sweep_watermark(watermark, now - SWEEP_GRACE)
+        self.uow.commit()
+        return closed_count
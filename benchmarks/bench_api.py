@@ -0,0 +1,55 @@
+"""End-to-end benchmarks of the ``app.api.main`` routes through an in-process client."""
+import random
+
+from fastapi.testclient import TestClient
+
+from app.api.main import app
+from app.db.session import engine
+from app.repositories.pagination import DEFAULT_PAGE_SIZE
+from benchmarks.datagen import project_count, seed_database
+from benchmarks.harness import measure
+
+SUITE = "api"
+LOOKUPS = 100
+
+
+def _request(client: TestClient, url: str, expected: int = 200, method: str = "GET", **kwargs):
+    response = client.request(method, url, **kwargs)
+    if response.status_code != expected:
+        raise RuntimeError(f"{url} returned {response.status_code}, expected {expected}: {response.text[:200]}")
+    return response
+
+
+def run(size: int, seed: int = 42, repeat: int = 10) -> list:
+    seed_database(engine, size, seed)
+
+    rng = random.Random(seed)
+    projects = project_count(size)
+    task_ids = [rng.randint(1, size) for _ in range(LOOKUPS)]
+    project_ids = [rng.randint(1, projects) for _ in range(LOOKUPS)]
+
+    with TestClient(app) as client:
+        tasks_url = f"/api/v1/projects/{project_ids[0]}/tasks?limit={DEFAULT_PAGE_SIZE}"
+        etag = _request(client, tasks_url).headers["etag"]
+
+        return [
+            measure(SUITE, "GET /projects", size,
+                    lambda i: _request(client, f"/api/v1/projects?limit={DEFAULT_PAGE_SIZE}"), repeat),
+            measure(SUITE, "GET /projects/{id}", size,
+                    lambda i: _request(client, f"/api/v1/projects/{project_ids[i % LOOKUPS]}"), repeat),
+            measure(SUITE, "GET /projects/{id}/tasks", size,
+                    lambda i: _request(client, f"/api/v1/projects/{project_ids[i % LOOKUPS]}/tasks?limit={DEFAULT_PAGE_SIZE}"),
+                    repeat),
+            measure(SUITE, "GET /projects/{id}/tasks (304)", size,
+                    lambda i: _request(client, tasks_url, 304, headers={"If-None-Match": etag}), repeat),
+            measure(SUITE, "GET /tasks/{id}", size,
+                    lambda i: _request(client, f"/api/v1/tasks/{task_ids[i % LOOKUPS]}"), repeat),
+            # Writes commit, so they run after the reads
+            measure(SUITE, "PATCH /tasks/{id}/status", size,
+                    lambda i: _request(client, f"/api/v1/tasks/{task_ids[i % LOOKUPS]}/status?status=doing", method="PATCH"),
+                    repeat),
+            measure(SUITE, "POST /projects/{id}/tasks", size,
+                    lambda i: _request(client, f"/api/v1/projects/{project_ids[i % LOOKUPS]}/tasks", method="POST",
+                                   json={"title": f"new-{i}", "description": "benchmark"}),
+                    repeat),
+        ]
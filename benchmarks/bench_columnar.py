@@ -0,0 +1,50 @@
+"""ColumnarStorage benchmarks: the storage suite plus full-table scans.
+
+The scans are timed on both backends. For InMemoryStorage they are the
+equivalent loops over Task objects.
+"""
+from collections import Counter
+
+from benchmarks import bench_storage
+from benchmarks.datagen import BASE_TIME, seed_storage
+from benchmarks.harness import measure
+from columnar_storage import ColumnarStorage
+from storage import InMemoryStorage
+
+SUITE = "columnar"
+OPEN_STATUSES = ("todo", "doing")
+
+
+def scan_objects(size: int, seed: int, repeat: int) -> list:
+    storage = InMemoryStorage()
+    seed_storage(storage, size, seed)
+    return [
+        measure(SUITE, "objects.overdue_tasks", size,
+                lambda i: [t for t in storage.tasks
+                           if t.status in OPEN_STATUSES and t.deadline is not None and t.deadline < BASE_TIME],
+                repeat),
+        measure(SUITE, "objects.count_tasks_per_project", size,
+                lambda i: Counter(t.project_id for t in storage.tasks), repeat),
+        measure(SUITE, "objects.count_tasks_by_status", size,
+                lambda i: Counter(t.status for t in storage.tasks), repeat),
+    ]
+
+
+def scan_columns(size: int, seed: int, repeat: int) -> list:
+    storage = ColumnarStorage()
+    seed_storage(storage, size, seed)
+    return [
+        measure(SUITE, "columnar.overdue_tasks", size,
+                lambda i: storage.get_overdue_tasks(BASE_TIME), repeat),
+        measure(SUITE, "columnar.count_tasks_per_project", size,
+                lambda i: storage.count_tasks_per_project(), repeat),
+        measure(SUITE, "columnar.count_tasks_by_status", size,
+                lambda i: storage.count_tasks_by_status(), repeat),
+    ]
+
+
+def run(size: int, seed: int = 42, repeat: int = 10) -> list:
+    results = bench_storage.run(size, seed, repeat, storage_factory=ColumnarStorage)
+    for result in results:
+        result["suite"] = SUITE
+    return results + scan_objects(size, seed, repeat) + scan_columns(size, seed, repeat)
@@ -0,0 +1,58 @@
+"""LogStorage benchmarks: restart time, logged writes and checkpoints."""
+import random
+import shutil
+import sys
+import tempfile
+
+from benchmarks.datagen import project_count, seed_storage
+from benchmarks.harness import measure
+from log_storage import LogStorage
+from todo_manager import TodoManager
+
+SUITE = "log"
+WRITES = 1000
+
+
+def run(size: int, seed: int = 42, repeat: int = 10) -> list:
+    directory = tempfile.mkdtemp(prefix="log-storage-")
+    try:
+        # Seed without intermediate checkpoints, then snapshot once
+        storage = LogStorage(directory, checkpoint_every=sys.maxsize)
+        seed_storage(storage, size, seed)
+        storage.checkpoint()
+
+        manager = TodoManager(storage)
+        manager.max_projects = sys.maxsize
+        manager.max_tasks = sys.maxsize
+        rng = random.Random(seed)
+        projects = project_count(size)
+        task_ids = [rng.randint(1, size) for _ in range(WRITES)]
+        project_ids = [rng.randint(1, projects) for _ in range(WRITES)]
+
+        results = [
+            measure(SUITE, "log.change_task_status", size,
+                    lambda i: manager.change_task_status(task_ids[i % WRITES], ("todo", "doing")[i % 2]),
+                    repeat, WRITES),
+            measure(SUITE, "log.add_task", size,
+                    lambda i: manager.add_task(project_ids[i % WRITES], f"new-{i}", "benchmark", "2099-01-01"),
+                    repeat, WRITES),
+        ]
+        storage.checkpoint()
+        storage.close()
+
+        results.append(measure(SUITE, "log.open_snapshot", size,
+                               lambda i: LogStorage(directory, checkpoint_every=sys.maxsize).close(), repeat))
+
+        storage = LogStorage(directory, checkpoint_every=sys.maxsize)
+        for i in range(WRITES):
+            storage.get_task(task_ids[i]).status = "done"
+        storage.close()
+        results.append(measure(SUITE, "log.open_snapshot_and_wal", size,
+                               lambda i: LogStorage(directory, checkpoint_every=sys.maxsize).close(), repeat))
+
+        storage = LogStorage(directory, checkpoint_every=sys.maxsize)
+        results.append(measure(SUITE, "log.checkpoint", size, lambda i: storage.checkpoint(), repeat))
+        storage.close()
+        return results
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
@@ -0,0 +1,76 @@
+"""Memory footprint of InMemoryStorage per task.
+
+Seeds the same deterministic data (see benchmarks/datagen.py) twice: once with
+plain ``__dict__`` models laid out like models.py used to be, and once with
+the current slotted models. It then prints the bytes traced per task for
+each. Everything the storage keeps alive is counted, including the titles and
+descriptions, which are identical in both runs.
+
+Usage:
+    python -m benchmarks.bench_memory --tasks 1000000
+"""
+import argparse
+import gc
+import sys
+import tracemalloc
+from datetime import datetime
+
+from benchmarks.datagen import seed_storage
+
+
+class DictProject:
+    """The pre-slots Project layout: instance __dict__ and a datetime"""
+
+    def __init__(self, id, name, description):
+        self.id = id
+        self.name = name
+        self.description = description
+        self.created_at = datetime.now()
+
+
+class DictTask:
+    """The pre-slots Task layout: instance __dict__ and datetimes"""
+
+    def __init__(self, id, title, description, project_id, deadline=None):
+        self.id = id
+        self.title = title
+        self.description = description
+        self.status = "todo"
+        self.project_id = project_id
+        self.deadline = deadline
+        self.created_at = datetime.now()
+
+
+def traced_bytes(tasks: int, seed: int, project_cls=None, task_cls=None) -> int:
+    """Bytes still allocated after seeding a fresh InMemoryStorage"""
+    from storage import InMemoryStorage
+
+    gc.collect()
+    tracemalloc.start()
+    storage = InMemoryStorage()
+    seed_storage(storage, tasks, seed, project_cls, task_cls)
+    gc.collect()
+    used = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del storage
+    return used
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tasks", type=int, default=1_000_000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    print(f"Seeding {args.tasks:,} tasks ...", file=sys.stderr)
+    before = traced_bytes(args.tasks, args.seed, DictProject, DictTask)
+    after = traced_bytes(args.tasks, args.seed)
+
+    print(f"\n{'models':<14}{'total (MiB)':>14}{'bytes/task':>14}")
+    for label, used in (("dict", before), ("slots", after)):
+        print(f"{label:<14}{used / 2**20:>14.1f}{used / args.tasks:>14.1f}")
+    print(f"\nslots use {1 - after / before:.1%} less memory")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""ProjectRepository / TaskRepository benchmarks on the configured database.
+
+Uses the application engine (``DATABASE_URL``), so the same suite runs on
+SQLite and Postgres. Writes are rolled back after each sample so every
+sample sees the seeded data.
+"""
+import random
+from datetime import timedelta
+
+from app.db.session import SessionLocal, engine
+from app.repositories.cache import repository_cache
+from app.repositories.pagination import DEFAULT_PAGE_SIZE, encode_cursor
+from app.repositories.unit_of_work import UnitOfWork
+from benchmarks.datagen import BASE_TIME, FUTURE_DEADLINE, project_count, seed_database
+from benchmarks.harness import measure
+
+SUITE = "repositories"
+LOOKUPS = 100
+
+
+def run(size: int, seed: int = 42, repeat: int = 10) -> list:
+    seed_database(engine, size, seed)
+
+    rng = random.Random(seed)
+    projects = project_count(size)
+    task_ids = [rng.randint(1, size) for _ in range(LOOKUPS)]
+    project_ids = [rng.randint(1, projects) for _ in range(LOOKUPS)]
+    # Row ``n`` of the generator is task ``n + 1``, created ``n`` seconds after
+    # BASE_TIME, in project ``n % projects + 1``: resume half way through one
+    middle = size // 2
+    deep_cursor = encode_cursor(BASE_TIME + timedelta(seconds=middle), middle + 1)
+    deep_project = middle % projects + 1
+    new_rows = [
+        {"title": f"new-{i}", "description": "benchmark", "status": "todo",
+         "project_id": 1, "deadline": FUTURE_DEADLINE, "created_at": BASE_TIME}
+        for i in range(100)
+    ]
+
+    db = SessionLocal()
+    uow = UnitOfWork(db)
+
+    def cold(_):
+        repository_cache.clear()
+        db.expunge_all()
+
+    def rollback(_):
+        db.rollback()
+        db.expunge_all()
+
+    try:
+        return [
+            measure(SUITE, "projects.get_by_id (uncached)", size,
+                    lambda i: uow.projects.get_by_id(project_ids[i % LOOKUPS]), repeat, before=cold),
+            measure(SUITE, "projects.get_page_with_task_counts", size,
+                    lambda i: uow.projects.get_page_with_task_counts(DEFAULT_PAGE_SIZE), repeat),
+            measure(SUITE, "projects.count (uncached)", size,
+                    lambda i: uow.projects.count(), repeat, before=cold),
+            measure(SUITE, "projects.get_version", size,
+                    lambda i: uow.projects.get_version(project_ids[i % LOOKUPS]), repeat, 10),
+            measure(SUITE, "tasks.get_by_id", size,
+                    lambda i: uow.tasks.get_by_id(task_ids[i % LOOKUPS]), repeat, 10, before=cold),
+            measure(SUITE, "tasks.get_page_by_project", size,
+                    lambda i: uow.tasks.get_page_by_project(project_ids[i % LOOKUPS], DEFAULT_PAGE_SIZE),
+                    repeat, before=cold),
+            measure(SUITE, "tasks.get_page_by_project (deep)", size,
+                    lambda i: uow.tasks.get_page_by_project(deep_project, DEFAULT_PAGE_SIZE, deep_cursor),
+                    repeat, before=cold),
+            measure(SUITE, "tasks.get_page_rows_by_project", size,
+                    lambda i: uow.tasks.get_page_rows_by_project(project_ids[i % LOOKUPS], DEFAULT_PAGE_SIZE),
+                    repeat),
+            measure(SUITE, "tasks.count_by_project (uncached)", size,
+                    lambda i: uow.tasks.count_by_project(project_ids[i % LOOKUPS]), repeat, before=cold),
+            measure(SUITE, "tasks.get_overdue_tasks", size,
+                    lambda i: uow.tasks.get_overdue_tasks(), repeat, before=cold),
+            # Task n is titled "task-{n - 1}": a full number matches one task, a
+            # 3-digit prefix about a thousand
+            measure(SUITE, "tasks.search (one match)", size,
+                    lambda i: uow.tasks.search(str(task_ids[i % LOOKUPS] - 1), DEFAULT_PAGE_SIZE), repeat),
+            measure(SUITE, "tasks.search (prefix)", size,
+                    lambda i: uow.tasks.search(str(task_ids[i % LOOKUPS] - 1)[:3], DEFAULT_PAGE_SIZE), repeat),
+            measure(SUITE, "tasks.create_many (100 rows)", size,
+                    lambda i: uow.tasks.create_many([dict(row) for row in new_rows]), repeat, after=rollback),
+            measure(SUITE, "tasks.close_overdue_batch", size,
+                    lambda i: uow.tasks.close_overdue_batch(BASE_TIME), repeat, after=rollback),
+        ]
+    finally:
+        db.close()
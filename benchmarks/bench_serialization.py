@@ -0,0 +1,148 @@
+"""Benchmark the list-endpoint serialization paths.
+
+Compares, for one project's tasks:
+
+* ``response_model``: what FastAPI does today, validating every ORM object
+  against ``TaskPage`` and encoding the result with ``json``
+* ``type_adapter``: a precompiled ``TypeAdapter(TaskPage)`` validating from
+  attributes and dumping JSON in pydantic-core
+* ``rows_orjson``: column tuples encoded directly with orjson (the
+  ``API_FAST_JSON`` path)
+
+first on ``--rows`` tasks in process, then end to end through
+``GET /api/v1/projects/{id}/tasks`` with the fast path off and on.
+
+Usage:
+    python -m benchmarks.bench_serialization --rows 10000
+"""
+import argparse
+import json
+import os
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+# The app creates its engines at import time
+if "DATABASE_URL" not in os.environ:
+    os.environ["DATABASE_URL"] = "sqlite:///" + os.path.join(tempfile.mkdtemp(), "bench_serialization.db")
+
+import orjson
+from fastapi.testclient import TestClient
+from pydantic import TypeAdapter
+from sqlalchemy import insert, select
+
+from app.api import responses
+from app.api.main import app
+from app.db.base import Base
+from app.db.session import SessionLocal, engine
+from app.models.project import Project
+from app.models.task import Task
+from app.repositories.pagination import MAX_PAGE_SIZE
+from app.repositories.task_repository import RESPONSE_COLUMNS
+from app.schemas.task import TaskPage
+
+PAGE_ADAPTER = TypeAdapter(TaskPage)
+
+
+def seed(rows: int) -> int:
+    """Create one project holding ``rows`` deterministic tasks and return its id"""
+    Base.metadata.create_all(engine)
+    start = datetime(2025, 1, 1)
+    with engine.begin() as conn:
+        project_id = conn.execute(
+            insert(Project).returning(Project.id),
+            {"name": f"bench-{rows}", "description": "benchmark", "created_at": start},
+        ).scalar_one()
+        conn.execute(insert(Task), [
+            {
+                "title": f"task-{i}",
+                "description": "benchmark task description",
+                "status": ("todo", "doing", "done")[i % 3],
+                "project_id": project_id,
+                "deadline": start + timedelta(days=i % 365) if i % 2 else None,
+                "created_at": start + timedelta(seconds=i),
+                "closed_at": start + timedelta(days=1) if i % 3 == 2 else None,
+            }
+            for i in range(rows)
+        ])
+    return project_id
+
+
+def response_model_path(tasks) -> bytes:
+    page = PAGE_ADAPTER.validate_python({"items": tasks, "next_cursor": None}, from_attributes=True)
+    content = PAGE_ADAPTER.dump_python(page, mode="json")
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def type_adapter_path(tasks) -> bytes:
+    page = PAGE_ADAPTER.validate_python({"items": tasks, "next_cursor": None}, from_attributes=True)
+    return PAGE_ADAPTER.dump_json(page)
+
+
+def rows_orjson_path(rows) -> bytes:
+    return orjson.dumps({"items": [row._asdict() for row in rows], "next_cursor": None})
+
+
+def timed(fn, arg, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn(arg)
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+def run(rows: int, repeat: int) -> dict:
+    project_id = seed(rows)
+    with SessionLocal() as db:
+        tasks = list(db.scalars(select(Task).where(Task.project_id == project_id).order_by(Task.id)))
+        task_rows = db.execute(select(*RESPONSE_COLUMNS).where(Task.project_id == project_id).order_by(Task.id)).all()
+
+    # All three paths must produce the same document
+    expected = json.loads(response_model_path(tasks))
+    assert json.loads(type_adapter_path(tasks)) == expected
+    assert json.loads(rows_orjson_path(task_rows)) == expected
+
+    encode = {
+        "response_model": timed(response_model_path, tasks, repeat),
+        "type_adapter": timed(type_adapter_path, tasks, repeat),
+        "rows_orjson": timed(rows_orjson_path, task_rows, repeat),
+    }
+
+    client = TestClient(app)
+    url = f"/api/v1/projects/{project_id}/tasks?limit={MAX_PAGE_SIZE}"
+    endpoint = {}
+    bodies = {}
+    for name, fast in (("response_model", False), ("rows_orjson", True)):
+        responses.FAST_JSON = fast
+        bodies[name] = client.get(url).json()
+        endpoint[name] = timed(lambda _: client.get(url), None, repeat * 5)
+    responses.FAST_JSON = False
+    assert bodies["response_model"] == bodies["rows_orjson"]
+
+    return {"encode": encode, "endpoint": endpoint}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    results = run(args.rows, args.repeat)
+    baseline = results["encode"]["response_model"]
+    print(f"\nEncoding {args.rows:,} tasks")
+    print(f"{'path':<18}{'median (ms)':>14}{'speedup':>10}")
+    for name, ms in results["encode"].items():
+        print(f"{name:<18}{ms:>14.2f}{baseline / ms:>9.1f}x")
+
+    baseline = results["endpoint"]["response_model"]
+    print(f"\nGET /projects/{{id}}/tasks?limit={MAX_PAGE_SIZE}")
+    print(f"{'path':<18}{'median (ms)':>14}{'speedup':>10}")
+    for name, ms in results["endpoint"].items():
+        print(f"{name:<18}{ms:>14.2f}{baseline / ms:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""InMemoryStorage and TodoManager benchmarks."""
+import random
+import sys
+
+from benchmarks.datagen import project_count, seed_storage
+from benchmarks.harness import measure
+from storage import InMemoryStorage
+from todo_manager import TodoManager
+
+SUITE = "storage"
+# Point lookups are too fast to time one by one
+LOOKUPS = 1000
+
+
+def run(size: int, seed: int = 42, repeat: int = 10, storage_factory=InMemoryStorage) -> list:
+    storage = storage_factory()
+    seed_storage(storage, size, seed)
+    manager = TodoManager(storage)
+    manager.max_projects = sys.maxsize
+    manager.max_tasks = sys.maxsize
+
+    rng = random.Random(seed)
+    projects = project_count(size)
+    task_ids = list(range(1, size + 1))
+    rng.shuffle(task_ids)
+    project_ids = [rng.randint(1, projects) for _ in range(LOOKUPS)]
+    project_names = [f"project-{project_id - 1}" for project_id in project_ids]
+    lookup_ids = task_ids[:min(LOOKUPS, size // 2)]
+    # Tasks to delete, disjoint from the ones looked up
+    doomed = task_ids[len(lookup_ids):]
+    deletes = min(LOOKUPS, len(doomed) // (repeat + 1))
+
+    results = [
+        measure(SUITE, "storage.get_task", size,
+                lambda i: storage.get_task(lookup_ids[i % len(lookup_ids)]), repeat, LOOKUPS),
+        measure(SUITE, "storage.get_project_by_name", size,
+                lambda i: storage.get_project_by_name(project_names[i % LOOKUPS]), repeat, LOOKUPS),
+        measure(SUITE, "storage.count_tasks_by_project", size,
+                lambda i: storage.count_tasks_by_project(project_ids[i % LOOKUPS]), repeat, LOOKUPS),
+        measure(SUITE, "storage.get_tasks_by_project", size,
+                lambda i: storage.get_tasks_by_project(project_ids[i % LOOKUPS]), repeat, 100),
+        measure(SUITE, "manager.list_tasks", size,
+                lambda i: manager.list_tasks(project_ids[i % LOOKUPS]), repeat, 100),
+        measure(SUITE, "manager.list_projects", size,
+                lambda i: manager.list_projects(), repeat, 10),
+        measure(SUITE, "manager.change_task_status", size,
+                lambda i: manager.change_task_status(lookup_ids[i % len(lookup_ids)], ("todo", "doing")[i % 2]),
+                repeat, LOOKUPS),
+        measure(SUITE, "manager.edit_task", size,
+                lambda i: manager.edit_task(lookup_ids[i % len(lookup_ids)], f"edited-{i}", "edited", "doing", "2099-01-01"),
+                repeat, LOOKUPS),
+        measure(SUITE, "manager.add_task", size,
+                lambda i: manager.add_task(project_ids[i % LOOKUPS], f"new-{i}", "benchmark", "2099-01-01"),
+                repeat, LOOKUPS),
+        measure(SUITE, "storage.delete_task", size,
+                lambda i: storage.delete_task(doomed[i]), repeat, deletes),
+    ]
+
+    # Cascade deletes last: each call removes a different project and its tasks
+    results.append(measure(SUITE, "manager.delete_project", size,
+                           lambda i: manager.delete_project(projects - i), min(repeat, projects - 1)))
+    return results
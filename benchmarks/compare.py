@@ -0,0 +1,50 @@
+"""Compare two benchmark result files from ``benchmarks.run``.
+
+Prints the median of every benchmark present in both files and flags the
+ones that got slower than ``--threshold``. Exits with status 1 if any did,
+so it can gate CI.
+
+Usage:
+    python -m benchmarks.compare base.json head.json --threshold 0.15
+"""
+import argparse
+import sys
+
+from benchmarks.harness import load_results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("base")
+    parser.add_argument("head")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="Relative slowdown of the median that counts as a regression")
+    args = parser.parse_args()
+
+    base, head = load_results(args.base), load_results(args.head)
+    key = lambda r: (r["suite"], r["name"], r["size"])
+    base_results = {key(r): r for r in base["results"]}
+
+    print(f"base: {base['meta']['commit']}  head: {head['meta']['commit']}")
+    print(f"\n{'suite':<14}{'benchmark':<38}{'size':>10}{'base (ms)':>12}{'head (ms)':>12}{'change':>9}")
+    regressions = 0
+    for result in head["results"]:
+        before = base_results.get(key(result))
+        if before is None:
+            continue
+        change = result["median_ms"] / before["median_ms"] - 1 if before["median_ms"] else 0.0
+        flag = ""
+        if change > args.threshold:
+            flag = "  REGRESSION"
+            regressions += 1
+        print(
+            f"{result['suite']:<14}{result['name']:<38}{result['size']:>10,}"
+            f"{before['median_ms']:>12.4f}{result['median_ms']:>12.4f}{change:>+9.1%}{flag}"
+        )
+
+    print(f"\n{regressions} regression(s) over {args.threshold:.0%}")
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""Deterministic data for the benchmark suite.
+
+The same ``(tasks, seed)`` always produces the same projects and tasks, so
+results from different commits are measured on identical data. Timestamps are
+fixed rather than relative to now: open deadlines sit far in the future except
+for a fixed ~1% placed in the past, so the overdue set does not depend on the
+day the suite runs.
+"""
+import random
+from datetime import datetime, timedelta
+
+from sqlalchemy import insert, select, text
+from sqlalchemy.orm import Session
+
+BASE_TIME = datetime(2025, 1, 1)
+FUTURE_DEADLINE = datetime(2099, 1, 1)
+STATUS_WEIGHTS = {"done": 60, "todo": 25, "doing": 15}
+# Share of open tasks with a deadline that are already overdue
+OVERDUE_SHARE = 0.05
+INSERT_CHUNK = 50_000
+
+
+def project_count(tasks: int) -> int:
+    """About a thousand tasks per project, and never fewer than ten projects"""
+    return max(10, tasks // 1000)
+
+
+def generate_projects(count: int):
+    for i in range(count):
+        yield {
+            "name": f"project-{i}",
+            "description": f"Generated project {i}",
+            "created_at": BASE_TIME + timedelta(minutes=i),
+        }
+
+
+def generate_tasks(tasks: int, projects: int, seed: int = 42):
+    """
+    Yield ``tasks`` task rows spread evenly over ``projects`` projects
+
+    ``project`` is the 0-based index of the owning project in
+    ``generate_projects``; ``created_at`` increases with the row number.
+    """
+    rng = random.Random(seed)
+    statuses = list(STATUS_WEIGHTS)
+    weights = list(STATUS_WEIGHTS.values())
+    for i in range(tasks):
+        status = rng.choices(statuses, weights)[0]
+        created_at = BASE_TIME + timedelta(seconds=i)
+        deadline = None
+        if rng.random() < 0.5:
+            if status != "done" and rng.random() < OVERDUE_SHARE:
+                deadline = BASE_TIME - timedelta(days=rng.randint(1, 365))
+            else:
+                deadline = FUTURE_DEADLINE - timedelta(days=rng.randint(1, 365))
+        yield {
+            "title": f"task-{i}",
+            "description": f"Generated task {i} for benchmarking",
+            "status": status,
+            "project": i % projects,
+            "deadline": deadline,
+            "created_at": created_at,
+            "closed_at": created_at + timedelta(hours=rng.randint(1, 72)) if status == "done" else None,
+        }
+
+
+def seed_storage(storage, tasks: int, seed: int = 42, project_cls=None, task_cls=None) -> None:
+    """
+    Fill an InMemoryStorage (or anything with the same interface)
+
+    ``project_cls`` / ``task_cls`` default to the classes in models.py.
+    """
+    from models import Project, Task
+
+    Project = project_cls or Project
+    Task = task_cls or Task
+    project_ids = []
+    for values in generate_projects(project_count(tasks)):
+        project = Project(None, values["name"], values["description"])
+        project.created_at = values["created_at"]
+        project_ids.append(storage.add_project(project).id)
+
+    for values in generate_tasks(tasks, len(project_ids), seed):
+        task = Task(None, values["title"], values["description"], project_ids[values["project"]], values["deadline"])
+        task.status = values["status"]
+        task.created_at = values["created_at"]
+        storage.add_task(task)
+
+
+def seed_database(engine, tasks: int, seed: int = 42) -> None:
+    """
+    Recreate the schema on ``engine`` and fill it
+
+    Drops every table first: only point this at a scratch database.
+    """
+    from app.db.base import Base
+    from app.models.project import Project
+    from app.repositories.cache import repository_cache
+    from app.repositories.task_repository import TaskRepository
+
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    repository_cache.clear()
+
+    with Session(engine) as db:
+        db.execute(insert(Project), list(generate_projects(project_count(tasks))))
+        project_ids = list(db.scalars(select(Project.id).order_by(Project.id)))
+        db.commit()
+
+        repo = TaskRepository(db)
+        batch = []
+        for row in generate_tasks(tasks, len(project_ids), seed):
+            row["project_id"] = project_ids[row.pop("project")]
+            batch.append(row)
+            if len(batch) >= INSERT_CHUNK:
+                repo.bulk_insert(batch)
+                db.commit()
+                batch = []
+        if batch:
+            repo.bulk_insert(batch)
+            db.commit()
+
+    with engine.connect() as conn:
+        conn.execute(text("ANALYZE"))
+        conn.commit()
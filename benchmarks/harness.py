@@ -0,0 +1,88 @@
+"""Timing and result helpers shared by the benchmark suite."""
+import json
+import math
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+
+
+def measure(suite: str, name: str, size: int, fn, repeat: int = 10, number: int = 1,
+            warmup: int = 1, before=None, after=None) -> dict:
+    """
+    Time ``fn`` and summarise it as one result record
+
+    Each sample calls ``fn(i)`` ``number`` times back to back, where ``i``
+    counts every call (warm-up included), so mutating benchmarks can pick a
+    different row each time. ``before(i)`` / ``after(i)`` run around each
+    sample, untimed (e.g. to clear a cache or roll back a write).
+
+    Returns:
+        dict: suite, name, size, number, repeat and per-call statistics in ms
+    """
+    samples = []
+    call = 0
+    for sample in range(warmup + repeat):
+        if before:
+            before(sample)
+        started = time.perf_counter()
+        for _ in range(number):
+            fn(call)
+            call += 1
+        elapsed = (time.perf_counter() - started) * 1000 / number
+        if after:
+            after(sample)
+        if sample >= warmup:
+            samples.append(elapsed)
+
+    ordered = sorted(samples)
+    return {
+        "suite": suite,
+        "name": name,
+        "size": size,
+        "number": number,
+        "repeat": repeat,
+        "median_ms": statistics.median(ordered),
+        "mean_ms": statistics.fmean(ordered),
+        "min_ms": ordered[0],
+        "max_ms": ordered[-1],
+        "p95_ms": ordered[min(len(ordered) - 1, math.ceil(len(ordered) * 0.95) - 1)],
+    }
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def metadata(**extra) -> dict:
+    return {
+        "commit": git_revision(),
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        **extra,
+    }
+
+
+def write_results(path: str, meta: dict, results: list) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"meta": meta, "results": results}, f, indent=2, default=str)
+        f.write("\n")
+
+
+def load_results(path: str) -> dict:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def print_table(results: list) -> None:
+    print(f"\n{'suite':<14}{'benchmark':<38}{'size':>10}{'median (ms)':>14}{'p95 (ms)':>12}")
+    for r in results:
+        print(f"{r['suite']:<14}{r['name']:<38}{r['size']:>10,}{r['median_ms']:>14.4f}{r['p95_ms']:>12.4f}")
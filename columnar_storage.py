@@ -0,0 +1,455 @@
+"""
+Columnar in-memory storage for projects and tasks
+
+A drop-in alternative to ``InMemoryStorage`` for large task sets. Task fields
+live in typed columns (``array``) indexed by row instead of one object per
+task, so scans such as "open tasks past their deadline" or "tasks per
+project" run over flat buffers. If NumPy is installed (``poetry install -E
+columnar``) those scans are vectorized; otherwise they fall back to a tight
+loop over the same arrays.
+
+Tasks handed out by the storage are ``TaskRow`` views: reading or assigning
+an attribute goes straight to the columns, so ``TodoManager`` can edit them
+exactly like ``models.Task`` objects.
+"""
+import math
+from array import array
+from bisect import bisect_left
+from collections import Counter
+from datetime import datetime
+from itertools import compress
+
+from models import Project, Task, pack_time, unpack_time
+
+try:
+    import numpy
+except ImportError:  # optional extra
+    numpy = None
+
+STATUSES = ("todo", "doing", "done")
+STATUS_CODES = {status: code for code, status in enumerate(STATUSES)}
+OPEN_CODES = (STATUS_CODES["todo"], STATUS_CODES["doing"])
+# Status code of a deleted row, until the next compaction drops it
+DELETED = -1
+# Compact once deleted rows outnumber live ones (and there are at least this many)
+COMPACT_MIN_DELETED = 1024
+# Missing deadlines are NaN: every comparison with NaN is false
+NO_DEADLINE = math.nan
+
+
+class TaskRow:
+    """Live view of one task in a ColumnarStorage, with the attributes of models.Task"""
+
+    __slots__ = ("_storage", "id")
+
+    def __init__(self, storage, task_id: int):
+        self._storage = storage
+        self.id = task_id
+
+    def _row(self) -> int:
+        return self._storage._row_of(self.id)
+
+    @property
+    def title(self) -> str:
+        return self._storage._titles[self._row()]
+
+    @title.setter
+    def title(self, value: str):
+        self._storage._titles[self._row()] = value
+
+    @property
+    def description(self) -> str:
+        return self._storage._descriptions[self._row()]
+
+    @description.setter
+    def description(self, value: str):
+        self._storage._descriptions[self._row()] = value
+
+    @property
+    def status(self) -> str:
+        return STATUSES[self._storage._status[self._row()]]
+
+    @status.setter
+    def status(self, value: str):
+        self._storage._status[self._row()] = _status_code(value)
+
+    @property
+    def project_id(self) -> int:
+        return self._storage._project_ids[self._row()]
+
+    @property
+    def deadline(self):
+        return _unpack_deadline(self._storage._deadlines[self._row()])
+
+    @deadline.setter
+    def deadline(self, value: datetime):
+        self._storage._deadlines[self._row()] = _pack_deadline(value)
+
+    @property
+    def created_at(self) -> datetime:
+        return unpack_time(self._storage._created_at[self._row()])
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, TaskRow) and other._storage is self._storage and other.id == self.id
+
+    def __hash__(self) -> int:
+        return hash(self.id)
+
+    __str__ = Task.__str__
+
+
+def _status_code(status: str) -> int:
+    try:
+        return STATUS_CODES[status]
+    except KeyError:
+        raise ValueError(f"Invalid status {status!r}, expected one of {', '.join(STATUSES)}") from None
+
+
+def _pack_deadline(value: datetime) -> float:
+    return NO_DEADLINE if value is None else pack_time(value)
+
+
+def _unpack_deadline(value: float):
+    return None if math.isnan(value) else unpack_time(value)
+
+
+class ColumnarStorage:
+    """In-memory storage that keeps tasks in typed columns"""
+
+    # View class handed out for tasks
+    row_class = TaskRow
+
+    def __init__(self):
+        """Initialize empty columns, indexes and ID counters"""
+        # Projects are few and edited in place, so they stay plain objects
+        self._projects = {}
+        self._projects_by_name = {}
+        # One entry per task row, in ID order (so a row is found by bisecting _ids)
+        self._ids = array("q")
+        self._project_ids = array("q")
+        self._status = array("b")
+        self._deadlines = array("d")
+        self._created_at = array("d")
+        self._titles = []
+        self._descriptions = []
+        # project_id -> rows of that project, in insertion order; may still hold deleted rows
+        self._project_rows = {}
+        self._project_counts = Counter()
+        self._deleted = 0
+        self.next_project_id = 1
+        self.next_task_id = 1
+
+    @property
+    def projects(self) -> list:
+        """
+        All projects in creation order
+
+        Returns:
+            list: List of all Project objects
+        """
+        return list(self._projects.values())
+
+    @property
+    def tasks(self) -> list:
+        """
+        All tasks in creation order
+
+        Returns:
+            list: List of TaskRow views
+        """
+        return [self.row_class(self, task_id) for task_id in compress(self._ids, self._live_mask())]
+
+    def _row_of(self, task_id: int) -> int:
+        row = bisect_left(self._ids, task_id)
+        if row == len(self._ids) or self._ids[row] != task_id or self._status[row] == DELETED:
+            raise LookupError(f"Task {task_id} is not in this storage")
+        return row
+
+    def _find_row(self, task_id: int):
+        try:
+            return self._row_of(task_id)
+        except LookupError:
+            return None
+
+    def _live_mask(self):
+        return (code != DELETED for code in self._status)
+
+    def _rows(self, rows) -> list:
+        ids = self._ids
+        return [self.row_class(self, ids[row]) for row in rows]
+
+    def add_project(self, project: Project) -> Project:
+        """
+        Add a new project and assign auto-increment ID
+
+        Args:
+            project (Project): Project object to add
+
+        Returns:
+            Project: The added project with assigned ID
+        """
+        project.id = self.next_project_id
+        self.next_project_id += 1
+        self._projects[project.id] = project
+        self._projects_by_name[project.name] = project
+        self._project_rows[project.id] = array("q")
+        return project
+
+    def add_task(self, task: Task) -> TaskRow:
+        """
+        Add a new task and assign auto-increment ID
+
+        The task's fields are copied into the columns: later edits must go
+        through the returned view (or ``get_task``), not the original object.
+
+        Args:
+            task (Task): Task object to add
+
+        Returns:
+            TaskRow: View of the added task
+        """
+        status = _status_code(task.status)
+        task.id = self.next_task_id
+        self.next_task_id += 1
+        row = len(self._ids)
+        self._ids.append(task.id)
+        self._project_ids.append(task.project_id)
+        self._status.append(status)
+        self._deadlines.append(_pack_deadline(task.deadline))
+        self._created_at.append(pack_time(task.created_at))
+        self._titles.append(task.title)
+        self._descriptions.append(task.description)
+        self._project_rows.setdefault(task.project_id, array("q")).append(row)
+        self._project_counts[task.project_id] += 1
+        return self.row_class(self, task.id)
+
+    def get_project(self, project_id: int):
+        """
+        Get a project by its ID
+
+        Args:
+            project_id (int): ID of the project
+
+        Returns:
+            Project | None: The project, or None if it does not exist
+        """
+        return self._projects.get(project_id)
+
+    def get_project_by_name(self, name: str):
+        """
+        Get a project by its name
+
+        Args:
+            name (str): Name of the project
+
+        Returns:
+            Project | None: The project, or None if no project has this name
+        """
+        return self._projects_by_name.get(name)
+
+    def get_task(self, task_id: int):
+        """
+        Get a task by its ID
+
+        Args:
+            task_id (int): ID of the task
+
+        Returns:
+            TaskRow | None: View of the task, or None if it does not exist
+        """
+        if self._find_row(task_id) is None:
+            return None
+        return self.row_class(self, task_id)
+
+    def update_project(self, project_id: int, name: str, description: str) -> Project:
+        """
+        Update a project's name and description, keeping the name index in sync
+
+        Args:
+            project_id (int): ID of the project to update
+            name (str): New project name
+            description (str): New project description
+
+        Returns:
+            Project: The updated project
+        """
+        project = self._projects[project_id]
+        if project.name != name:
+            if self._projects_by_name.get(project.name) is project:
+                del self._projects_by_name[project.name]
+            self._projects_by_name[name] = project
+        project.name = name
+        project.description = description
+        return project
+
+    def count_projects(self) -> int:
+        """
+        Get the number of stored projects
+
+        Returns:
+            int: Number of projects
+        """
+        return len(self._projects)
+
+    def count_tasks_by_project(self, project_id: int) -> int:
+        """
+        Get the number of tasks in a specific project
+
+        Args:
+            project_id (int): ID of the project
+
+        Returns:
+            int: Number of tasks in the project
+        """
+        return self._project_counts.get(project_id, 0)
+
+    def get_all_projects(self) -> list:
+        """
+        Get all projects
+
+        Returns:
+            list: List of all Project objects
+        """
+        return self.projects
+
+    def get_tasks_by_project(self, project_id: int) -> list:
+        """
+        Get all tasks for a specific project sorted by creation time
+
+        Args:
+            project_id (int): ID of the project
+
+        Returns:
+            list: List of TaskRow views for the specified project (newest first)
+        """
+        status = self._status
+        rows = [row for row in self._project_rows.get(project_id, ()) if status[row] != DELETED]
+        rows.sort(key=self._created_at.__getitem__)
+        return self._rows(reversed(rows))
+
+    def delete_project(self, project_id: int) -> None:
+        """
+        Delete a project and all its tasks (Cascade Delete)
+
+        Args:
+            project_id (int): ID of the project to delete
+        """
+        project = self._projects.pop(project_id, None)
+        if project is not None and self._projects_by_name.get(project.name) is project:
+            del self._projects_by_name[project.name]
+        for row in self._project_rows.pop(project_id, ()):
+            self._delete_row(row)
+        self._project_counts.pop(project_id, None)
+        self._maybe_compact()
+
+    def delete_task(self, task_id: int) -> None:
+        """
+        Delete a specific task
+
+        Args:
+            task_id (int): ID of the task to delete
+        """
+        row = self._find_row(task_id)
+        if row is None:
+            return
+        self._delete_row(row)
+        self._project_counts[self._project_ids[row]] -= 1
+        self._maybe_compact()
+
+    def _delete_row(self, row: int) -> None:
+        if self._status[row] != DELETED:
+            self._status[row] = DELETED
+            # Release the strings now; the row itself goes at the next compaction
+            self._titles[row] = self._descriptions[row] = None
+            self._deleted += 1
+
+    def _maybe_compact(self) -> None:
+        if self._deleted >= COMPACT_MIN_DELETED and self._deleted * 2 > len(self._ids):
+            self.compact()
+
+    def compact(self) -> None:
+        """Drop deleted rows from every column and renumber the per-project row lists"""
+        live = array("b", self._live_mask())
+        self._ids = array("q", compress(self._ids, live))
+        self._project_ids = array("q", compress(self._project_ids, live))
+        self._status = array("b", compress(self._status, live))
+        self._deadlines = array("d", compress(self._deadlines, live))
+        self._created_at = array("d", compress(self._created_at, live))
+        self._titles = list(compress(self._titles, live))
+        self._descriptions = list(compress(self._descriptions, live))
+        self._project_rows = {project_id: array("q") for project_id in self._projects}
+        for row, project_id in enumerate(self._project_ids):
+            self._project_rows.setdefault(project_id, array("q")).append(row)
+        self._deleted = 0
+
+    def count_tasks_per_project(self) -> dict:
+        """
+        Get the number of tasks in every project
+
+        Returns:
+            dict: project ID -> number of tasks, for projects that have tasks
+        """
+        return {project_id: count for project_id, count in self._project_counts.items() if count}
+
+    def count_tasks_by_status(self, project_id: int = None) -> dict:
+        """
+        Count tasks per status, over all tasks or one project
+
+        Args:
+            project_id (int, optional): Only count this project's tasks
+
+        Returns:
+            dict: status -> number of tasks, with every status present
+        """
+        if numpy is not None and len(self._status):
+            status = numpy.frombuffer(self._status, dtype=numpy.int8)
+            if project_id is not None:
+                status = status[numpy.frombuffer(self._project_ids, dtype=numpy.int64) == project_id]
+            counts = numpy.bincount(status[status != DELETED], minlength=len(STATUSES)).tolist()
+            del status
+        elif project_id is None:
+            counts = Counter(self._status)
+        else:
+            counts = Counter(compress(self._status, (pid == project_id for pid in self._project_ids)))
+        return {status: counts[code] for code, status in enumerate(STATUSES)}
+
+    def get_tasks_by_status(self, status: str) -> list:
+        """
+        Get every task with the given status, in creation order
+
+        Args:
+            status (str): todo, doing or done
+
+        Returns:
+            list: List of TaskRow views
+        """
+        code = _status_code(status)
+        if numpy is not None and len(self._status):
+            rows = numpy.flatnonzero(numpy.frombuffer(self._status, dtype=numpy.int8) == code).tolist()
+        else:
+            rows = [row for row, value in enumerate(self._status) if value == code]
+        return self._rows(rows)
+
+    def get_overdue_tasks(self, now: datetime = None) -> list:
+        """
+        Get open (todo or doing) tasks whose deadline has passed, in creation order
+
+        Args:
+            now (datetime, optional): Reference time, defaults to the current time
+
+        Returns:
+            list: List of TaskRow views
+        """
+        cutoff = pack_time(now or datetime.now())
+        if numpy is not None and len(self._status):
+            status = numpy.frombuffer(self._status, dtype=numpy.int8)
+            deadlines = numpy.frombuffer(self._deadlines, dtype=numpy.float64)
+            rows = numpy.flatnonzero(numpy.isin(status, OPEN_CODES) & (deadlines < cutoff)).tolist()
+            # Release the buffer exports so the columns can grow again
+            del status, deadlines
+        else:
+            rows = [
+                row for row, (code, deadline) in enumerate(zip(self._status, self._deadlines))
+                if deadline < cutoff and code in OPEN_CODES
+            ]
+        return self._rows(rows)
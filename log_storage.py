@@ -0,0 +1,393 @@
+"""
+Persistent storage for TodoManager: a write-ahead log plus periodic snapshots
+
+``LogStorage(directory)`` is a ``ColumnarStorage`` that survives restarts.
+Every mutation, including attribute assignments that ``TodoManager`` makes on
+tasks, is appended to ``wal.log`` as one JSON line before the call returns.
+Once the log holds ``checkpoint_every`` records, the whole state is written
+to ``snapshot.bin`` and the log starts over.
+
+The snapshot stores the task columns as raw arrays, so startup is a few
+``memcpy``-sized reads. Titles and descriptions stay in the memory-mapped
+file and are decoded only when a task is read. The log records written since
+the snapshot are then replayed on top.
+
+Environment:
+    LOG_STORAGE_CHECKPOINT_EVERY: log records between snapshots (default 10000)
+    LOG_STORAGE_FSYNC: fsync every record (default false: records are flushed
+        to the OS, which survives a crash of the process but not of the machine)
+"""
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+from collections import Counter
+
+from dotenv import load_dotenv
+
+from columnar_storage import ColumnarStorage, TaskRow
+from models import Project, Task, pack_time, unpack_time
+
+load_dotenv()
+
+CHECKPOINT_EVERY = int(os.getenv("LOG_STORAGE_CHECKPOINT_EVERY", 10000))
+FSYNC = os.getenv("LOG_STORAGE_FSYNC", "false").lower() in ("1", "true", "yes")
+
+SNAPSHOT_FILE = "snapshot.bin"
+WAL_FILE = "wal.log"
+MAGIC = b"TODOSNP1"
+# Magic, then the length of the JSON header that follows
+PREAMBLE = struct.Struct("<8sQ")
+# Task attributes TodoManager assigns directly, and therefore logged by TaskRow
+LOGGED_FIELDS = ("title", "description", "status", "deadline")
+# Column name -> array typecode, in file order
+COLUMNS = (
+    ("ids", "q"),
+    ("project_ids", "q"),
+    ("status", "b"),
+    ("deadlines", "d"),
+    ("created_at", "d"),
+)
+
+
+class LoggedTaskRow(TaskRow):
+    """TaskRow whose attribute assignments are written to the log"""
+
+    __slots__ = ()
+
+    def __setattr__(self, name, value):
+        super().__setattr__(name, value)
+        if name in LOGGED_FIELDS:
+            if name == "deadline":
+                value = pack_time(value)
+            self._storage._log("update_task", id=self.id, field=name, value=value)
+
+
+class _SnapshotStrings:
+    """
+    String column backed by the snapshot file
+
+    Row ``i`` is ``blob[offsets[i]:offsets[i + 1]]``, decoded on access.
+    Assigned and appended values are kept in memory on top of the file.
+    """
+
+    def __init__(self, buffer, offsets: array, start: int):
+        self._buffer = buffer
+        self._offsets = offsets
+        self._start = start
+        self._stored = len(offsets) - 1
+        self._changed = {}
+        self._appended = []
+
+    def __len__(self) -> int:
+        return self._stored + len(self._appended)
+
+    def __getitem__(self, row: int):
+        if row >= self._stored:
+            return self._appended[row - self._stored]
+        if row in self._changed:
+            return self._changed[row]
+        start = self._start + self._offsets[row]
+        end = self._start + self._offsets[row + 1]
+        return self._buffer[start:end].decode("utf-8")
+
+    def __setitem__(self, row: int, value):
+        if row >= self._stored:
+            self._appended[row - self._stored] = value
+        else:
+            self._changed[row] = value
+
+    def __iter__(self):
+        return (self[row] for row in range(len(self)))
+
+    def append(self, value) -> None:
+        self._appended.append(value)
+
+    def encoded(self):
+        """Yield every row as UTF-8, copying unchanged rows from the file without decoding"""
+        for row in range(self._stored):
+            if row in self._changed:
+                yield self._changed[row].encode("utf-8")
+            else:
+                yield self._buffer[self._start + self._offsets[row]:self._start + self._offsets[row + 1]]
+        for value in self._appended:
+            yield value.encode("utf-8")
+
+
+def _encode_strings(values) -> tuple:
+    """Concatenate strings into one UTF-8 blob plus start offsets (and the end)"""
+    if isinstance(values, _SnapshotStrings):
+        chunks = list(values.encoded())
+    else:
+        chunks = [value.encode("utf-8") for value in values]
+    offsets = array("q", [0])
+    size = 0
+    for chunk in chunks:
+        size += len(chunk)
+        offsets.append(size)
+    return offsets, b"".join(chunks)
+
+
+class LogStorage(ColumnarStorage):
+    """ColumnarStorage persisted to a write-ahead log and snapshots in ``directory``"""
+
+    row_class = LoggedTaskRow
+
+    def __init__(self, directory: str, checkpoint_every: int = None, fsync: bool = None):
+        """
+        Open (or create) the storage in ``directory`` and load its contents
+
+        Args:
+            directory (str): Directory holding the snapshot and the log
+            checkpoint_every (int, optional): Log records between snapshots
+            fsync (bool, optional): fsync the log after every record
+        """
+        super().__init__()
+        self.directory = directory
+        self.checkpoint_every = checkpoint_every or CHECKPOINT_EVERY
+        self.fsync = FSYNC if fsync is None else fsync
+        self._snapshot_path = os.path.join(directory, SNAPSHOT_FILE)
+        self._wal_path = os.path.join(directory, WAL_FILE)
+        self._mmap = None
+        self._wal = None
+        # Sequence number of the last mutation; the snapshot records the one it includes
+        self._seq = 0
+        self._wal_records = 0
+        self._replaying = False
+
+        os.makedirs(directory, exist_ok=True)
+        self._load_snapshot()
+        self._replay_wal()
+        self._wal = open(self._wal_path, "ab")
+        if self._wal_records >= self.checkpoint_every:
+            self.checkpoint()
+
+    def close(self) -> None:
+        """Flush the log and release the files; the storage is unusable afterwards"""
+        if self._wal is not None:
+            self._wal.close()
+            self._wal = None
+        self._release_snapshot()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    # Mutations: apply, then log
+
+    def add_project(self, project: Project) -> Project:
+        project = super().add_project(project)
+        self._log("add_project", id=project.id, name=project.name, description=project.description,
+                  created_at=pack_time(project.created_at))
+        return project
+
+    def update_project(self, project_id: int, name: str, description: str) -> Project:
+        project = super().update_project(project_id, name, description)
+        self._log("update_project", id=project_id, name=name, description=description)
+        return project
+
+    def delete_project(self, project_id: int) -> None:
+        super().delete_project(project_id)
+        self._log("delete_project", id=project_id)
+
+    def add_task(self, task: Task) -> LoggedTaskRow:
+        row = super().add_task(task)
+        self._log("add_task", id=task.id, project_id=task.project_id, title=task.title,
+                  description=task.description, status=task.status,
+                  deadline=pack_time(task.deadline), created_at=pack_time(task.created_at))
+        return row
+
+    def delete_task(self, task_id: int) -> None:
+        existed = self._find_row(task_id) is not None
+        super().delete_task(task_id)
+        if existed:
+            self._log("delete_task", id=task_id)
+
+    # Write-ahead log
+
+    def _log(self, op: str, **fields) -> None:
+        if self._replaying:
+            return
+        self._seq += 1
+        record = {"seq": self._seq, "op": op, **fields}
+        self._wal.write(json.dumps(record, ensure_ascii=False, separators=(",", ":")).encode("utf-8") + b"\n")
+        self._wal.flush()
+        if self.fsync:
+            os.fsync(self._wal.fileno())
+        self._wal_records += 1
+        if self._wal_records >= self.checkpoint_every:
+            self.checkpoint()
+
+    def _replay_wal(self) -> None:
+        if not os.path.exists(self._wal_path):
+            return
+        good = 0
+        self._replaying = True
+        try:
+            with open(self._wal_path, "rb") as f:
+                for line in f:
+                    # A torn write from a crash: nothing after it was acknowledged.
+                    # A record is only complete with its newline, even if the
+                    # part before it happens to parse; otherwise the next append
+                    # would be glued onto it
+                    if not line.endswith(b"\n"):
+                        break
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        break
+                    good += len(line)
+                    # Records up to the snapshot's sequence are already in it
+                    if record["seq"] > self._seq:
+                        self._apply(record)
+                        self._seq = record["seq"]
+                    self._wal_records += 1
+        finally:
+            self._replaying = False
+        if good < os.path.getsize(self._wal_path):
+            with open(self._wal_path, "r+b") as f:
+                f.truncate(good)
+
+    def _apply(self, record: dict) -> None:
+        op = record["op"]
+        if op == "add_project":
+            project = Project(None, record["name"], record["description"])
+            project.created_at = unpack_time(record["created_at"])
+            self.next_project_id = record["id"]
+            self.add_project(project)
+        elif op == "update_project":
+            self.update_project(record["id"], record["name"], record["description"])
+        elif op == "delete_project":
+            self.delete_project(record["id"])
+        elif op == "add_task":
+            task = Task(None, record["title"], record["description"], record["project_id"],
+                        unpack_time(record["deadline"]))
+            task.status = record["status"]
+            task.created_at = unpack_time(record["created_at"])
+            self.next_task_id = record["id"]
+            self.add_task(task)
+        elif op == "update_task":
+            value = record["value"]
+            if record["field"] == "deadline":
+                value = unpack_time(value)
+            setattr(self.row_class(self, record["id"]), record["field"], value)
+        elif op == "delete_task":
+            self.delete_task(record["id"])
+        else:
+            raise ValueError(f"Unknown log record {op!r} in {self._wal_path}")
+
+    # Snapshots
+
+    def checkpoint(self) -> None:
+        """Write the current state to a new snapshot and start an empty log"""
+        if self._deleted:
+            self.compact()
+
+        header = {
+            "seq": self._seq,
+            "byteorder": sys.byteorder,
+            "next_project_id": self.next_project_id,
+            "next_task_id": self.next_task_id,
+            "projects": [
+                [p.id, p.name, p.description, pack_time(p.created_at)] for p in self._projects.values()
+            ],
+            "sections": [],
+        }
+        project_rows = array("q")
+        header["project_rows"] = []
+        for project_id, rows in self._project_rows.items():
+            header["project_rows"].append([project_id, len(project_rows), len(rows)])
+            project_rows.extend(rows)
+
+        title_offsets, titles = _encode_strings(self._titles)
+        description_offsets, descriptions = _encode_strings(self._descriptions)
+        sections = [(name, getattr(self, "_" + name).tobytes()) for name, _ in COLUMNS] + [
+            ("title_offsets", title_offsets.tobytes()),
+            ("description_offsets", description_offsets.tobytes()),
+            ("project_rows", project_rows.tobytes()),
+            ("titles", titles),
+            ("descriptions", descriptions),
+        ]
+        position = 0
+        for name, data in sections:
+            header["sections"].append([name, position, len(data)])
+            position += len(data)
+
+        encoded = json.dumps(header, ensure_ascii=False).encode("utf-8")
+        temporary = self._snapshot_path + ".tmp"
+        with open(temporary, "wb") as f:
+            f.write(PREAMBLE.pack(MAGIC, len(encoded)))
+            f.write(encoded)
+            for _, data in sections:
+                f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+
+        # The string columns may still read from the old snapshot; everything
+        # they hold is in the new one, which is loaded below
+        self._release_snapshot()
+        os.replace(temporary, self._snapshot_path)
+        # A crash from here until the log is truncated is harmless: replay
+        # skips records the snapshot already includes
+        if self._wal is not None:
+            self._wal.close()
+        self._wal = open(self._wal_path, "wb")
+        self._wal_records = 0
+        self._load_snapshot()
+
+    def _release_snapshot(self) -> None:
+        if self._mmap is not None:
+            self._titles = self._descriptions = None
+            self._mmap.close()
+            self._mmap = None
+
+    def _load_snapshot(self) -> None:
+        if not os.path.exists(self._snapshot_path) or os.path.getsize(self._snapshot_path) == 0:
+            return
+        with open(self._snapshot_path, "rb") as f:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, header_size = PREAMBLE.unpack_from(buffer)
+        if magic != MAGIC:
+            buffer.close()
+            raise ValueError(f"{self._snapshot_path} is not a todo snapshot")
+        start = PREAMBLE.size + header_size
+        header = json.loads(buffer[PREAMBLE.size:start])
+        sections = {name: (start + offset, size) for name, offset, size in header["sections"]}
+
+        def column(name: str, typecode: str) -> array:
+            offset, size = sections[name]
+            values = array(typecode)
+            values.frombytes(buffer[offset:offset + size])
+            if header["byteorder"] != sys.byteorder:
+                values.byteswap()
+            return values
+
+        for name, typecode in COLUMNS:
+            setattr(self, "_" + name, column(name, typecode))
+        self._titles = _SnapshotStrings(buffer, column("title_offsets", "q"), sections["titles"][0])
+        self._descriptions = _SnapshotStrings(buffer, column("description_offsets", "q"), sections["descriptions"][0])
+
+        self._projects = {}
+        self._projects_by_name = {}
+        for project_id, name, description, created_at in header["projects"]:
+            project = Project(project_id, name, description)
+            project.created_at = unpack_time(created_at)
+            self._projects[project_id] = project
+            self._projects_by_name[name] = project
+
+        rows = column("project_rows", "q")
+        self._project_rows = {}
+        self._project_counts = Counter()
+        for project_id, offset, count in header["project_rows"]:
+            self._project_rows[project_id] = rows[offset:offset + count]
+            self._project_counts[project_id] = count
+
+        self._deleted = 0
+        self._seq = header["seq"]
+        self.next_project_id = header["next_project_id"]
+        self.next_task_id = header["next_task_id"]
+        self._mmap = buffer
@@ -1,6 +1,6 @@
 from app.db.session import SessionLocal
-from app.repositories.project_repository import ProjectRepository
-from app.repositories.task_repository import TaskRepository
+from app.repositories.pagination import MAX_PAGE_SIZE
+from app.repositories.unit_of_work import UnitOfWork
 from app.services.project_service import ProjectService
 from app.services.task_service import TaskService
 from app.exceptions.service_exceptions import (
@@ -39,10 +39,10 @@ def main():
     
     try:
         # Initialize repositories and services
-        project_repo = ProjectRepository(db)
-        task_repo = TaskRepository(db)
-        project_service = ProjectService(project_repo, task_repo)
-        task_service = TaskService(task_repo)
+        uow = UnitOfWork(db)
+        task_repo = uow.tasks
+        project_service = ProjectService(uow)
+        task_service = TaskService(uow)
 
         while True:
             display_menu()
@@ -61,13 +61,20 @@ def main():
             elif choice == "2":
                 # Show all projects
                 try:
-                    projects = project_service.get_all_projects()
+                    # Projects come with their task counts, one query per page
+                    projects, cursor = [], None
+                    while True:
+                        page, cursor = project_service.get_projects_page(MAX_PAGE_SIZE, cursor)
+                        projects += page
+                        if cursor is None:
+                            break
+
                     if not projects:
                         print("📭 No projects found")
                     else:
                         print("\n Your Projects (newest first):")
                         for project in projects:
-                            task_count = project_service.get_task_count(project.id)
+                            task_count = project.task_count
                             created_str = project.created_at.strftime("%Y-%m-%d %H:%M")
                             
                             if task_count == 0:
@@ -196,6 +203,7 @@ def main():
                         task.closed_at = datetime.now()
                     
                     task_repo.update(task)
+                    uow.commit()
                     print("✅ Task updated successfully!")
                 except Exception as e:
                     print(f"❌ {e}")
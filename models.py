@@ -1,9 +1,29 @@
-from datetime import datetime
+import sys
+from datetime import datetime, timedelta
+
+# Timestamps are kept as float seconds since this naive epoch: a float is half
+# the size of a datetime. Whole seconds (every date-only deadline) round-trip
+# exactly for any year; microseconds only while |seconds| < 2**33, i.e. from
+# 1698 to 2241. Outside that, sub-second digits are rounded to the nearest
+# representable float (within ~31 microseconds by the year 9999)
+_EPOCH = datetime(1970, 1, 1)
+
+
+def pack_time(value: datetime):
+    """Convert a naive datetime (or None) to its compact stored form"""
+    return None if value is None else (value - _EPOCH).total_seconds()
+
+
+def unpack_time(value):
+    """Convert a stored timestamp (or None) back to a naive datetime"""
+    return None if value is None else _EPOCH + timedelta(seconds=value)
 
 
 class Project:
     """Model for representing a project"""
 
+    __slots__ = ("id", "name", "description", "_created_at")
+
     def __init__(self, id: int, name: str, description: str):
         """
         Initialize a new Project
@@ -18,6 +38,14 @@ class Project:
         self.description = description
         self.created_at = datetime.now()
 
+    @property
+    def created_at(self) -> datetime:
+        return unpack_time(self._created_at)
+
+    @created_at.setter
+    def created_at(self, value: datetime):
+        self._created_at = pack_time(value)
+
     def __str__(self) -> str:
         """String representation of the project"""
         return f"Project {self.id}: {self.name}"
@@ -26,6 +54,8 @@ class Project:
 class Task:
     """Model for representing a task"""
 
+    __slots__ = ("id", "title", "description", "project_id", "_status", "_deadline", "_created_at")
+
     def __init__(self, id: int, title: str, description: str, project_id: int, deadline: datetime = None):
         """
         Initialize a new Task
@@ -45,6 +75,32 @@ class Task:
         self.deadline = deadline
         self.created_at = datetime.now()
 
+    @property
+    def status(self) -> str:
+        return self._status
+
+    @status.setter
+    def status(self, value: str):
+        # Statuses typed in at the prompt are fresh strings; interning makes
+        # every task share one object per status
+        self._status = sys.intern(value)
+
+    @property
+    def deadline(self):
+        return unpack_time(self._deadline)
+
+    @deadline.setter
+    def deadline(self, value: datetime):
+        self._deadline = pack_time(value)
+
+    @property
+    def created_at(self) -> datetime:
+        return unpack_time(self._created_at)
+
+    @created_at.setter
+    def created_at(self, value: datetime):
+        self._created_at = pack_time(value)
+
     def __str__(self) -> str:
         """String representation of the task"""
         deadline_str = self.deadline.strftime("%Y-%m-%d") if self.deadline else "No deadline"
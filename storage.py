@@ -5,92 +5,208 @@ class InMemoryStorage:
     """In-memory storage for projects and tasks"""
 
     def __init__(self):
-        """Initialize in-memory storage with empty lists and ID counters"""
-        self.projects = []
-        self.tasks = []
+        """Initialize in-memory storage with empty indexes and ID counters"""
+        # id -> object maps (dicts keep insertion order, i.e. creation order)
+        self._projects = {}
+        self._tasks = {}
+        # name -> project index for duplicate-name checks
+        self._projects_by_name = {}
+        # project_id -> {task_id: task} for that project, in created_at order (oldest
+        # first) except for the projects in _unsorted_projects
+        self._project_tasks = {}
+        self._unsorted_projects = set()
         self.next_project_id = 1
         self.next_task_id = 1
 
+    @property
+    def projects(self) -> list:
+        """
+        All projects in creation order
+
+        Returns:
+            list: List of all Project objects
+        """
+        return list(self._projects.values())
+
+    @property
+    def tasks(self) -> list:
+        """
+        All tasks in creation order
+
+        Returns:
+            list: List of all Task objects
+        """
+        return list(self._tasks.values())
+
     def add_project(self, project: Project) -> Project:
         """
         Add a new project and assign auto-increment ID
 
-        
         Args:
             project (Project): Project object to add
-        
->>>>>>> develop
+
         Returns:
             Project: The added project with assigned ID
         """
         project.id = self.next_project_id
         self.next_project_id += 1
-        self.projects.append(project)
+        self._projects[project.id] = project
+        self._projects_by_name[project.name] = project
+        self._project_tasks[project.id] = {}
         return project
 
-    
     def add_task(self, task: Task) -> Task:
         """
         Add a new task and assign auto-increment ID
-        
+
         Args:
             task (Task): Task object to add
-        
->>>>>>> develop
+
         Returns:
             Task: The added task with assigned ID
         """
         task.id = self.next_task_id
         self.next_task_id += 1
-        self.tasks.append(task)
+        self._tasks[task.id] = task
+        bucket = self._project_tasks.setdefault(task.project_id, {})
+        # New tasks are almost always the newest; if not, sort on the next read
+        if bucket and next(reversed(bucket.values())).created_at > task.created_at:
+            self._unsorted_projects.add(task.project_id)
+        bucket[task.id] = task
         return task
 
-    
+    def get_project(self, project_id: int):
+        """
+        Get a project by its ID
+
+        Args:
+            project_id (int): ID of the project
+
+        Returns:
+            Project | None: The project, or None if it does not exist
+        """
+        return self._projects.get(project_id)
+
+    def get_project_by_name(self, name: str):
+        """
+        Get a project by its name
+
+        Args:
+            name (str): Name of the project
+
+        Returns:
+            Project | None: The project, or None if no project has this name
+        """
+        return self._projects_by_name.get(name)
+
+    def get_task(self, task_id: int):
+        """
+        Get a task by its ID
+
+        Args:
+            task_id (int): ID of the task
+
+        Returns:
+            Task | None: The task, or None if it does not exist
+        """
+        return self._tasks.get(task_id)
+
+    def update_project(self, project_id: int, name: str, description: str) -> Project:
+        """
+        Update a project's name and description, keeping the name index in sync
+
+        Args:
+            project_id (int): ID of the project to update
+            name (str): New project name
+            description (str): New project description
+
+        Returns:
+            Project: The updated project
+        """
+        project = self._projects[project_id]
+        if project.name != name:
+            if self._projects_by_name.get(project.name) is project:
+                del self._projects_by_name[project.name]
+            self._projects_by_name[name] = project
+        project.name = name
+        project.description = description
+        return project
+
+    def count_projects(self) -> int:
+        """
+        Get the number of stored projects
+
+        Returns:
+            int: Number of projects
+        """
+        return len(self._projects)
+
+    def count_tasks_by_project(self, project_id: int) -> int:
+        """
+        Get the number of tasks in a specific project
+
+        Args:
+            project_id (int): ID of the project
+
+        Returns:
+            int: Number of tasks in the project
+        """
+        return len(self._project_tasks.get(project_id, ()))
+
     def get_all_projects(self) -> list:
         """
         Get all projects
-        
->>>>>>> develop
+
         Returns:
             list: List of all Project objects
         """
         return self.projects
 
-    
     def get_tasks_by_project(self, project_id: int) -> list:
         """
         Get all tasks for a specific project sorted by creation time
-        
+
         Args:
             project_id (int): ID of the project
-        
->>>>>>> develop
+
         Returns:
             list: List of Task objects for the specified project (newest first)
         """
-        tasks = [task for task in self.tasks if task.project_id == project_id]
-        return sorted(tasks, key=lambda x: x.created_at, reverse=True)
+        bucket = self._project_tasks.get(project_id)
+        if not bucket:
+            return []
+        if project_id in self._unsorted_projects:
+            ordered = sorted(bucket.values(), key=lambda t: t.created_at)
+            bucket = self._project_tasks[project_id] = {task.id: task for task in ordered}
+            self._unsorted_projects.discard(project_id)
+        return list(reversed(bucket.values()))
 
-       
     def delete_project(self, project_id: int) -> None:
         """
         Delete a project and all its tasks (Cascade Delete)
-        
->>>>>>> develop
+
         Args:
             project_id (int): ID of the project to delete
         """
         # Remove project
-        self.projects = [p for p in self.projects if p.id != project_id]
-        # Remove all tasks belonging to this project
-        self.tasks = [t for t in self.tasks if t.project_id != project_id]
+        project = self._projects.pop(project_id, None)
+        if project is not None and self._projects_by_name.get(project.name) is project:
+            del self._projects_by_name[project.name]
+        # Remove all tasks belonging to this project: O(tasks in the project)
+        for task_id in self._project_tasks.pop(project_id, ()):
+            self._tasks.pop(task_id, None)
+        self._unsorted_projects.discard(project_id)
 
-    
     def delete_task(self, task_id: int) -> None:
         """
         Delete a specific task
-        
+
         Args:
             task_id (int): ID of the task to delete
         """
-        self.tasks = [t for t in self.tasks if t.id != task_id]
+        task = self._tasks.pop(task_id, None)
+        if task is None:
+            return
+        bucket = self._project_tasks.get(task.project_id)
+        if bucket is not None:
+            bucket.pop(task_id, None)
@@ -0,0 +1,66 @@
+import os
+import tempfile
+
+import pytest
+
+# The engines are built from the environment when app.db.session is imported,
+# so point them at a throwaway SQLite file before anything from app is loaded
+_DB_DIR = tempfile.mkdtemp(prefix="todolist-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_DB_DIR, 'test.db')}"
+os.environ.pop("ASYNC_DATABASE_URL", None)
+os.environ["SCHEDULER_IN_PROCESS"] = "false"
+os.environ["SCHEDULER_LOCK_FILE"] = os.path.join(_DB_DIR, "scheduler.lock")
+
+from sqlalchemy import text  # noqa: E402
+
+import app.models  # noqa: E402,F401
+from app.db.base import Base  # noqa: E402
+from app.db.session import SessionLocal, engine  # noqa: E402
+from app.repositories.cache import repository_cache  # noqa: E402
+from app.repositories.unit_of_work import UnitOfWork  # noqa: E402
+
+
+@pytest.fixture(scope="session", autouse=True)
+def schema():
+    Base.metadata.create_all(engine)
+    yield
+    engine.dispose()
+
+
+@pytest.fixture(autouse=True)
+def clean_database(schema, monkeypatch):
+    """Every test starts with empty tables, an empty cache and the default limits"""
+    monkeypatch.delenv("MAX_NUMBER_OF_PROJECTS", raising=False)
+    monkeypatch.delenv("MAX_NUMBER_OF_TASKS_PER_PROJECT", raising=False)
+    with engine.begin() as conn:
+        for table in reversed(Base.metadata.sorted_tables):
+            conn.execute(table.delete())
+        conn.execute(text("INSERT INTO tasks_fts (tasks_fts) VALUES ('rebuild')"))
+    repository_cache.clear()
+    yield
+    repository_cache.clear()
+
+
+@pytest.fixture
+def db():
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture
+def uow(db):
+    return UnitOfWork(db)
+
+
+@pytest.fixture(scope="session")
+def client(schema):
+    from fastapi.testclient import TestClient
+    from app.api.main import app
+
+    # One client for the whole run: the async engine's pooled connections
+    # belong to the event loop the client runs the app on
+    with TestClient(app) as test_client:
+        yield test_client
@@ -0,0 +1,273 @@
+import csv
+import io
+import json
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.api import responses
+from app.api.routes import export
+
+
+def create_project(client, name, description=""):
+    response = client.post("/api/v1/projects", json={"name": name, "description": description})
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def create_task(client, project_id, title, description="", deadline=None):
+    payload = {"title": title, "description": description, "deadline": deadline}
+    response = client.post(f"/api/v1/projects/{project_id}/tasks", json=payload)
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+class TestCreateTask:
+
+    def test_unknown_project(self, client):
+        response = client.post("/api/v1/projects/999999/tasks", json={"title": "t", "description": ""})
+        assert response.status_code == 404
+
+    def test_task_limit(self, client, monkeypatch):
+        monkeypatch.setenv("MAX_NUMBER_OF_TASKS_PER_PROJECT", "1")
+        project = create_project(client, "Website")
+        task = create_task(client, project["id"], "one")
+        assert (task["status"], task["project_id"]) == ("todo", project["id"])
+
+        response = client.post(f"/api/v1/projects/{project['id']}/tasks", json={"title": "two", "description": ""})
+        assert response.status_code == 400
+
+
+class TestKeysetPagination:
+
+    def test_project_pages_cover_every_project_once(self, client, monkeypatch):
+        monkeypatch.setenv("MAX_NUMBER_OF_PROJECTS", "20")
+        created = [create_project(client, f"project {i}")["id"] for i in range(7)]
+
+        seen, cursor = [], None
+        while True:
+            params = {"limit": 3, **({"cursor": cursor} if cursor else {})}
+            page = client.get("/api/v1/projects", params=params).json()
+            assert len(page["items"]) <= 3
+            seen += [item["id"] for item in page["items"]]
+            cursor = page["next_cursor"]
+            if cursor is None:
+                break
+
+        assert seen == list(reversed(created))
+
+    def test_project_page_includes_task_counts(self, client):
+        project = create_project(client, "Website")
+        first = create_task(client, project["id"], "one")
+        create_task(client, project["id"], "two")
+        client.patch(f"/api/v1/tasks/{first['id']}/status", params={"status": "done"})
+
+        item = client.get("/api/v1/projects").json()["items"][0]
+        assert (item["task_count"], item["open_task_count"], item["done_task_count"]) == (2, 1, 1)
+
+    def test_task_pages(self, client):
+        project = create_project(client, "Website")
+        created = [create_task(client, project["id"], f"task {i}")["id"] for i in range(5)]
+
+        first = client.get(f"/api/v1/projects/{project['id']}/tasks", params={"limit": 2}).json()
+        second = client.get(
+            f"/api/v1/projects/{project['id']}/tasks", params={"limit": 2, "cursor": first["next_cursor"]}
+        ).json()
+
+        assert [item["id"] for item in first["items"] + second["items"]] == list(reversed(created))[:4]
+
+    def test_invalid_cursor(self, client):
+        assert client.get("/api/v1/projects", params={"cursor": "not-a-cursor"}).status_code == 400
+
+
+class TestConditionalGet:
+
+    def test_projects_304_until_a_task_changes(self, client):
+        project = create_project(client, "Website")
+        response = client.get("/api/v1/projects")
+        etag = response.headers["ETag"]
+
+        assert client.get("/api/v1/projects", headers={"If-None-Match": etag}).status_code == 304
+
+        create_task(client, project["id"], "one")
+        response = client.get("/api/v1/projects", headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.headers["ETag"] != etag
+
+    def test_project_tasks_304(self, client):
+        project = create_project(client, "Website")
+        task = create_task(client, project["id"], "one")
+        url = f"/api/v1/projects/{project['id']}/tasks"
+        etag = client.get(url).headers["ETag"]
+
+        assert client.get(url, headers={"If-None-Match": etag}).status_code == 304
+
+        client.patch(f"/api/v1/tasks/{task['id']}/status", params={"status": "doing"})
+        assert client.get(url, headers={"If-None-Match": etag}).status_code == 200
+
+    def test_single_task_304(self, client):
+        project = create_project(client, "Website")
+        task = create_task(client, project["id"], "one")
+        url = f"/api/v1/tasks/{task['id']}"
+        etag = client.get(url).headers["ETag"]
+
+        assert client.get(url, headers={"If-None-Match": f'W/{etag}'}).status_code == 304
+        assert client.get("/api/v1/tasks/999999").status_code == 404
+
+
+class TestBatchCreate:
+
+    def test_valid_and_invalid_items(self, client):
+        project = create_project(client, "Website")
+        tomorrow = (datetime.now() + timedelta(days=1)).isoformat()
+        yesterday = (datetime.now() - timedelta(days=1)).isoformat()
+        tasks = [
+            {"title": "one", "description": ""},
+            {"title": "x" * 31, "description": ""},
+            {"title": "two", "description": "", "deadline": tomorrow},
+            {"title": "late", "description": "", "deadline": yesterday},
+        ]
+
+        result = client.post(f"/api/v1/projects/{project['id']}/tasks:batch", json={"tasks": tasks}).json()
+
+        assert (result["created"], result["failed"]) == (2, 2)
+        assert [item["success"] for item in result["results"]] == [True, False, True, False]
+        created_ids = [item["task_id"] for item in result["results"] if item["success"]]
+        assert created_ids == sorted(created_ids)
+        assert client.get(f"/api/v1/tasks/{created_ids[1]}").json()["title"] == "two"
+
+    def test_task_limit_applies_per_item(self, client, monkeypatch):
+        monkeypatch.setenv("MAX_NUMBER_OF_TASKS_PER_PROJECT", "3")
+        project = create_project(client, "Website")
+        create_task(client, project["id"], "existing")
+        tasks = [{"title": f"t{i}", "description": ""} for i in range(4)]
+
+        result = client.post(f"/api/v1/projects/{project['id']}/tasks:batch", json={"tasks": tasks}).json()
+
+        assert (result["created"], result["failed"]) == (2, 2)
+
+    def test_unknown_project_and_oversized_batch(self, client):
+        tasks = [{"title": "t", "description": ""}]
+        assert client.post("/api/v1/projects/999999/tasks:batch", json={"tasks": tasks}).status_code == 404
+
+        project = create_project(client, "Website")
+        too_many = {"tasks": tasks * 1001}
+        assert client.post(f"/api/v1/projects/{project['id']}/tasks:batch", json=too_many).status_code == 400
+
+
+class TestSearch:
+
+    def test_title_matches_rank_first_and_prefixes_match(self, client):
+        project = create_project(client, "Website")
+        in_description = create_task(client, project["id"], "Write copy", "before the deploy")
+        in_title = create_task(client, project["id"], "Deploy site", "")
+        create_task(client, project["id"], "Unrelated", "")
+
+        items = client.get("/api/v1/search", params={"q": "deploy"}).json()["items"]
+        assert [item["id"] for item in items] == [in_title["id"], in_description["id"]]
+
+        items = client.get("/api/v1/search", params={"q": "dep"}).json()["items"]
+        assert {item["id"] for item in items} == {in_title["id"], in_description["id"]}
+
+    def test_all_words_must_match(self, client):
+        project = create_project(client, "Website")
+        both = create_task(client, project["id"], "Deploy site", "staging first")
+        create_task(client, project["id"], "Deploy docs", "")
+
+        items = client.get("/api/v1/search", params={"q": "deploy staging"}).json()["items"]
+        assert [item["id"] for item in items] == [both["id"]]
+
+    def test_project_filter_pages_and_edits(self, client):
+        website = create_project(client, "Website")
+        other = create_project(client, "Other")
+        ids = [create_task(client, website["id"], f"Report {i}")["id"] for i in range(3)]
+        create_task(client, other["id"], "Report elsewhere")
+
+        first = client.get("/api/v1/search", params={"q": "report", "project_id": website["id"], "limit": 2}).json()
+        second = client.get(
+            "/api/v1/search",
+            params={"q": "report", "project_id": website["id"], "limit": 2, "cursor": first["next_cursor"]},
+        ).json()
+        assert sorted(item["id"] for item in first["items"] + second["items"]) == ids
+        assert second["next_cursor"] is None
+
+        client.put(f"/api/v1/tasks/{ids[0]}", json={"title": "Summary", "description": ""})
+        client.delete(f"/api/v1/tasks/{ids[1]}")
+        items = client.get("/api/v1/search", params={"q": "report", "project_id": website["id"]}).json()["items"]
+        assert [item["id"] for item in items] == [ids[2]]
+        assert client.get("/api/v1/search", params={"q": "summary"}).json()["items"][0]["id"] == ids[0]
+
+    def test_invalid_cursor(self, client):
+        assert client.get("/api/v1/search", params={"q": "x", "cursor": "@@"}).status_code == 400
+
+
+class TestExport:
+
+    def test_ndjson_with_filters(self, client):
+        website = create_project(client, "Website")
+        other = create_project(client, "Other")
+        first = create_task(client, website["id"], "one", "with \"quotes\"")
+        second = create_task(client, website["id"], "two")
+        create_task(client, other["id"], "elsewhere")
+        client.patch(f"/api/v1/tasks/{second['id']}/status", params={"status": "done"})
+
+        response = client.get("/api/v1/export/tasks", params={"project_id": website["id"]})
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        records = [json.loads(line) for line in response.text.splitlines()]
+        assert [record["id"] for record in records] == [first["id"], second["id"]]
+        assert records[0]["description"] == 'with "quotes"'
+        assert records[0]["deadline"] is None and records[1]["closed_at"] is not None
+
+        response = client.get("/api/v1/export/tasks", params={"project_id": website["id"], "status": "done"})
+        assert [json.loads(line)["id"] for line in response.text.splitlines()] == [second["id"]]
+
+    def test_csv_in_chunks(self, client, monkeypatch):
+        monkeypatch.setattr(export, "EXPORT_CHUNK_ROWS", 2)
+        project = create_project(client, "Website")
+        ids = [create_task(client, project["id"], f"task {i}")["id"] for i in range(5)]
+
+        response = client.get("/api/v1/export/tasks", params={"format": "csv"})
+
+        assert response.headers["content-type"].startswith("text/csv")
+        rows = list(csv.DictReader(io.StringIO(response.text)))
+        assert [int(row["id"]) for row in rows] == ids
+        assert list(rows[0]) == export.EXPORT_FIELDS
+
+    def test_created_window_and_invalid_status(self, client):
+        project = create_project(client, "Website")
+        create_task(client, project["id"], "one")
+        future = (datetime.now() + timedelta(days=1)).isoformat()
+
+        assert client.get("/api/v1/export/tasks", params={"created_after": future}).text == ""
+        assert client.get("/api/v1/export/tasks", params={"status": "late"}).status_code == 400
+        assert client.get("/api/v1/export/tasks", params={"format": "xml"}).status_code == 422
+
+
+class TestFastJson:
+
+    @pytest.mark.parametrize("path", ["/api/v1/projects", "/api/v1/projects/{id}/tasks"])
+    def test_matches_the_validated_response(self, client, monkeypatch, path):
+        pytest.importorskip("orjson")
+        project = create_project(client, "Website", "Company site")
+        deadline = (datetime.now() + timedelta(days=1)).replace(microsecond=0)
+        create_task(client, project["id"], "one", "", deadline.isoformat())
+        done = create_task(client, project["id"], "two")
+        client.patch(f"/api/v1/tasks/{done['id']}/status", params={"status": "done"})
+        url = path.format(id=project["id"])
+
+        validated = client.get(url)
+        monkeypatch.setattr(responses, "FAST_JSON", True)
+        encoded = []
+        render = responses.ORJSONResponse.render
+
+        def counting_render(self, content):
+            encoded.append(content)
+            return render(self, content)
+
+        monkeypatch.setattr(responses.ORJSONResponse, "render", counting_render)
+        fast = client.get(url)
+
+        assert len(encoded) == 1
+        assert fast.json() == validated.json()
+        assert fast.headers["ETag"] == validated.headers["ETag"]
+        assert client.get(url, headers={"If-None-Match": fast.headers["ETag"]}).status_code == 304
@@ -0,0 +1,14 @@
+import sys
+
+from benchmarks import bench_memory
+
+
+def test_bench_memory_runs(monkeypatch, capsys):
+    # The dict baselines are not models.Task, so this also checks that
+    # InMemoryStorage only relies on the public model attributes
+    monkeypatch.setattr(sys, "argv", ["bench_memory", "--tasks", "500"])
+
+    bench_memory.main()
+
+    output = capsys.readouterr().out
+    assert "dict" in output and "slots" in output
@@ -0,0 +1,119 @@
+import logging
+
+import pytest
+from sqlalchemy import create_engine, exc, text
+
+from app.db import query_detector
+from app.db.pool import StatsQueuePool, configure_engine, engine_options, pool_stats
+from app.db.query_detector import QueryDetector, query_scope, statement_shape
+from app.db.session import engine
+from app.exceptions.repository_exceptions import QueryBudgetExceededException
+
+
+class TestPool:
+
+    def test_presets_and_environment_overrides(self, monkeypatch):
+        options = engine_options("postgresql://db/todo")
+        assert (options["pool_size"], options["max_overflow"], options["pool_pre_ping"]) == (10, 20, True)
+        assert options["poolclass"] is StatsQueuePool
+
+        monkeypatch.setenv("DB_POOL_SIZE", "3")
+        monkeypatch.setenv("DB_POOL_PRE_PING", "false")
+        options = engine_options("postgresql://db/todo")
+        assert (options["pool_size"], options["pool_pre_ping"]) == (3, False)
+
+        # One connection holds an in-memory database: nothing to pool
+        assert "poolclass" not in engine_options("sqlite://")
+
+    def test_sqlite_pragmas_are_applied(self):
+        with engine.connect() as conn:
+            assert conn.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+            assert conn.execute(text("PRAGMA foreign_keys")).scalar() == 1
+            assert conn.execute(text("PRAGMA busy_timeout")).scalar() == 5000
+
+    def test_stats_count_checkouts_and_timeouts(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("DB_POOL_SIZE", "1")
+        monkeypatch.setenv("DB_MAX_OVERFLOW", "0")
+        monkeypatch.setenv("DB_POOL_TIMEOUT", "0.05")
+        url = f"sqlite:///{tmp_path / 'pool.db'}"
+        small = create_engine(url, **engine_options(url))
+        configure_engine(small)
+        try:
+            with small.connect():
+                with pytest.raises(exc.TimeoutError):
+                    small.connect()
+                stats = pool_stats(small)
+                assert (stats["checked_out"], stats["checkouts"], stats["timeouts"]) == (1, 2, 1)
+                assert stats["max_wait_ms"] >= 50
+            assert pool_stats(small)["checked_out"] == 0
+        finally:
+            small.dispose()
+
+    def test_health_reports_both_pools(self, client):
+        database = client.get("/api/v1/health").json()["database"]
+        assert {"checked_out", "overflow", "avg_wait_ms"} <= database["sync_pool"].keys()
+        assert "checked_out" in database["async_pool"]
+
+
+class TestQueryDetector:
+
+    @pytest.fixture(autouse=True)
+    def detector(self, monkeypatch):
+        settings = query_detector.settings
+        monkeypatch.setattr(settings, "enabled", True)
+        monkeypatch.setattr(settings, "slow_ms", 1000.0)
+        monkeypatch.setattr(settings, "repeat_threshold", 3)
+        monkeypatch.setattr(settings, "budget", 0)
+        monkeypatch.setattr(settings, "strict", False)
+        return settings
+
+    def test_in_lists_of_any_length_share_a_shape(self):
+        assert statement_shape("SELECT id FROM tasks\n WHERE id IN (?, ?, ?)") == statement_shape(
+            "SELECT id FROM tasks WHERE id IN (?)"
+        )
+        assert statement_shape("WHERE id IN (%(id_1)s, %(id_2)s)") == "WHERE id IN (...)"
+        assert statement_shape("WHERE id = $1") != statement_shape("WHERE name = $1")
+
+    def test_repeated_statements_are_flagged_once(self, caplog):
+        caplog.set_level(logging.WARNING, logger=query_detector.__name__)
+        with query_scope("cli") as stats:
+            with engine.connect() as conn:
+                for project_id in range(5):
+                    conn.execute(text("SELECT count(*) FROM tasks WHERE project_id = :id"), {"id": project_id})
+
+        assert isinstance(stats, QueryDetector) and stats.count == 5
+        n_plus_one = [record for record in caplog.records if "Possible N+1 in cli" in record.message]
+        assert len(n_plus_one) == 1
+        assert "5x SELECT count(*) FROM tasks" in caplog.records[-1].message
+
+    def test_slow_statements_are_logged_with_parameters(self, detector, caplog):
+        detector.slow_ms = 0
+        caplog.set_level(logging.WARNING, logger=query_detector.__name__)
+        with query_scope("cli"):
+            with engine.connect() as conn:
+                conn.execute(text("SELECT :marker"), {"marker": "slow-one"})
+
+        assert any("Slow query" in record.message and "slow-one" in record.message for record in caplog.records)
+
+    def test_strict_mode_raises_over_budget(self, detector):
+        detector.strict = True
+        detector.budget = 2
+        with engine.connect() as conn:
+            with query_scope("within budget"):
+                conn.execute(text("SELECT 1"))
+                conn.execute(text("SELECT 2"))
+            with pytest.raises(QueryBudgetExceededException):
+                with query_scope("over budget"):
+                    for _ in range(3):
+                        conn.execute(text("SELECT 1"))
+
+    def test_disabled_detector_only_counts(self, detector):
+        detector.enabled = False
+        detector.strict = True
+        detector.budget = 1
+        with query_scope("cli") as stats:
+            with engine.connect() as conn:
+                conn.execute(text("SELECT 1"))
+                conn.execute(text("SELECT 2"))
+
+        assert not isinstance(stats, QueryDetector) and stats.count == 2
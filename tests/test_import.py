@@ -0,0 +1,105 @@
+import sqlite3
+from datetime import datetime
+
+import pytest
+from sqlalchemy import insert
+from sqlalchemy.exc import OperationalError
+
+from app.commands.import_data import import_file
+from app.models.task import Task
+from app.repositories.task_repository import TaskRepository, _copy_csv
+
+
+class TestImport:
+
+    def test_imports_valid_records_and_counts_rejections(self, tmp_path, db):
+        path = tmp_path / "tasks.jsonl"
+        path.write_text("\n".join([
+            '{"type": "project", "project": "Website", "description": "Company site"}',
+            '{"type": "task", "project": "Website", "title": "Draft copy", "deadline": "2099-03-01"}',
+            '{"type": "task", "project": "Missing", "title": "Orphan"}',
+            '{"type": "task", "project": "Website", "title": "Bad status", "status": "later"}',
+            '{"type": "comment"}',
+            '{"type": "task", "project": "Website", "title": "Ship", "status": "done"}',
+        ]) + "\n")
+
+        importer = import_file(str(path), batch_size=1)
+
+        assert (importer.projects_created, importer.tasks_imported, importer.rejected) == (1, 2, 3)
+        titles = {task.title: task for task in db.query(Task).all()}
+        assert set(titles) == {"Draft copy", "Ship"}
+        assert titles["Ship"].closed_at is not None
+
+    def test_csv_and_task_limit(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("MAX_NUMBER_OF_TASKS_PER_PROJECT", "2")
+        path = tmp_path / "tasks.csv"
+        path.write_text(
+            "type,project,title,description,status,deadline\n"
+            "project,Website,,,,\n"
+            "task,Website,one,,,\n"
+            "task,Website,two,,,\n"
+            "task,Website,three,,,\n"
+        )
+
+        importer = import_file(str(path))
+
+        assert (importer.projects_created, importer.tasks_imported, importer.rejected) == (1, 2, 1)
+
+    def test_malformed_json_line_is_rejected_not_fatal(self, tmp_path):
+        path = tmp_path / "tasks.jsonl"
+        path.write_text("\n".join([
+            '{"type": "project", "project": "Website"}',
+            '{"type": "task", "project": "Website", "title": "one"}',
+            '{"type": "task", "project": "Website", "title": ',
+            '["not", "an", "object"]',
+            '{"type": "task", "project": "Website", "title": "two"}',
+        ]) + "\n")
+
+        importer = import_file(str(path))
+
+        assert (importer.projects_created, importer.tasks_imported, importer.rejected) == (1, 2, 2)
+
+    @pytest.mark.parametrize("error", [
+        OperationalError("INSERT", {}, Exception("disk I/O error")),
+        # What a failed COPY raises: straight from the driver, not wrapped by SQLAlchemy
+        sqlite3.OperationalError("disk I/O error"),
+    ])
+    def test_failed_batch_is_rolled_back_and_counted(self, tmp_path, db, monkeypatch, error):
+        bulk_insert = TaskRepository.bulk_insert
+        calls = []
+
+        def failing_first_batch(self, rows):
+            calls.append(len(rows))
+            if len(calls) == 1:
+                # Fail after the rows reached the database, as a COPY or commit would
+                self.db.execute(insert(Task), rows)
+                raise error
+            return bulk_insert(self, rows)
+
+        monkeypatch.setattr(TaskRepository, "bulk_insert", failing_first_batch)
+        path = tmp_path / "tasks.jsonl"
+        path.write_text("\n".join(
+            ['{"type": "project", "project": "Website"}']
+            + [f'{{"type": "task", "project": "Website", "title": "t{i}"}}' for i in range(5)]
+        ) + "\n")
+
+        importer = import_file(str(path), batch_size=2)
+
+        assert calls == [2, 2, 1]
+        assert (importer.tasks_imported, importer.rejected) == (3, 2)
+        assert sorted(task.title for task in db.query(Task).all()) == ["t2", "t3", "t4"]
+
+    def test_copy_csv_writes_null_unquoted(self):
+        row = {
+            "title": 'Say "hi", \\N',
+            "description": "",
+            "status": "todo",
+            "project_id": 7,
+            "deadline": None,
+            "created_at": datetime(2025, 3, 1, 12, 30),
+            "closed_at": None,
+        }
+
+        assert _copy_csv([row]).read() == (
+            '"Say ""hi"", \\N","","todo",7,\\N,"2025-03-01T12:30:00",\\N\n'
+        )
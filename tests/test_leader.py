@@ -0,0 +1,222 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.api import main
+from app.db.base import Base
+from app.db.leader import FileLock, PostgresAdvisoryLock, leader_lock
+from app.models.project import Project
+from app.models.task import Task
+from app.services import deadline_scheduler
+
+
+def test_file_lock_has_a_single_holder(tmp_path):
+    path = str(tmp_path / "scheduler.lock")
+    first, second = FileLock(path), FileLock(path)
+
+    async def scenario():
+        assert await first.acquire()
+        assert not await second.acquire()
+        await first.release()
+        assert await second.acquire()
+        await second.release()
+
+    asyncio.run(scenario())
+
+
+class FakeConnection:
+    """Stands in for the AsyncConnection that holds a Postgres advisory lock"""
+
+    def __init__(self, granted=True, broken=False):
+        self.granted = granted
+        self.broken = broken
+        self.statements = []
+        self.closed = False
+        self.invalidated = False
+
+    async def scalar(self, statement, parameters):
+        self.statements.append(str(statement))
+        if self.broken:
+            raise ConnectionError("server closed the connection")
+        return self.granted
+
+    async def execute(self, statement, parameters=None):
+        self.statements.append(str(statement))
+        if self.broken:
+            raise ConnectionError("server closed the connection")
+
+    async def commit(self):
+        pass
+
+    async def invalidate(self):
+        self.invalidated = True
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeEngine:
+    def __init__(self, *connections):
+        self.connections = list(connections)
+
+    async def connect(self):
+        return self.connections.pop(0)
+
+
+class TestPostgresAdvisoryLock:
+
+    def test_acquire_holds_a_connection_until_release(self):
+        conn = FakeConnection()
+        lock = PostgresAdvisoryLock(FakeEngine(conn), key=42)
+
+        async def scenario():
+            assert await lock.acquire()
+            assert await lock.acquire()
+            assert await lock.is_held()
+            assert not conn.closed
+            await lock.release()
+            assert not await lock.is_held()
+
+        asyncio.run(scenario())
+        assert "pg_try_advisory_lock" in conn.statements[0]
+        assert "pg_advisory_unlock" in conn.statements[-1]
+        assert conn.closed and not conn.invalidated
+
+    def test_lock_taken_elsewhere_or_failing_closes_the_connection(self):
+        taken, broken = FakeConnection(granted=False), FakeConnection(broken=True)
+        lock = PostgresAdvisoryLock(FakeEngine(taken, broken))
+
+        async def scenario():
+            assert not await lock.acquire()
+            with pytest.raises(ConnectionError):
+                await lock.acquire()
+
+        asyncio.run(scenario())
+        assert taken.closed and broken.closed
+
+    def test_dead_connection_means_the_lock_is_lost(self):
+        conn = FakeConnection()
+        lock = PostgresAdvisoryLock(FakeEngine(conn))
+
+        async def scenario():
+            assert await lock.acquire()
+            conn.broken = True
+            return await lock.is_held()
+
+        assert not asyncio.run(scenario())
+        assert conn.invalidated and conn.closed
+
+    def test_backend_picks_the_lock(self, tmp_path, monkeypatch):
+        class PostgresEngine:
+            class dialect:
+                name = "postgresql"
+
+        assert isinstance(leader_lock(PostgresEngine()), PostgresAdvisoryLock)
+        monkeypatch.delenv("SCHEDULER_LOCK_FILE")
+        sqlite_engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'todo.db'}")
+        lock = leader_lock(sqlite_engine)
+        assert isinstance(lock, FileLock) and lock.path == str(tmp_path / "todo.db.scheduler.lock")
+
+
+def test_only_one_worker_leads_and_sweeps(tmp_path, monkeypatch):
+    monkeypatch.setattr(deadline_scheduler, "SCHEDULER_LEADER_CHECK", timedelta(milliseconds=20))
+    # A database of its own: the shared async engine's connections belong to the TestClient's loop
+    path = tmp_path / "workers.db"
+    setup = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(setup)
+    with setup.begin() as conn:
+        conn.execute(insert(Project), [{"id": 1, "name": "Website", "description": ""}])
+        conn.execute(insert(Task), [{
+            "title": "late", "description": "", "project_id": 1, "status": "todo",
+            "deadline": datetime.now() - timedelta(hours=1),
+        }])
+    setup.dispose()
+    lock_path = str(tmp_path / "workers.lock")
+
+    async def scenario():
+        async_engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+        sessions = async_sessionmaker(async_engine, expire_on_commit=False)
+        stop = asyncio.Event()
+        locks = [FileLock(lock_path), FileLock(lock_path)]
+        workers = [asyncio.create_task(deadline_scheduler.run_leader_scheduler(lock, sessions, stop)) for lock in locks]
+        try:
+            for _ in range(250):
+                async with sessions() as db:
+                    if await db.scalar(select(Task.status)) == "done":
+                        break
+                await asyncio.sleep(0.02)
+            leaders = [await lock.is_held() for lock in locks]
+        finally:
+            stop.set()
+            await asyncio.gather(*workers)
+            await async_engine.dispose()
+        return leaders
+
+    leaders = asyncio.run(scenario())
+
+    assert sorted(leaders) == [False, True]
+    check = create_engine(f"sqlite:///{path}")
+    with check.connect() as conn:
+        assert conn.execute(select(Task.status)).scalar() == "done"
+    check.dispose()
+
+
+def test_lifespan_starts_and_stops_the_scheduler(monkeypatch):
+    events = []
+
+    async def fake_scheduler(lock, session_factory, stop):
+        events.append("started")
+        await stop.wait()
+        events.append("stopped")
+
+    monkeypatch.setattr(main, "SCHEDULER_IN_PROCESS", True)
+    monkeypatch.setattr(main, "leader_lock", lambda engine: None)
+    monkeypatch.setattr(main, "run_leader_scheduler", fake_scheduler)
+
+    async def scenario():
+        async with main.lifespan(main.app):
+            await asyncio.sleep(0)
+            assert events == ["started"]
+        assert events == ["started", "stopped"]
+
+    asyncio.run(scenario())
+
+
+def test_lifespan_without_in_process_scheduler(monkeypatch):
+    monkeypatch.setattr(main, "SCHEDULER_IN_PROCESS", False)
+    # Starting it would fail: calling None raises
+    monkeypatch.setattr(main, "run_leader_scheduler", None)
+
+    async def scenario():
+        async with main.lifespan(main.app):
+            pass
+
+    asyncio.run(scenario())
+
+
+def test_leader_loop_survives_a_failed_acquire(monkeypatch):
+    monkeypatch.setattr(deadline_scheduler, "SCHEDULER_LEADER_CHECK", timedelta(0))
+
+    class FlakyLock:
+        def __init__(self, stop):
+            self.stop = stop
+            self.attempts = 0
+
+        async def acquire(self):
+            self.attempts += 1
+            if self.attempts == 1:
+                raise ConnectionError("database restarting")
+            if self.attempts == 3:
+                self.stop.set()
+            return False
+
+    async def scenario():
+        stop = asyncio.Event()
+        lock = FlakyLock(stop)
+        await asyncio.wait_for(deadline_scheduler.run_leader_scheduler(lock, None, stop), timeout=5)
+        return lock.attempts
+
+    assert asyncio.run(scenario()) == 3
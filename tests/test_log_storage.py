@@ -0,0 +1,127 @@
+import os
+import shutil
+from datetime import datetime
+
+import pytest
+
+from log_storage import SNAPSHOT_FILE, WAL_FILE, LogStorage
+from models import Project, Task
+
+
+def add_project(storage, name):
+    return storage.add_project(Project(None, name, ""))
+
+
+def add_task(storage, project_id, title, deadline=None):
+    return storage.add_task(Task(None, title, "", project_id, deadline))
+
+
+def titles(storage, project_id):
+    return [task.title for task in storage.get_tasks_by_project(project_id)]
+
+
+@pytest.fixture
+def directory(tmp_path):
+    return str(tmp_path)
+
+
+def test_log_is_replayed_on_open(directory):
+    with LogStorage(directory) as storage:
+        project = add_project(storage, "Website")
+        first = add_task(storage, project.id, "one", datetime(2099, 1, 1))
+        second = add_task(storage, project.id, "two")
+        storage.update_project(project.id, "Site", "renamed")
+        first.status = "doing"
+        first.title = "first"
+        storage.delete_task(second.id)
+
+    with LogStorage(directory) as storage:
+        project = storage.get_project(project.id)
+        assert (project.name, project.description) == ("Site", "renamed")
+        task = storage.get_task(first.id)
+        assert (task.title, task.status, task.deadline) == ("first", "doing", datetime(2099, 1, 1))
+        assert storage.get_task(second.id) is None
+        assert storage.count_tasks_by_project(project.id) == 1
+        # New ids continue after the replayed ones
+        assert add_task(storage, project.id, "three").id == second.id + 1
+
+
+def test_checkpoint_then_log_is_reloaded(directory):
+    with LogStorage(directory) as storage:
+        project = add_project(storage, "Website")
+        for title in ("one", "two", "three"):
+            add_task(storage, project.id, title)
+        storage.checkpoint()
+        assert os.path.getsize(os.path.join(directory, WAL_FILE)) == 0
+        add_task(storage, project.id, "four")
+        storage.get_tasks_by_project(project.id)[-1].title = "first"
+
+    with LogStorage(directory) as storage:
+        assert titles(storage, project.id) == ["four", "three", "two", "first"]
+        assert storage.get_project_by_name("Website").id == project.id
+
+
+def test_checkpoint_runs_every_n_records(directory):
+    with LogStorage(directory, checkpoint_every=3) as storage:
+        project = add_project(storage, "Website")
+        add_task(storage, project.id, "one")
+        add_task(storage, project.id, "two")
+        assert os.path.exists(os.path.join(directory, SNAPSHOT_FILE))
+        add_task(storage, project.id, "three")
+
+    with LogStorage(directory, checkpoint_every=3) as storage:
+        assert titles(storage, project.id) == ["three", "two", "one"]
+
+
+def test_torn_record_without_newline_is_dropped(directory):
+    with LogStorage(directory) as storage:
+        project = add_project(storage, "Website")
+        add_task(storage, project.id, "a")
+
+    # The last record made it to disk without its newline: it was never acknowledged
+    wal_path = os.path.join(directory, WAL_FILE)
+    with open(wal_path, "rb+") as f:
+        f.truncate(os.path.getsize(wal_path) - 1)
+
+    with LogStorage(directory) as storage:
+        assert titles(storage, project.id) == []
+        add_task(storage, project.id, "b")
+        add_task(storage, project.id, "c")
+
+    with LogStorage(directory) as storage:
+        assert titles(storage, project.id) == ["c", "b"]
+
+
+def test_torn_partial_record_is_truncated(directory):
+    with LogStorage(directory) as storage:
+        project = add_project(storage, "Website")
+        add_task(storage, project.id, "a")
+
+    wal_path = os.path.join(directory, WAL_FILE)
+    size = os.path.getsize(wal_path)
+    with open(wal_path, "ab") as f:
+        f.write(b'{"seq":3,"op":"add_ta')
+
+    with LogStorage(directory) as storage:
+        assert os.path.getsize(wal_path) == size
+        add_task(storage, project.id, "b")
+
+    with LogStorage(directory) as storage:
+        assert titles(storage, project.id) == ["b", "a"]
+
+
+def test_crash_between_snapshot_and_log_truncation(directory):
+    with LogStorage(directory) as storage:
+        project = add_project(storage, "Website")
+        add_task(storage, project.id, "one")
+        add_task(storage, project.id, "two")
+        wal_path = os.path.join(directory, WAL_FILE)
+        shutil.copy(wal_path, wal_path + ".old")
+        storage.checkpoint()
+
+    # The snapshot was written but the old log was never emptied
+    os.replace(wal_path + ".old", wal_path)
+
+    with LogStorage(directory) as storage:
+        assert titles(storage, project.id) == ["two", "one"]
+        assert storage.count_tasks_by_project(project.id) == 2
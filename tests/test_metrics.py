@@ -0,0 +1,66 @@
+import re
+
+from app.metrics import Counter, Gauge, Histogram, Registry
+
+
+def sample(text, name, **labels):
+    """Value of one sample in a /metrics page (0 if it is not there yet)"""
+    for line in text.splitlines():
+        match = re.fullmatch(rf"{re.escape(name)}(?:{{(.*)}})? (\S+)", line)
+        if match and dict(re.findall(r'(\w+)="((?:[^"\\]|\\.)*)"', match.group(1) or "")) == labels:
+            return float(match.group(2))
+    return 0.0
+
+
+def test_exposition_format():
+    registry = Registry()
+    requests = registry.register(Counter("requests_total", "Requests", ("route",)))
+    in_flight = registry.register(Gauge("in_flight", "In flight"))
+    latency = registry.register(Histogram("latency_seconds", "Latency", buckets=(0.1, 1.0)))
+
+    requests.inc(route='/say "hi"\n')
+    requests.inc(2, route='/say "hi"\n')
+    in_flight.inc()
+    in_flight.dec()
+    for value in (0.05, 0.5, 5.0):
+        latency.observe(value)
+
+    assert registry.render().splitlines() == [
+        "# HELP requests_total Requests",
+        "# TYPE requests_total counter",
+        'requests_total{route="/say \\"hi\\"\\n"} 3',
+        "# HELP in_flight In flight",
+        "# TYPE in_flight gauge",
+        "in_flight 0",
+        "# HELP latency_seconds Latency",
+        "# TYPE latency_seconds histogram",
+        'latency_seconds_bucket{le="0.1"} 1',
+        'latency_seconds_bucket{le="1.0"} 2',
+        'latency_seconds_bucket{le="+Inf"} 3',
+        "latency_seconds_sum 5.55",
+        "latency_seconds_count 3",
+    ]
+
+
+def test_requests_are_recorded_per_route_template(client):
+    route = "/api/v1/tasks/{task_id}"
+    before = client.get("/metrics").text
+
+    assert client.get("/api/v1/tasks/123456").status_code == 404
+    assert client.get("/api/v1/tasks/654321").status_code == 404
+    client.get("/no/such/path")
+
+    response = client.get("/metrics")
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    after = response.text
+
+    def delta(name, **labels):
+        return sample(after, name, **labels) - sample(before, name, **labels)
+
+    assert delta("http_requests_total", method="GET", route=route, status="404") == 2
+    assert delta("http_requests_total", method="GET", route="<unmatched>", status="404") == 1
+    assert delta("http_request_duration_seconds_count", method="GET", route=route) == 2
+    assert sample(after, "http_requests_in_progress", method="GET", route=route) == 0
+    # One version lookup per request, on the async engine
+    assert delta("http_request_db_queries_sum", method="GET", route=route) == 2
+    assert delta("db_queries_total", engine="async") >= 2
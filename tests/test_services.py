@@ -0,0 +1,228 @@
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import delete, insert
+from sqlalchemy.exc import IntegrityError
+
+from app.db.session import engine
+from app.models.project import Project
+from app.models.task import Task
+from app.repositories.cache import project_key, repository_cache
+from app.services.deadline_scheduler import DeadlineHeap, DeadlineScheduler
+from app.services.project_service import ProjectService
+from app.services.task_service import TaskService
+from app.exceptions.service_exceptions import (
+    DuplicateProjectNameException,
+    ProjectLimitExceededException,
+    ProjectNotFoundException,
+    TaskLimitExceededException,
+)
+
+
+def add_task(uow, project_id, title, deadline=None, status="todo"):
+    task = Task(title=title, description="", project_id=project_id, deadline=deadline, status=status)
+    uow.tasks.create(task)
+    uow.commit()
+    return task
+
+
+class TestRepositoryCache:
+
+    def test_project_limit(self, uow, monkeypatch):
+        monkeypatch.setenv("MAX_NUMBER_OF_PROJECTS", "2")
+        service = ProjectService(uow)
+        service.create_project("a", "")
+        service.create_project("b", "")
+        with pytest.raises(ProjectLimitExceededException):
+            service.create_project("c", "")
+
+    def test_renamed_project_frees_its_old_name(self, uow):
+        service = ProjectService(uow)
+        project = service.create_project("old", "")
+        assert uow.projects.get_by_name("old").id == project.id
+
+        service.update_project(project.id, "new", "")
+        assert uow.projects.get_by_name("old") is None
+        service.create_project("old", "")
+        with pytest.raises(DuplicateProjectNameException):
+            service.create_project("new", "")
+
+    def test_cached_project_is_detached_and_dropped_on_update(self, uow, db):
+        service = ProjectService(uow)
+        project = service.create_project("Website", "")
+        uow.commit()
+
+        assert uow.projects.get_cached(project.id).name == "Website"
+        cached = repository_cache.get(project_key(project.id))
+        assert cached["version"] == project.version
+
+        served = uow.projects.get_cached(project.id)
+        assert served not in db
+        service.update_project(project.id, "Site", "")
+        assert repository_cache.get(project_key(project.id)) is None
+        assert service.get_project_by_id(project.id).name == "Site"
+
+    def test_writes_do_not_trust_a_stale_cache(self, uow):
+        service = ProjectService(uow)
+        project = service.create_project("Website", "")
+        uow.commit()
+        uow.projects.get_cached(project.id)
+        assert uow.tasks.count_by_project(project.id) == 0
+
+        # Another worker deletes the project; this process never hears of it
+        with engine.begin() as conn:
+            conn.execute(delete(Project).where(Project.id == project.id))
+
+        assert repository_cache.get(project_key(project.id)) is not None
+        with pytest.raises(ProjectNotFoundException):
+            service.add_task_to_project(project.id, "orphan", "")
+        with pytest.raises(ProjectNotFoundException):
+            service.add_tasks_to_project(project.id, [{"title": "orphan", "description": ""}])
+
+    def test_task_limit_counts_tasks_added_by_other_workers(self, uow, monkeypatch):
+        monkeypatch.setenv("MAX_NUMBER_OF_TASKS_PER_PROJECT", "2")
+        service = ProjectService(uow)
+        project = service.create_project("Website", "")
+        uow.commit()
+
+        with engine.begin() as conn:
+            conn.execute(insert(Task), [
+                {"title": title, "description": "", "project_id": project.id, "status": "todo"}
+                for title in ("one", "two")
+            ])
+
+        with pytest.raises(TaskLimitExceededException):
+            service.add_task_to_project(project.id, "three", "")
+        assert service.add_tasks_to_project(project.id, [{"title": "three", "description": ""}])["created"] == 0
+
+    def test_task_insert_bumps_the_project_version_once(self, uow):
+        service = ProjectService(uow)
+        project = service.create_project("Website", "")
+        version = project.version
+
+        service.add_task_to_project(project.id, "one", "")
+        service.add_tasks_to_project(project.id, [{"title": "two", "description": ""}])
+
+        uow.db.expire_all()
+        assert uow.projects.get_by_id(project.id).version == version + 2
+
+    def test_value_read_before_an_invalidation_is_not_cached(self):
+        generation = repository_cache.generation()
+        repository_cache.invalidate(project_key(1))
+        repository_cache.set(project_key(1), {"name": "old"}, generation)
+        assert repository_cache.get(project_key(1)) is None
+
+        repository_cache.set(project_key(1), {"name": "new"}, repository_cache.generation())
+        assert repository_cache.get(project_key(1)) == {"name": "new"}
+
+    def test_sqlite_enforces_foreign_keys(self, db):
+        db.add(Task(title="orphan", description="", project_id=999999, status="todo"))
+        with pytest.raises(IntegrityError):
+            db.commit()
+
+
+class TestOverdueSweep:
+
+    def test_closes_overdue_and_advances_watermark(self, uow):
+        project = ProjectService(uow).create_project("Website", "")
+        late = add_task(uow, project.id, "late", datetime.now() - timedelta(hours=1))
+        later = add_task(uow, project.id, "later", datetime.now() + timedelta(hours=1))
+        service = TaskService(uow)
+
+        assert service.close_overdue_tasks() == 1
+        uow.db.expire_all()
+        assert uow.tasks.get_by_id(late.id).status == "done"
+        assert uow.tasks.get_by_id(later.id).status == "todo"
+        assert uow.tasks.get_sweep_watermark() is not None
+        assert service.close_overdue_tasks() == 0
+
+    def test_deadline_moved_behind_the_watermark_is_swept(self, uow):
+        project = ProjectService(uow).create_project("Website", "")
+        task = add_task(uow, project.id, "task", datetime.now() + timedelta(days=1))
+        service = TaskService(uow)
+        service.close_overdue_tasks()
+
+        task.deadline = datetime.now() - timedelta(days=1)
+        uow.tasks.update(task)
+        uow.commit()
+        assert uow.tasks.get_sweep_watermark() <= task.deadline
+
+        assert service.close_overdue_tasks() == 1
+
+
+    def test_task_committed_after_a_sweep_with_a_recent_deadline_is_swept(self, uow):
+        project = ProjectService(uow).create_project("Website", "")
+        uow.commit()
+        service = TaskService(uow)
+        service.close_overdue_tasks()
+
+        # Written while its deadline was still ahead, so it rewound nothing,
+        # but only visible once the sweep above had finished
+        with engine.begin() as conn:
+            conn.execute(insert(Task), [{
+                "title": "slow", "description": "", "project_id": project.id, "status": "todo",
+                "deadline": datetime.now() - timedelta(seconds=1),
+            }])
+
+        assert service.close_overdue_tasks() == 1
+
+    def test_async_sweep_keeps_the_grace_window(self, uow, client):
+        project = ProjectService(uow).create_project("Website", "")
+        uow.commit()
+        client.post("/api/v1/tasks/autoclose-overdue")
+        with engine.begin() as conn:
+            conn.execute(insert(Task), [{
+                "title": "slow", "description": "", "project_id": project.id, "status": "todo",
+                "deadline": datetime.now() - timedelta(seconds=1),
+            }])
+
+        assert client.post("/api/v1/tasks/autoclose-overdue").json() == {"message": "Closed 1 overdue tasks"}
+
+
+class TestDeadlineScheduler:
+
+    def test_heap_pops_due_entries_in_order_without_duplicates(self):
+        heap = DeadlineHeap()
+        now = datetime(2030, 1, 1)
+        heap.push(now + timedelta(minutes=1), 3)
+        heap.push(now - timedelta(minutes=2), 1)
+        heap.push(now - timedelta(minutes=1), 2)
+        heap.push(now - timedelta(minutes=1), 2)
+
+        assert len(heap) == 3
+        assert heap.pop_due(now, limit=1) == [1]
+        assert heap.pop_due(now, limit=10) == [2]
+        assert heap.next_deadline() == now + timedelta(minutes=1)
+
+    def test_refresh_and_close_due(self, uow):
+        project = ProjectService(uow).create_project("Website", "")
+        now = datetime.now()
+        soon = add_task(uow, project.id, "soon", now + timedelta(minutes=1))
+        add_task(uow, project.id, "far", now + timedelta(days=1))
+        scheduler = DeadlineScheduler(uow, lookahead=timedelta(minutes=10), refresh_interval=timedelta(minutes=5))
+
+        assert scheduler.refresh(now) == 1
+        assert scheduler.close_due(now) == 0
+        assert scheduler.seconds_until_wakeup(now) == pytest.approx(60, abs=1)
+
+        # A task added after the refresh shows up through its project's version
+        sooner = add_task(uow, project.id, "sooner", now + timedelta(seconds=30))
+        scheduler.refresh(now + timedelta(minutes=5))
+        assert scheduler.close_due(now + timedelta(minutes=2)) == 2
+
+        uow.db.expire_all()
+        assert uow.tasks.get_by_id(soon.id).status == "done"
+        assert uow.tasks.get_by_id(sooner.id).status == "done"
+
+    def test_stale_entries_are_not_closed(self, uow):
+        project = ProjectService(uow).create_project("Website", "")
+        now = datetime.now()
+        task = add_task(uow, project.id, "soon", now + timedelta(minutes=1))
+        scheduler = DeadlineScheduler(uow, lookahead=timedelta(minutes=10))
+        scheduler.refresh(now)
+
+        task.deadline = now + timedelta(days=1)
+        uow.tasks.update(task)
+        uow.commit()
+
+        assert scheduler.close_due(now + timedelta(minutes=2)) == 0
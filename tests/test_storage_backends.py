@@ -0,0 +1,184 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from columnar_storage import ColumnarStorage
+from log_storage import LogStorage
+from models import Project, Task, pack_time, unpack_time
+from storage import InMemoryStorage
+from todo_manager import TodoManager
+
+
+def _project(name):
+    return Project(None, name, "")
+
+
+@pytest.fixture(params=["memory", "columnar", "log"])
+def storage(request, tmp_path):
+    if request.param == "memory":
+        yield InMemoryStorage()
+    elif request.param == "columnar":
+        yield ColumnarStorage()
+    else:
+        with LogStorage(str(tmp_path)) as log_storage:
+            yield log_storage
+
+
+@pytest.fixture
+def manager(storage):
+    return TodoManager(storage)
+
+
+def test_projects_are_listed_newest_first(manager):
+    for name in ("first", "second", "third"):
+        assert manager.create_project(name, "")[0]
+
+    assert [project.name for project in manager.list_projects()] == ["third", "second", "first"]
+
+
+def test_duplicate_project_name_is_rejected(manager):
+    assert manager.create_project("Website", "")[0]
+    success, message = manager.create_project("Website", "again")
+    assert not success
+    assert "already exists" in message
+
+
+def test_project_limit(manager):
+    manager.max_projects = 2
+    assert manager.create_project("a", "")[0]
+    assert manager.create_project("b", "")[0]
+    assert not manager.create_project("c", "")[0]
+
+
+def test_tasks_are_listed_newest_first_and_counted(manager, storage):
+    manager.create_project("Website", "")
+    project = storage.get_project_by_name("Website")
+    for title in ("one", "two", "three"):
+        assert manager.add_task(project.id, title, "")[0]
+
+    assert [task.title for task in manager.list_tasks(project.id)] == ["three", "two", "one"]
+    assert manager.get_task_count(project.id) == 3
+
+
+def test_out_of_order_task_is_sorted(storage):
+    project = storage.add_project(_project("Website"))
+    older = Task(None, "older", "", project.id)
+    older.created_at = datetime.now() - timedelta(days=1)
+    storage.add_task(Task(None, "newer", "", project.id))
+    storage.add_task(older)
+
+    assert [task.title for task in storage.get_tasks_by_project(project.id)] == ["newer", "older"]
+
+
+def test_task_limit(manager, storage):
+    manager.max_tasks = 2
+    manager.create_project("Website", "")
+    project = storage.get_project_by_name("Website")
+    assert manager.add_task(project.id, "one", "")[0]
+    assert manager.add_task(project.id, "two", "")[0]
+    success, message = manager.add_task(project.id, "three", "")
+    assert not success
+    assert "limit" in message
+
+
+def test_delete_task(manager, storage):
+    manager.create_project("Website", "")
+    project = storage.get_project_by_name("Website")
+    manager.add_task(project.id, "one", "")
+    manager.add_task(project.id, "two", "")
+    first = manager.list_tasks(project.id)[-1]
+
+    assert manager.delete_task(first.id)[0]
+    assert storage.get_task(first.id) is None
+    assert [task.title for task in manager.list_tasks(project.id)] == ["two"]
+    assert manager.get_task_count(project.id) == 1
+
+
+def test_delete_project_removes_its_tasks(manager, storage):
+    manager.create_project("Website", "")
+    project = storage.get_project_by_name("Website")
+    manager.add_task(project.id, "one", "")
+    task = manager.list_tasks(project.id)[0]
+
+    assert manager.delete_project(project.id)[0]
+    assert storage.get_project(project.id) is None
+    assert storage.get_task(task.id) is None
+    assert storage.count_projects() == 0
+
+
+def test_edit_task_and_status(manager, storage):
+    manager.create_project("Website", "")
+    project = storage.get_project_by_name("Website")
+    manager.add_task(project.id, "one", "")
+    task = manager.list_tasks(project.id)[0]
+
+    assert manager.edit_task(task.id, "renamed", "details", "doing", "2099-01-01")[0]
+    task = storage.get_task(task.id)
+    assert (task.title, task.description, task.status) == ("renamed", "details", "doing")
+    assert task.deadline == datetime(2099, 1, 1)
+
+    assert manager.change_task_status(task.id, "done")[0]
+    assert storage.get_task(task.id).status == "done"
+    assert not manager.change_task_status(task.id, "finished")[0]
+
+
+def test_task_timestamps_round_trip(storage):
+    project = storage.add_project(_project("Website"))
+    task = Task(None, "one", "", project.id, datetime(2099, 12, 31, 23, 59, 59, 123456))
+    task.created_at = datetime(2024, 2, 29, 12, 30, 15, 654321)
+    task = storage.add_task(task)
+
+    stored = storage.get_task(task.id)
+    assert stored.deadline == datetime(2099, 12, 31, 23, 59, 59, 123456)
+    assert stored.created_at == datetime(2024, 2, 29, 12, 30, 15, 654321)
+
+
+def test_packed_time_precision():
+    # Microseconds survive within +/- 2**33 seconds of the epoch
+    for value in (datetime(1698, 1, 1, 0, 0, 0, 1), datetime(2241, 12, 31, 23, 59, 59, 999999)):
+        assert unpack_time(pack_time(value)) == value
+    # Whole seconds, as date-only deadlines are, survive for any year
+    for value in (datetime(1, 1, 1), datetime(9999, 12, 31, 23, 59, 59)):
+        assert unpack_time(pack_time(value)) == value
+    assert unpack_time(pack_time(None)) is None
+
+
+class TestColumnarScans:
+
+    @pytest.fixture
+    def storage(self):
+        storage = ColumnarStorage()
+        self.first = storage.add_project(_project("first"))
+        self.second = storage.add_project(_project("second"))
+        return storage
+
+    def test_counts(self, storage):
+        for project in (self.first, self.first, self.second):
+            storage.add_task(Task(None, "t", "", project.id))
+        storage.get_tasks_by_project(self.first.id)[0].status = "done"
+
+        assert storage.count_tasks_per_project() == {self.first.id: 2, self.second.id: 1}
+        assert storage.count_tasks_by_status() == {"todo": 2, "doing": 0, "done": 1}
+        assert storage.count_tasks_by_status(self.first.id) == {"todo": 1, "doing": 0, "done": 1}
+        assert [task.status for task in storage.get_tasks_by_status("done")] == ["done"]
+
+    def test_overdue(self, storage):
+        now = datetime(2030, 1, 1)
+        late = storage.add_task(Task(None, "late", "", self.first.id, now - timedelta(hours=1)))
+        storage.add_task(Task(None, "later", "", self.first.id, now + timedelta(hours=1)))
+        storage.add_task(Task(None, "no deadline", "", self.first.id))
+        closed = storage.add_task(Task(None, "closed", "", self.first.id, now - timedelta(hours=1)))
+        closed.status = "done"
+
+        assert [task.id for task in storage.get_overdue_tasks(now)] == [late.id]
+
+    def test_compact_keeps_live_rows(self, storage):
+        tasks = [storage.add_task(Task(None, f"t{i}", "", self.first.id)) for i in range(10)]
+        for task in tasks[:6]:
+            storage.delete_task(task.id)
+        storage.compact()
+
+        assert [task.title for task in storage.get_tasks_by_project(self.first.id)] == [
+            f"t{i}" for i in reversed(range(6, 10))
+        ]
+        assert storage.get_task(tasks[7].id).title == "t7"
@@ -14,7 +14,6 @@ class TodoManager:
 
     def __init__(self, storage):
         self.storage = storage
->>>>>>> develop
         # Get limits from environment variables or use defaults
         self.max_projects = int(os.getenv("MAX_NUMBER_OF_PROJECTS", 10))
         self.max_tasks = int(os.getenv("MAX_NUMBER_OF_TASKS_PER_PROJECT", 50))
@@ -35,18 +34,16 @@ class TodoManager:
             return False, "❌ Project name is too long! Maximum 30 characters allowed."
 
         # Validate description length  
->>>>>>> develop
         if len(description) > 150:
             return False, "❌ Project description is too long! Maximum 150 characters allowed."
 
         # Check maximum projects limit
-        if len(self.storage.projects) >= self.max_projects:
+        if self.storage.count_projects() >= self.max_projects:
             return False, f"❌ Maximum projects limit reached! You can only have {self.max_projects} projects."
 
         # Check for duplicate project names
-        for project in self.storage.projects:
-            if project.name == name:
-                return False, "❌ Project name already exists! Please choose a different name."
+        if self.storage.get_project_by_name(name) is not None:
+            return False, "❌ Project name already exists! Please choose a different name."
 
         # Create and save the project
         project = Project(None, name, description)
@@ -86,13 +83,11 @@ class TodoManager:
                 return False, "❌ Invalid date format! Please use YYYY-MM-DD (e.g., 2024-12-31)"
 
         # Check if project exists
-        project_exists = any(p.id == project_id for p in self.storage.projects)
-        if not project_exists:
+        if self.storage.get_project(project_id) is None:
             return False, "❌ Project not found! Please check the Project ID."
 
         # Check maximum tasks limit for this project
-        project_tasks = self.storage.get_tasks_by_project(project_id)
-        if len(project_tasks) >= self.max_tasks:
+        if self.storage.count_tasks_by_project(project_id) >= self.max_tasks:
             return False, f"❌ Task limit reached! Each project can have maximum {self.max_tasks} tasks."
 
         # Create and save the task
@@ -100,7 +95,6 @@ class TodoManager:
         self.storage.add_task(task)
         return True, "✅ Task created successfully!"
     
->>>>>>> develop
     def edit_project(self, project_id: int, new_name: str, new_description: str) -> tuple[bool, str]:
         """
         Edit an existing project
@@ -122,23 +116,18 @@ class TodoManager:
             return False, "❌ Project description is too long! Maximum 150 characters allowed."
 
         # Find the project
-        project = None
-        for p in self.storage.projects:
-            if p.id == project_id:
-                project = p
-                break
+        project = self.storage.get_project(project_id)
 
         if not project:
             return False, "❌ Project not found! Please check the Project ID."
 
         # Check for duplicate name (excluding current project)
-        for p in self.storage.projects:
-            if p.id != project_id and p.name == new_name:
-                return False, "❌ Project name already exists! Please choose a different name."
+        existing = self.storage.get_project_by_name(new_name)
+        if existing is not None and existing.id != project_id:
+            return False, "❌ Project name already exists! Please choose a different name."
 
         # Update project
-        project.name = new_name
-        project.description = new_description
+        self.storage.update_project(project_id, new_name, new_description)
         return True, "✅ Project updated successfully!"
 
     
@@ -146,7 +135,6 @@ class TodoManager:
         """
         Edit task details
 
->>>>>>> develop
         Args:
             task_id (int): ID of the task to edit
             new_title (str): New task title (maximum 30 characters)
@@ -181,11 +169,7 @@ class TodoManager:
                 return False, "❌ Invalid date format! Please use YYYY-MM-DD (e.g., 2024-12-31)"
 
         # Find the task
-        task = None
-        for t in self.storage.tasks:
-            if t.id == task_id:
-                task = t
-                break
+        task = self.storage.get_task(task_id)
 
         if not task:
             return False, "❌ Task not found! Please check the Task ID."
@@ -210,7 +194,7 @@ class TodoManager:
             tuple[bool, str]: (success status, message)
         """
         # Find the project
-        project_exists = any(p.id == project_id for p in self.storage.projects)
+        project_exists = self.storage.get_project(project_id) is not None
 
         if not project_exists:
             return False, "❌ Project not found! Please check the Project ID."
@@ -230,7 +214,7 @@ class TodoManager:
             tuple[bool, str]: (success status, message)
         """
         # Find the task
-        task_exists = any(t.id == task_id for t in self.storage.tasks)
+        task_exists = self.storage.get_task(task_id) is not None
 
         if not task_exists:
             return False, "❌ Task not found! Please check the Task ID."
@@ -256,11 +240,7 @@ class TodoManager:
             return False, "❌ Invalid status! Please choose from: 'todo', 'doing', or 'done'"
 
         # Find the task
-        task = None
-        for t in self.storage.tasks:
-            if t.id == task_id:
-                task = t
-                break
+        task = self.storage.get_task(task_id)
 
         if not task:
             return False, "❌ Task not found! Please check the Task ID."
@@ -273,11 +253,10 @@ class TodoManager:
         """
         Get all projects sorted by creation time
 
->>>>>>> develop
         Returns:
             list: List of Project objects sorted by creation time (newest first)
         """
-        return sorted(self.storage.projects, key=lambda x: x.created_at, reverse=True)
+        return sorted(self.storage.get_all_projects(), key=lambda x: x.created_at, reverse=True)
 
     def list_tasks(self, project_id: int) -> list:
         """
@@ -301,6 +280,4 @@ class TodoManager:
         Returns:
             int: Number of tasks in the project
         """
-        tasks = self.storage.get_tasks_by_project(project_id)
-        return len(tasks)
->>>>>>> develop
+        return self.storage.count_tasks_by_project(project_id)